@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path("comics/", async_views.catalog_list, {"kind": "comic"}, name="async-comic-list"),
+    path("comics/<int:pk>/", async_views.catalog_detail, {"kind": "comic"}, name="async-comic-detail"),
+    path("novels/", async_views.catalog_list, {"kind": "novel"}, name="async-novel-list"),
+    path("novels/<int:pk>/", async_views.catalog_detail, {"kind": "novel"}, name="async-novel-detail"),
+    path("reviews/feed/", async_views.review_feed, name="async-review-feed"),
+    path("profiles/<str:username>/stats/", async_views.profile_stats, name="async-profile-stats"),
+    path("profiles/<str:username>/page/", async_views.profile_page, name="async-profile-page"),
+]
@@ -0,0 +1,235 @@
+"""
+Versi async (ASGI) dari endpoint baca yang paling ramai: katalog, feed review,
+halaman dan statistik profil. Response-nya sama dengan endpoint DRF padanannya.
+
+Query sederhana memakai async ORM. Filter/search/ordering dibangun dengan backend
+DRF yang sama (di thread sync, karena validasi filter bisa menyentuh DB).
+Endpoint multi-query (stats, page) menjalankan tiap section bersamaan di thread
+pool, masing-masing dengan koneksi DB sendiri.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.auth.authentication import StatelessJWTCookieAuthentication
+from api.contents.serializers import ComicSerializer, NovelSerializer
+from api.contents.views import ComicViewSet, NovelViewSet
+from api.interactions.serializers import FavoriteSerializer
+from api.library.serializers import UserLibrarySerializer
+from api.profiles.serializers import ProfileSerializer
+from api.profiles.views import ProfileViewSet, _load_section
+from api.reviews.serializers import ReviewFeedSerializer, ReviewSerializer, title_embed, title_key
+from api.reviews.views import ReviewViewSet
+from backend.profiling import timed_serializer
+from interactions.models import Like
+from member import stats
+from member.lookup import resolve_username_or_404
+from member.models import Profile
+
+
+CATALOG = {
+    "comic": (ComicViewSet, ComicSerializer),
+    "novel": (NovelViewSet, NovelSerializer),
+}
+
+
+# HELPERS
+def _json(data, status=200):
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+def _error(exc):
+    return _json({"detail": str(exc.detail)}, status=exc.status_code)
+
+
+def _in_thread(loader):
+    """Jalankan `loader` (sync) di thread pool dengan koneksi DB sendiri"""
+    return sync_to_async(_load_section, thread_sensitive=False)(loader)
+
+
+async def _authenticate(request):
+    drf_request = Request(request, authenticators=[StatelessJWTCookieAuthentication()])
+    # Status akun dibaca dari cache/DB secara sync
+    await sync_to_async(lambda: drf_request.user)()
+    return drf_request
+
+
+def _view(viewset_class, drf_request, action, **kwargs):
+    view = viewset_class(request=drf_request, format_kwarg=None, action=action, kwargs=kwargs, args=())
+    view.headers = {}
+    return view
+
+
+async def _paginate(drf_request, queryset):
+    """Pagination ala PageNumberPagination: return (page, count, next, previous)"""
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        number = int(drf_request.query_params.get("page", 1))
+    except ValueError:
+        raise exceptions.NotFound("Invalid page.")
+
+    count = await queryset.acount()
+    pages = max((count + page_size - 1) // page_size, 1)
+    if number < 1 or number > pages:
+        raise exceptions.NotFound("Invalid page.")
+
+    offset = (number - 1) * page_size
+    page = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = drf_request.build_absolute_uri()
+    next_url = replace_query_param(url, "page", number + 1) if number < pages else None
+    previous_url = None
+    if number > 1:
+        previous_url = replace_query_param(url, "page", number - 1) if number > 2 else remove_query_param(url, "page")
+    return page, count, next_url, previous_url
+
+
+# CATALOG
+def _catalog_queryset(kind, drf_request, action):
+    viewset_class, _ = CATALOG[kind]
+    view = _view(viewset_class, drf_request, action)
+    queryset = view.get_queryset()
+    if action == "list":
+        queryset = view.filter_queryset(queryset)
+    return queryset
+
+
+@require_safe
+async def catalog_list(request, kind):
+    _, serializer_class = CATALOG[kind]
+    drf_request = Request(request)
+    try:
+        queryset = await sync_to_async(_catalog_queryset)(kind, drf_request, "list")
+        page, count, next_url, previous_url = await _paginate(drf_request, queryset)
+    except exceptions.ValidationError as e:
+        return _json(e.detail, status=e.status_code)
+    except exceptions.APIException as e:
+        return _error(e)
+
+    data = timed_serializer(serializer_class(page, many=True, context={"request": drf_request})).data
+    return _json({"count": count, "next": next_url, "previous": previous_url, "results": data})
+
+
+@require_safe
+async def catalog_detail(request, kind, pk):
+    _, serializer_class = CATALOG[kind]
+    drf_request = Request(request)
+    queryset = await sync_to_async(_catalog_queryset)(kind, drf_request, "retrieve")
+    try:
+        target = await queryset.aget(pk=pk)
+    except queryset.model.DoesNotExist:
+        return _json({"detail": f"No {queryset.model._meta.object_name} matches the given query."}, status=404)
+    return _json(timed_serializer(serializer_class(target, context={"request": drf_request})).data)
+
+
+# REVIEWS
+def _feed_queryset(drf_request):
+    view = _view(ReviewViewSet, drf_request, "feed")
+    return view.filter_queryset(view.get_queryset())
+
+
+@require_safe
+async def review_feed(request):
+    try:
+        drf_request = await _authenticate(request)
+        queryset = await sync_to_async(_feed_queryset)(drf_request)
+        reviews, count, next_url, previous_url = await _paginate(drf_request, queryset)
+    except exceptions.ValidationError as e:
+        return _json(e.detail, status=e.status_code)
+    except exceptions.APIException as e:
+        return _error(e)
+
+    liked_ids = set()
+    if drf_request.user.is_authenticated and reviews:
+        liked_ids = {
+            review_id async for review_id in Like.objects.filter(
+                user_id=drf_request.user.pk, review_id__in=[r.pk for r in reviews]
+            ).order_by().values_list("review_id", flat=True)
+        }
+
+    titles = {}
+    for review in reviews:
+        key = title_key(review)
+        if key and key not in titles:
+            media_type = "comic" if review.comic_id else "novel"
+            titles[key] = title_embed(review.comic or review.novel, media_type, drf_request)
+
+    context = {"request": drf_request, "liked_ids": liked_ids}
+    data = timed_serializer(ReviewFeedSerializer(reviews, many=True, context=context)).data
+    return _json({"count": count, "next": next_url, "previous": previous_url, "results": data, "titles": titles})
+
+
+# PROFILES
+async def _profile_stats(user_id):
+    key = stats.cache_key(user_id)
+    data = await cache.aget(key)
+    if data is None:
+        names = list(stats.SECTIONS)
+        results = await asyncio.gather(
+            *[_in_thread(lambda section=stats.SECTIONS[name]: section(user_id)) for name in names]
+        )
+        data = dict(zip(names, results))
+        await cache.aset(key, data, stats.CACHE_TIMEOUT)
+    return data
+
+
+@require_safe
+async def profile_stats(request, username):
+    try:
+        user_id, _ = await sync_to_async(resolve_username_or_404)(username)
+    except Http404 as e:
+        return _json({"detail": str(e)}, status=404)
+    return _json(await _profile_stats(user_id))
+
+
+@require_safe
+async def profile_page(request, username):
+    try:
+        drf_request = await _authenticate(request)
+        user_id, profile_id = await sync_to_async(resolve_username_or_404)(username)
+    except exceptions.APIException as e:
+        return _error(e)
+    except Http404 as e:
+        return _json({"detail": str(e)}, status=404)
+
+    view = _view(ProfileViewSet, drf_request, "page", username=username)
+    context = {"request": drf_request}
+
+    def section(queryset, serializer_class, name):
+        return lambda: view._page_section(queryset, serializer_class, view._section_size(name), context)
+
+    def profile():
+        instance = get_object_or_404(Profile.objects.select_related("user"), pk=profile_id)
+        return timed_serializer(ProfileSerializer(instance, context=context)).data
+
+    loaders = {
+        "profile": profile,
+        "favorites": section(view._favorites_queryset(user_id), FavoriteSerializer, "favorites"),
+        "library": section(view._library_queryset(user_id), UserLibrarySerializer, "library"),
+        "reviews": section(view._reviews_queryset(user_id), ReviewSerializer, "reviews"),
+    }
+    names = list(loaders)
+    try:
+        results, profile_stats_data = await asyncio.gather(
+            asyncio.gather(*[_in_thread(loaders[name]) for name in names]),
+            _profile_stats(user_id),
+        )
+    except Http404 as e:
+        return _json({"detail": str(e)}, status=404)
+    data = dict(zip(names, results))
+    return _json({
+        "profile": data["profile"],
+        "stats": profile_stats_data,
+        "favorites": data["favorites"],
+        "library": data["library"],
+        "reviews": data["reviews"],
+    })
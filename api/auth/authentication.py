@@ -0,0 +1,102 @@
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.core.exceptions import ValidationError
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from member.lookup import get_user_state
+from member.models import User
+
+EXPRESSION_PROBES = frozenset({"resolve_expression", "get_source_expressions"})
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    User dari klaim token. id dan flag akun dijawab tanpa query; atribut lain
+    (username, email, profile, ...) memuat row User saat pertama kali diakses.
+    """
+
+    def __init__(self, user_id, state):
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        # LazyObject meneruskan setattr ke objek asli, jadi tulis langsung ke __dict__
+        self.__dict__["_user_id"] = user_id
+        self.__dict__["_account"] = state
+
+    @property
+    def pk(self):
+        return self._user_id
+
+    id = pk
+
+    @property
+    def is_active(self):
+        return self._account["is_active"]
+
+    @property
+    def is_staff(self):
+        return self._account["is_staff"]
+
+    @property
+    def is_superuser(self):
+        return self._account["is_superuser"]
+
+    is_authenticated = True
+    is_anonymous = False
+
+    # isinstance(user, User) dan filter(user=request.user) cukup dengan pk,
+    # tanpa memuat row User
+    @property
+    def __class__(self):
+        return User
+
+    @property
+    def _meta(self):
+        return User._meta
+
+    def __getattr__(self, name):
+        # Query builder mengecek atribut expression pada setiap nilai filter;
+        # User tidak punya atribut ini, jadi jawab tanpa memuat row
+        if name in EXPRESSION_PROBES:
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    def _is_pk_set(self):
+        return True
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return other.pk == self._user_id
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._user_id)
+
+
+class StatelessJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    JWTCookieAuthentication tanpa SELECT User per request: user dibangun dari klaim
+    token, status akun dibaca dari cache singkat (member.lookup.get_user_state).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            # simplejwt menyimpan id sebagai string di klaim
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, ValidationError) as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return LazyTokenUser(user_id, state)
@@ -0,0 +1,12 @@
+from dj_rest_auth.jwt_auth import CookieTokenRefreshSerializer, get_refresh_view
+
+from member.blacklist import AcceleratedRefreshToken
+
+
+class AcceleratedTokenRefreshSerializer(CookieTokenRefreshSerializer):
+    token_class = AcceleratedRefreshToken
+
+
+class TokenRefreshView(get_refresh_view()):
+    """Refresh token dj-rest-auth (cookie support) dengan pengecekan blacklist lewat Bloom filter"""
+    serializer_class = AcceleratedTokenRefreshSerializer
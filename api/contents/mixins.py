@@ -0,0 +1,42 @@
+from django.conf import settings
+from rest_framework.response import Response
+
+from contents.cache import normalized_key, response_cache
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Cache response GET/HEAD untuk user anonim lewat contents.cache. Action yang
+    di-cache memanggil `cached_response(request, tags, build)`; response ditandai
+    header X-Cache (HIT, COALESCED, MISS atau BYPASS).
+    """
+    SAFE_METHODS = ("GET", "HEAD")
+
+    def response_cacheable(self, request):
+        return (
+            settings.RESPONSE_CACHE_ENABLED
+            and request.method in self.SAFE_METHODS
+            and not request.user.is_authenticated
+        )
+
+    def cached_response(self, request, tags, build):
+        if not self.response_cacheable(request):
+            response = build()
+            response["X-Cache"] = "BYPASS"
+            return response
+
+        built = {}
+
+        def produce():
+            built["response"] = response = build()
+            if response.status_code != 200:
+                return None
+            return response.status_code, response.data
+
+        entry, status = response_cache.get_or_build(normalized_key(request), tags, produce)
+        if "response" in built:
+            response = built["response"]
+        else:
+            response = Response(entry["data"], status=entry["status"])
+        response["X-Cache"] = status
+        return response
@@ -1,5 +1,36 @@
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from contents.models import Genre, Comic, Novel
+from reviews.models import Review
+
+
+def with_reviews_count(queryset):
+    """Anotasi `reviews_count` (subquery COUNT) untuk queryset Comic/Novel"""
+    kind = queryset.model._meta.model_name
+    reviews_count = (
+        Review.objects.filter(**{kind: OuterRef("pk")})
+        .order_by()
+        .values(kind)
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return queryset.annotate(reviews_count=Coalesce(Subquery(reviews_count, output_field=IntegerField()), 0))
+
+
+def title_prefetches():
+    """Prefetch comic/novel beserta genres dan reviews_count, untuk serializer yang meng-embed judul"""
+    return [
+        Prefetch("comic", queryset=with_reviews_count(Comic.objects.prefetch_related("genres"))),
+        Prefetch("novel", queryset=with_reviews_count(Novel.objects.prefetch_related("genres"))),
+    ]
+
+
+class ReviewsCountMixin:
+    def get_reviews_count(self, obj):
+        # Pakai anotasi queryset; objek tanpa anotasi (mis. hasil create) dihitung langsung
+        count = getattr(obj, "reviews_count", None)
+        return obj.review_set.count() if count is None else count
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -8,13 +39,13 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
-class ComicSerializer(serializers.ModelSerializer):
+class ComicSerializer(ReviewsCountMixin, serializers.ModelSerializer):
     genres = GenreSerializer(many=True, read_only=True)
     genre_ids = serializers.PrimaryKeyRelatedField(
         queryset=Genre.objects.all(), many=True, write_only=True, source="genres"
     )
     media_type = serializers.SerializerMethodField()
-    reviews_count = serializers.IntegerField(source='review_set.count', read_only=True)
+    reviews_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Comic
@@ -42,13 +73,13 @@ class ComicSerializer(serializers.ModelSerializer):
         return "comic"
 
 
-class NovelSerializer(serializers.ModelSerializer):
+class NovelSerializer(ReviewsCountMixin, serializers.ModelSerializer):
     genres = GenreSerializer(many=True, read_only=True)
     genre_ids = serializers.PrimaryKeyRelatedField(
         queryset=Genre.objects.all(), many=True, write_only=True, source="genres"
     )
     media_type = serializers.SerializerMethodField()
-    reviews_count = serializers.IntegerField(source='review_set.count', read_only=True)
+    reviews_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Novel
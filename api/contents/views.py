@@ -4,15 +4,20 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, F, FloatField, ExpressionWrapper
+from django.db.models import F, FloatField
 from django.db.models.functions import Coalesce, Cast
 
+from contents.cache import catalog_tag, object_tag, trending_tag
 from contents.models import Genre, Comic, Novel
-from .serializers import GenreSerializer, ComicSerializer, NovelSerializer
+from .serializers import GenreSerializer, ComicSerializer, NovelSerializer, with_reviews_count
 from .permissions import IsAdminOrReadOnly
 from .filters import ComicFilter, NovelFilter
+from .mixins import AnonymousResponseCacheMixin
+from backend.profiling import SerializerTimingMixin
 from rest_framework.views import APIView
-from reviews.models import Review
+from django.shortcuts import get_object_or_404
+from reviews.models import Review, RatingSummary
+from interactions.trending import trending_scores
 
 # Stats View
 class StatsView(APIView):
@@ -26,14 +31,20 @@ class StatsView(APIView):
         return Response(data)
 
 # Genre View
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(SerializerTimingMixin, AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
     permission_classes = [IsAdminOrReadOnly]
     pagination_class = None 
 
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, ['genres'], lambda: super(GenreViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, ['genres'], lambda: super(GenreViewSet, self).retrieve(request, *args, **kwargs))
+
 # Base untuk Comic dan Novel ViewSet
-class BaseContentViewSet(viewsets.ModelViewSet):
+class BaseContentViewSet(SerializerTimingMixin, AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'author']
@@ -43,14 +54,61 @@ class BaseContentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Mengambil model secara dinamis berdasarkan viewset
         model = self.queryset.model
-        return model.objects.prefetch_related('genres').annotate(
-            reviews_count_internal=Count('review', distinct=True),
-            popularity=ExpressionWrapper(
-                Coalesce(Cast(F('average_rating'), FloatField()), 0.0) *
-                (Coalesce(Cast(F('reviews_count_internal'), FloatField()), 0.0) + 1.0),
-                output_field=FloatField()
+        # Popularity dibaca dari RatingSummary, bukan COUNT review per request.
+        # Judul tanpa summary (belum ada review) popularity-nya = average_rating.
+        queryset = model.objects.prefetch_related('genres').annotate(
+            popularity=Coalesce(
+                F('rating_summary__popularity'),
+                Cast(F('average_rating'), FloatField()),
             )
         )
+        return with_reviews_count(queryset)
+
+    @property
+    def kind(self):
+        return self.queryset.model._meta.model_name
+
+    # Response anonim di-cache per path + query, di-invalidate lewat tag (contents.cache)
+    def list(self, request, *args, **kwargs):
+        tags = [catalog_tag(self.kind), 'genres']
+        return self.cached_response(request, tags, lambda: super(BaseContentViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        tags = [object_tag(self.kind, kwargs.get('pk')), 'genres']
+        return self.cached_response(request, tags, lambda: super(BaseContentViewSet, self).retrieve(request, *args, **kwargs))
+
+    @action(detail=True, methods=['get'], url_path='rating-summary')
+    def rating_summary(self, request, pk=None):
+        """Average rating, jumlah review dan histogram rating dari satu row summary"""
+        return self.cached_response(request, [object_tag(self.kind, pk)], lambda: self._rating_summary(pk))
+
+    def _rating_summary(self, pk):
+        model = self.queryset.model
+        target = get_object_or_404(model.objects.select_related('rating_summary'), pk=pk)
+        summary = getattr(target, 'rating_summary', None) or RatingSummary()
+        return Response({
+            'id': target.id,
+            'average_rating': float(target.average_rating),
+            'review_count': summary.review_count,
+            'histogram': summary.as_histogram(),
+        })
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """Judul trending dari ranking yang sudah dihitung job update_trending"""
+        tags = [trending_tag(self.kind), 'genres']
+        return self.cached_response(request, tags, lambda: self._trending(request))
+
+    def _trending(self, request):
+        scores = trending_scores(self.kind)
+        page = self.paginate_queryset(scores)
+        entries = page if page is not None else list(scores)
+        titles = self.get_queryset().in_bulk([entry.object_id for entry in entries])
+        ranked = [titles[entry.object_id] for entry in entries if entry.object_id in titles]
+        serializer = self.get_serializer(ranked, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
 # Comic ViewSet
 class ComicViewSet(BaseContentViewSet):
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from interactions.buffer import buffered_likes_count
 from interactions.models import Favorite, Like
 from api.contents.serializers import ComicSerializer, NovelSerializer
 
@@ -6,12 +7,17 @@ class FavoriteSerializer(serializers.ModelSerializer):
     target_type = serializers.SerializerMethodField(read_only=True)
     target_id = serializers.SerializerMethodField(read_only=True)
     target_detail = serializers.SerializerMethodField(read_only=True)
+    rank = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Favorite
         fields = ["id", "user", "comic", "novel", "rank", "created_at", "target_type", "target_id", "target_detail"]
         read_only_fields = ["created_at", "user", "rank"]
 
+    def get_rank(self, obj):
+        # Rank dense dihitung dari position (annotate with_rank() di queryset)
+        return obj.get_rank()
+
     def get_target_type(self, obj):
         return "comic" if obj.comic else "novel"
 
@@ -61,14 +67,15 @@ class FavoriteReorderSerializer(serializers.Serializer):
     )
 
     def validate_favorites(self, value):
-        user = self.context['request'].user
+        # Ownership dicek oleh Favorite.reorder (di dalam transaksi yang sama)
         for item in value:
             if 'id' not in item or 'rank' not in item:
                 raise serializers.ValidationError("Each item must have 'id' and 'rank' fields.")
+            if item['rank'] < 1:
+                raise serializers.ValidationError("Rank must be >= 1.")
         favorite_ids = [item['id'] for item in value]
-        user_favorites = Favorite.objects.filter(id__in=favorite_ids, user=user)
-        if user_favorites.count() != len(favorite_ids):
-            raise serializers.ValidationError("Some favorites don't belong to you or don't exist.")
+        if len(favorite_ids) != len(set(favorite_ids)):
+            raise serializers.ValidationError("Favorite ids must be unique.")
         ranks = [item['rank'] for item in value]
         if len(ranks) != len(set(ranks)):
             raise serializers.ValidationError("Ranks must be unique.")
@@ -90,7 +97,7 @@ class LikeSerializer(serializers.ModelSerializer):
             "content": review.content[:100]+"..." if len(review.content)>100 else review.content,
             "rating": float(review.rating),
             "user": review.user.username,
-            "likes_count": review.likes.count(),
+            "likes_count": buffered_likes_count(review),
             "created_at": review.created_at
         }
 
@@ -100,10 +107,5 @@ class LikeSerializer(serializers.ModelSerializer):
 
 
 class LikeToggleSerializer(serializers.Serializer):
+    # Keberadaan review dicek oleh Like.toggle di statement yang sama
     review = serializers.IntegerField()
-
-    def validate_review(self, value):
-        from reviews.models import Review
-        if not Review.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Review not found.")
-        return value
@@ -2,8 +2,11 @@ from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
 
+from backend.profiling import SerializerTimingMixin
+from interactions import buffer
 from interactions.models import Favorite, Like
 from reviews.models import Review
 from .serializers import FavoriteSerializer, FavoriteReorderSerializer, LikeSerializer, LikeToggleSerializer
@@ -15,21 +18,20 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.user == request.user
 
 
-class FavoriteViewSet(viewsets.ModelViewSet):
+class FavoriteViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = FavoriteSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['comic__title', 'novel__title', 'comic__author', 'novel__author']
-    ordering_fields = ['rank', 'created_at']
-    ordering = ['rank']
+    ordering_fields = ['rank', 'position', 'created_at']
+    ordering = ['position']
 
     def get_queryset(self):
         username = self.request.query_params.get('username')
         if username:
-            from member.models import User
-            from django.shortcuts import get_object_or_404
-            user = get_object_or_404(User, username=username)
-            queryset = Favorite.objects.filter(user=user)
+            from member.lookup import resolve_username_or_404
+            user_id, _ = resolve_username_or_404(username)
+            queryset = Favorite.objects.filter(user_id=user_id)
         else:
             if not self.request.user.is_authenticated:
                 return Favorite.objects.none()
@@ -39,7 +41,7 @@ class FavoriteViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(comic__isnull=False)
         elif type_filter == 'novel':
             queryset = queryset.filter(novel__isnull=False)
-        return queryset.select_related('comic', 'novel').order_by('rank')
+        return queryset.select_related('comic', 'novel').with_rank().order_by('position')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -49,13 +51,14 @@ class FavoriteViewSet(viewsets.ModelViewSet):
         serializer = FavoriteReorderSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         favorites_data = serializer.validated_data['favorites']
-        with transaction.atomic():
-            for item in favorites_data:
-                Favorite.objects.filter(id=item['id'], user=request.user).update(rank=item['rank'])
+        try:
+            Favorite.reorder(request.user, {item['id']: item['rank'] for item in favorites_data})
+        except DjangoValidationError as e:
+            raise ValidationError({'favorites': e.messages})
         return Response({'message': 'Favorites reordered successfully', 'count': len(favorites_data)})
 
 
-class LikeViewSet(viewsets.ModelViewSet):
+class LikeViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -71,11 +74,13 @@ class LikeViewSet(viewsets.ModelViewSet):
         serializer = LikeToggleSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         review_id = serializer.validated_data['review']
-        review = Review.objects.get(id=review_id)
-        like, created = Like.toggle(user=request.user, review=review)
-        likes_count = review.likes.count()
+        toggle = buffer.toggle_like if buffer.write_behind_enabled() else Like.toggle
+        try:
+            liked, likes_count = toggle(user=request.user, review_id=review_id)
+        except Review.DoesNotExist:
+            raise ValidationError({'review': ['Review not found.']})
         return Response({
-            'liked': created,
+            'liked': liked,
             'likes_count': likes_count,
-            'message': 'Review liked' if created else 'Review unliked'
-        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+            'message': 'Review liked' if liked else 'Review unliked'
+        }, status=status.HTTP_201_CREATED if liked else status.HTTP_200_OK)
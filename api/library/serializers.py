@@ -19,11 +19,11 @@ class UserLibrarySerializer(serializers.ModelSerializer):
         fields = [
             "id", "user", "username", "comic", "comic_detail", "novel", "novel_detail",
             "status", "status_display", "progress", "total_chapters", "completion_percentage",
-            "is_caught_up", "started_at", "completed_at", "created_at", "updated_at"
+            "is_caught_up", "new_chapters", "started_at", "completed_at", "created_at", "updated_at"
         ]
         read_only_fields = [
             "user", "total_chapters", "completion_percentage", "is_caught_up",
-            "started_at", "completed_at", "created_at", "updated_at"
+            "new_chapters", "started_at", "completed_at", "created_at", "updated_at"
         ]
 
     def validate(self, data):
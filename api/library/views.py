@@ -3,14 +3,16 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.shortcuts import get_object_or_404
+from backend.profiling import SerializerTimingMixin
+from member.lookup import resolve_username_or_404
 from django.db.models import Avg, F, Case, When, FloatField
 
 from library.models import UserLibrary
+from api.contents.serializers import title_prefetches
 from .serializers import UserLibrarySerializer
 from .filters import UserLibraryFilter
 
-class UserLibraryViewSet(viewsets.ModelViewSet):
+class UserLibraryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = UserLibrarySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     
@@ -25,17 +27,14 @@ class UserLibraryViewSet(viewsets.ModelViewSet):
         username = self.request.query_params.get('username')
         
         if username:
-            from member.models import User
-            user = get_object_or_404(User, username=username)
-            queryset = UserLibrary.objects.filter(user=user)
+            user_id, _ = resolve_username_or_404(username)
+            queryset = UserLibrary.objects.filter(user_id=user_id)
         else:
             if not self.request.user.is_authenticated:
                 return UserLibrary.objects.none()
             queryset = UserLibrary.objects.filter(user=self.request.user)
 
-        return queryset.select_related("user", "comic", "novel").prefetch_related(
-            "comic__genres", "novel__genres"
-        )
+        return queryset.select_related("user").prefetch_related(*title_prefetches())
 
     def get_permissions(self):
         """Pastikan hanya user yang login yang bisa mutasi data"""
@@ -96,22 +95,48 @@ class UserLibraryViewSet(viewsets.ModelViewSet):
             )
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def updates(self, request):
+        """Entry library yang punya chapter baru (tanpa nested serializer)"""
+        entries = list(
+            UserLibrary.objects.filter(user=request.user, new_chapters__gt=0)
+            .order_by("-new_chapters")
+            .values(
+                "id", "comic_id", "novel_id", "comic__title", "novel__title",
+                "progress", "new_chapters",
+            )
+        )
+        results = [
+            {
+                "id": entry["id"],
+                "media_type": "comic" if entry["comic_id"] else "novel",
+                "target_id": entry["comic_id"] or entry["novel_id"],
+                "title": entry["comic__title"] or entry["novel__title"],
+                "progress": entry["progress"],
+                "new_chapters": entry["new_chapters"],
+            }
+            for entry in entries
+        ]
+        return Response({
+            "total_new_chapters": sum(entry["new_chapters"] for entry in results),
+            "results": results,
+        })
+
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Statistik library user"""
         username = request.query_params.get('username')
         if username:
-            from member.models import User
-            user = get_object_or_404(User, username=username)
+            user_id, _ = resolve_username_or_404(username)
         else:
             if not request.user.is_authenticated:
                 return Response(
                     {"detail": "Authentication required"}, 
                     status=status.HTTP_401_UNAUTHORIZED
                 )
-            user = request.user
+            user_id = request.user.pk
             
-        queryset = UserLibrary.objects.filter(user=user)
+        queryset = UserLibrary.objects.filter(user_id=user_id)
         
         # Stats by status
         by_status = {
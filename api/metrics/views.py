@@ -0,0 +1,17 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.db import pool_stats
+from contents.cache import response_cache
+
+
+class MetricsView(APIView):
+    """Metrik proses yang melayani request ini: koneksi/pool DB dan response cache"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "database": pool_stats(),
+            "response_cache": response_cache.metrics(),
+        })
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from member.models import User, Profile
+from member.avatars import SIZES
 
 
 class UserPublicSerializer(serializers.ModelSerializer):
@@ -21,6 +22,10 @@ class ProfileSerializer(serializers.ModelSerializer):
     instagram_url = serializers.URLField(read_only=True)
     has_social_links = serializers.BooleanField(read_only=True)
     
+    # Avatar diganti lewat upload_avatar atau PATCH multipart (ditangani view), di sini hanya URL varian
+    avatar = serializers.SerializerMethodField()
+    avatar_urls = serializers.SerializerMethodField()
+    
     class Meta:
         model = Profile
         fields = [
@@ -29,6 +34,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'username',
             'full_name',
             'avatar',
+            'avatar_urls',
             'bio',
             'twitter_username',
             'twitter_url',
@@ -51,6 +57,20 @@ class ProfileSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
     
+    def _absolute(self, url):
+        request = self.context.get('request')
+        if url and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    
+    def get_avatar(self, obj):
+        return self._absolute(obj.avatar_url())
+    
+    def get_avatar_urls(self, obj):
+        if not obj.avatar:
+            return None
+        return {size: self._absolute(obj.avatar_url(size)) for size in SIZES}
+    
     def get_instagram_url(self, obj):
         if obj.instagram_username:
             return f"https://instagram.com/{obj.instagram_username}"
@@ -4,32 +4,65 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.db import close_old_connections, transaction
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 
-from member.models import User, Profile
+from backend.profiling import SerializerTimingMixin, timed_serializer
+from member import avatars
+from member.models import Profile
+from member.lookup import resolve_username_or_404
+from member.stats import get_profile_stats
 from reviews.models import Review
 from library.models import UserLibrary
-from interactions.models import Favorite, Like
+from interactions.models import Favorite
 
 from .serializers import ProfileSerializer
+from api.contents.serializers import title_prefetches
 from api.interactions.serializers import FavoriteSerializer
 from api.library.serializers import UserLibrarySerializer
 from api.reviews.serializers import ReviewSerializer
 
+# Section halaman profil di-load paralel; tiap thread memakai koneksi DB sendiri
+_section_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="profile-page")
 
-class ProfileViewSet(viewsets.ModelViewSet):
+
+def _load_section(loader):
+    close_old_connections()
+    try:
+        return loader()
+    finally:
+        close_old_connections()
+
+
+def _submit_section(loader):
+    """
+    Jalankan section di executor dengan salinan context request (routing replica,
+    profiling); satu salinan per section karena Context tidak bisa dipakai dua
+    thread sekaligus
+    """
+    return _section_executor.submit(contextvars.copy_context().run, _load_section, loader)
+
+
+class ProfileViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'username'
+    page_section_size = 10
+    page_section_max_size = 50
     
     def get_queryset(self):
         return Profile.objects.select_related('user').all()
     
     def get_object(self):
         """Get profile by username from URL"""
-        username = self.kwargs.get('username')
-        user = get_object_or_404(User, username=username)
-        return user.profile
+        _, profile_id = resolve_username_or_404(self.kwargs.get('username'))
+        return get_object_or_404(Profile.objects.select_related('user'), pk=profile_id)
+
+    def get_user_id(self):
+        """User id dari username di URL, tanpa query jika sudah ada di cache"""
+        user_id, _ = resolve_username_or_404(self.kwargs.get('username'))
+        return user_id
     
     # PROFILE MANAGEMENT
     def retrieve(self, request, username=None):
@@ -38,6 +71,10 @@ class ProfileViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     def partial_update(self, request, username=None):
+        """
+        Update profil. `avatar` boleh ikut dikirim sebagai file (multipart) dan
+        diproses sama seperti endpoint upload_avatar
+        """
         profile = self.get_object()
         
         if request.user != profile.user:
@@ -46,9 +83,25 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        upload = ext = None
+        if 'avatar' in request.data:
+            upload = request.FILES.get('avatar')
+            if upload is None:
+                return Response(
+                    {'avatar': 'Send the avatar as a multipart file upload'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                ext = avatars.validate(upload)
+            except avatars.InvalidAvatar as e:
+                return Response({'avatar': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         serializer = self.get_serializer(profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            if upload is not None:
+                avatars.set_avatar(profile, upload, ext)
         return Response(serializer.data)
     
     @action(
@@ -72,13 +125,13 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Delete old avatar
-        if profile.avatar:
-            profile.avatar.delete(save=False)
+        upload = request.FILES['avatar']
+        try:
+            ext = avatars.validate(upload)
+        except avatars.InvalidAvatar as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Save new avatar
-        profile.avatar = request.FILES['avatar']
-        profile.save()
+        avatars.set_avatar(profile, upload, ext)
         
         serializer = self.get_serializer(profile)
         return Response({
@@ -89,46 +142,11 @@ class ProfileViewSet(viewsets.ModelViewSet):
     # USER DATA    
     @action(detail=True, methods=['get'])
     def stats(self, request, username=None):
-        user = self.get_object().user
-        
-        # Reviews stats
-        reviews = Review.objects.filter(user=user)
-        reviews_stats = {
-            'total': reviews.count(),
-            'comics': reviews.filter(comic__isnull=False).count(),
-            'novels': reviews.filter(novel__isnull=False).count(),
-            'average_rating': round(float(reviews.aggregate(avg=Avg('rating'))['avg'] or 0), 2),
-            'likes_received': Like.objects.filter(review__user=user).count(),
-        }
-        
-        # Library stats
-        library = UserLibrary.objects.filter(user=user)
-        library_stats = {
-            'total': library.count(),
-            'reading': library.filter(status='reading').count(),
-            'completed': library.filter(status='completed').count(),
-            'plan_to_read': library.filter(status='plan_to_read').count(),
-            'dropped': library.filter(status='dropped').count(),
-        }
-        
-        # Favorites stats
-        favorites = Favorite.objects.filter(user=user)
-        favorites_stats = {
-            'total': favorites.count(),
-            'comics': favorites.filter(comic__isnull=False).count(),
-            'novels': favorites.filter(novel__isnull=False).count(),
-        }
-        
-        return Response({
-            'reviews': reviews_stats,
-            'library': library_stats,
-            'favorites': favorites_stats
-        })
+        return Response(get_profile_stats(self.get_user_id()))
     
     @action(detail=True, methods=['get'])
     def favorites(self, request, username=None):
-        user = self.get_object().user
-        queryset = Favorite.objects.filter(user=user).select_related('comic', 'novel').order_by('rank')
+        queryset = self._favorites_queryset(self.get_user_id())
         
         # Filter by type
         type_param = request.query_params.get('type')
@@ -140,16 +158,15 @@ class ProfileViewSet(viewsets.ModelViewSet):
         # Paginate
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = FavoriteSerializer(page, many=True, context={'request': request})
+            serializer = timed_serializer(FavoriteSerializer(page, many=True, context={'request': request}))
             return self.get_paginated_response(serializer.data)
         
-        serializer = FavoriteSerializer(queryset, many=True, context={'request': request})
+        serializer = timed_serializer(FavoriteSerializer(queryset, many=True, context={'request': request}))
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def library(self, request, username=None):
-        user = self.get_object().user
-        queryset = UserLibrary.objects.filter(user=user).select_related('comic', 'novel').order_by('-updated_at')
+        queryset = self._library_queryset(self.get_user_id())
         
         # Filter by status
         status_param = request.query_params.get('status')
@@ -159,23 +176,23 @@ class ProfileViewSet(viewsets.ModelViewSet):
         # Paginate
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = UserLibrarySerializer(page, many=True, context={'request': request})
+            serializer = timed_serializer(UserLibrarySerializer(page, many=True, context={'request': request}))
             return self.get_paginated_response(serializer.data)
         
-        serializer = UserLibrarySerializer(queryset, many=True, context={'request': request})
+        serializer = timed_serializer(UserLibrarySerializer(queryset, many=True, context={'request': request}))
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def reviews(self, request, username=None):
-        user = self.get_object().user
-        queryset = Review.objects.filter(user=user).select_related('comic', 'novel').order_by('-created_at')
+        queryset = self._reviews_queryset(self.get_user_id())
         
         # Search
         search = request.query_params.get('search')
         if search:
             from django.db.models import Q
+            from reviews.search import content_search_q
             queryset = queryset.filter(
-                Q(content__icontains=search) |
+                content_search_q(search) |
                 Q(comic__title__icontains=search) |
                 Q(novel__title__icontains=search)
             )
@@ -183,8 +200,80 @@ class ProfileViewSet(viewsets.ModelViewSet):
         # Paginate
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = ReviewSerializer(page, many=True, context={'request': request})
+            serializer = timed_serializer(ReviewSerializer(page, many=True, context={'request': request}))
             return self.get_paginated_response(serializer.data)
         
-        serializer = ReviewSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
\ No newline at end of file
+        serializer = timed_serializer(ReviewSerializer(queryset, many=True, context={'request': request}))
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def page(self, request, username=None):
+        """
+        Semua data halaman profil dalam satu response: profile, stats, favorites,
+        library dan reviews. Ukuran tiap section diatur lewat ?favorites_size=,
+        ?library_size= dan ?reviews_size=. Section di-load paralel di thread pool.
+        """
+        profile = self.get_object()
+        user_id = profile.user_id
+        context = {'request': request}
+
+        loaders = {
+            'stats': lambda: get_profile_stats(user_id),
+            'favorites': lambda: self._page_section(
+                self._favorites_queryset(user_id),
+                FavoriteSerializer, self._section_size('favorites'), context,
+            ),
+            'library': lambda: self._page_section(
+                self._library_queryset(user_id),
+                UserLibrarySerializer, self._section_size('library'), context,
+            ),
+            'reviews': lambda: self._page_section(
+                self._reviews_queryset(user_id),
+                ReviewSerializer, self._section_size('reviews'), context,
+            ),
+        }
+        futures = {name: _submit_section(loader) for name, loader in loaders.items()}
+
+        data = {'profile': self.get_serializer(profile).data}
+        data.update({name: future.result() for name, future in futures.items()})
+        return Response(data)
+
+    # Queryset section, dipakai endpoint per section maupun /page/
+    def _favorites_queryset(self, user_id):
+        return (
+            Favorite.objects.filter(user_id=user_id)
+            .select_related('comic', 'novel')
+            .with_rank()
+            .order_by('position')
+        )
+
+    def _library_queryset(self, user_id):
+        return (
+            UserLibrary.objects.filter(user_id=user_id)
+            .select_related('user')
+            .prefetch_related(*title_prefetches())
+            .order_by('-updated_at')
+        )
+
+    def _reviews_queryset(self, user_id):
+        return (
+            Review.objects.filter(user_id=user_id)
+            .select_related('user', 'user__profile')
+            .prefetch_related(*title_prefetches())
+            .order_by('-created_at')
+        )
+
+    def _section_size(self, name):
+        try:
+            size = int(self.request.query_params.get(f'{name}_size', self.page_section_size))
+        except ValueError:
+            size = self.page_section_size
+        return min(max(size, 0), self.page_section_max_size)
+
+    @staticmethod
+    def _page_section(queryset, serializer_class, size, context):
+        items = list(queryset[:size])
+        return {
+            'count': queryset.count(),
+            'results': timed_serializer(serializer_class(items, many=True, context=context)).data,
+        }
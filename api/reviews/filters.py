@@ -0,0 +1,21 @@
+from django.db.models import Q
+from rest_framework import filters
+
+from reviews.search import content_search_q
+
+
+class ReviewSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter untuk review: konten dicocokkan lewat index full-text,
+    field di `search_fields` (username, judul) tetap pakai icontains.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search = request.query_params.get(self.search_param, '').strip()
+        if not search:
+            return queryset
+
+        condition = content_search_q(search)
+        for field in getattr(view, 'search_fields', []):
+            condition |= Q(**{f"{field}__icontains": search})
+        return queryset.filter(condition)
@@ -1,8 +1,21 @@
 from rest_framework import serializers
-from reviews.models import Review
+from reviews.models import Review, RatingSummary
+from reviews.search import render_snippet
+from interactions.buffer import buffered_likes_count, buffered_is_liked
 from api.contents.serializers import ComicSerializer, NovelSerializer
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewUserAvatarMixin:
+    """`user_avatar`: URL absolut avatar penulis review (profile di-select_related)"""
+
+    def get_user_avatar(self, obj):
+        profile = getattr(obj.user, 'profile', None)
+        url = profile.avatar_url() if profile else None
+        if url:
+            return self.context['request'].build_absolute_uri(url)
+        return None
+
+
+class ReviewSerializer(ReviewUserAvatarMixin, serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
     user_id = serializers.IntegerField(source="user.id", read_only=True)
     comic_detail = ComicSerializer(source="comic", read_only=True)
@@ -21,20 +34,15 @@ class ReviewSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user", "created_at", "likes_count", "is_liked"]
 
-    def get_user_avatar(self, obj):
-        profile = getattr(obj.user, 'profile', None)
-        
-        if profile and profile.avatar:
-            return self.context['request'].build_absolute_uri(profile.avatar.url)
-        return None
-
     def get_likes_count(self, obj):
-        return obj.likes.count()
-    
+        return buffered_likes_count(obj)
+
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
+            return buffered_is_liked(
+                request.user, obj, lambda: obj.likes.filter(user=request.user).exists()
+            )
         return False
 
     def validate(self, data):
@@ -56,6 +64,79 @@ class ReviewSerializer(serializers.ModelSerializer):
         review = Review.objects.create(**validated_data)
         if review.comic:
             review.comic.update_average_rating()
+            RatingSummary.record(review.comic, added=review.rating)
         if review.novel:
             review.novel.update_average_rating()
+            RatingSummary.record(review.novel, added=review.rating)
         return review
+
+
+class ReviewFeedSerializer(ReviewUserAvatarMixin, serializers.ModelSerializer):
+    """
+    Representasi ringkas untuk feed: judul tidak di-embed per row,
+    cukup `target_key` yang merujuk ke map `titles` di response.
+    """
+    username = serializers.CharField(source="user.username", read_only=True)
+    user_avatar = serializers.SerializerMethodField()
+    target_key = serializers.SerializerMethodField()
+    likes_count = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Review
+        fields = [
+            "id", "username", "user_id", "user_avatar", "content", "rating", "created_at",
+            "comic", "novel", "target_key", "likes_count", "is_liked",
+        ]
+        read_only_fields = fields
+
+    def get_target_key(self, obj):
+        return title_key(obj)
+
+    def get_likes_count(self, obj):
+        return buffered_likes_count(obj)
+
+    def get_is_liked(self, obj):
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            liked_ids = self.context.get('liked_ids', set())
+            return buffered_is_liked(request.user, obj, lambda: obj.pk in liked_ids)
+        return False
+
+
+class ReviewSearchSerializer(ReviewFeedSerializer):
+    """Hasil search: feed ringkas ditambah skor relevansi dan snippet"""
+    search_rank = serializers.FloatField(read_only=True)
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(ReviewFeedSerializer.Meta):
+        fields = ReviewFeedSerializer.Meta.fields + ["search_rank", "snippet"]
+        read_only_fields = fields
+
+    def get_snippet(self, obj):
+        return render_snippet(obj.snippet)
+
+
+def title_key(review):
+    if review.comic_id:
+        return f"comic:{review.comic_id}"
+    if review.novel_id:
+        return f"novel:{review.novel_id}"
+    return None
+
+
+def title_embed(target, media_type, request=None):
+    """Data judul minimal untuk side-load di feed review (tanpa genre/count)"""
+    image_url = target.cover_image.url if target.cover_image else None
+    if image_url and request is not None:
+        image_url = request.build_absolute_uri(image_url)
+    return {
+        "id": target.id,
+        "title": target.title,
+        "author": target.author,
+        "cover_image": image_url,
+        "average_rating": float(target.average_rating),
+        "status": target.status,
+        "media_type": media_type,
+        f"{media_type}_type": getattr(target, f"{media_type}_type"),
+    }
@@ -1,21 +1,103 @@
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from reviews.models import Review
-from .serializers import ReviewSerializer
+from backend.profiling import SerializerTimingMixin, timed_serializer
+from reviews.models import Review, RatingSummary
+from reviews.search import search_reviews
+from interactions.trending import trending_scores
+from interactions.models import Like
+from api.contents.serializers import title_prefetches
+from .filters import ReviewSearchFilter
+from .serializers import (
+    ReviewSerializer, ReviewFeedSerializer, ReviewSearchSerializer, title_key, title_embed,
+)
 
-class ReviewViewSet(viewsets.ModelViewSet):
-    queryset = Review.objects.all().select_related("user", "comic", "novel")
+class ReviewViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
+    queryset = Review.objects.all().select_related("user", "user__profile")
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ReviewSearchFilter, filters.OrderingFilter]
     filterset_fields = ["comic", "novel", "rating", "user", "user__username"]
-    search_fields = ["content", "user__username", "comic__title", "novel__title"]
-    ordering_fields = ["created_at", "rating"]
+    # Konten selalu dicari lewat index full-text oleh ReviewSearchFilter
+    search_fields = ["user__username", "comic__title", "novel__title"]
+    ordering_fields = ["created_at", "rating", "likes_count"]
     ordering = ["-created_at"]
 
+    @action(detail=False, methods=["get"])
+    def feed(self, request):
+        """
+        Feed review ringkas: judul di-dedupe ke map `titles`, is_liked diambil
+        dengan satu query untuk seluruh halaman. Filter/search/ordering sama dengan list.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._compact_response(queryset, ReviewFeedSerializer)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search konten review (`?q=`), urut berdasarkan relevansi.
+        Tiap hasil membawa `snippet` dengan kata yang cocok ditandai <mark>.
+        Filter comic/novel/rating/user tetap berlaku.
+        """
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            return Response({"q": ["This query parameter is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        return self._compact_response(search_reviews(queryset, term), ReviewSearchSerializer)
+
+    def _compact_response(self, queryset, serializer_class):
+        """Response ringkas ala feed: judul di-side-load ke map `titles`"""
+        request = self.request
+        page = self.paginate_queryset(queryset)
+        reviews = page if page is not None else list(queryset)
+
+        liked_ids = set()
+        if request.user.is_authenticated and reviews:
+            liked_ids = set(
+                Like.objects.filter(user=request.user, review_id__in=[r.pk for r in reviews])
+                .order_by()
+                .values_list("review_id", flat=True)
+            )
+
+        titles = {}
+        for review in reviews:
+            key = title_key(review)
+            if key and key not in titles:
+                media_type = "comic" if review.comic_id else "novel"
+                titles[key] = title_embed(review.comic or review.novel, media_type, request)
+
+        context = {**self.get_serializer_context(), "liked_ids": liked_ids}
+        data = timed_serializer(serializer_class(reviews, many=True, context=context)).data
+        if page is not None:
+            response = self.get_paginated_response(data)
+            response.data["titles"] = titles
+            return response
+        return Response({"results": data, "titles": titles})
+
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        """Review trending dari ranking yang sudah dihitung job update_trending"""
+        scores = trending_scores("review")
+        page = self.paginate_queryset(scores)
+        entries = page if page is not None else list(scores)
+        reviews = self.get_queryset().in_bulk([entry.object_id for entry in entries])
+        ranked = [reviews[entry.object_id] for entry in entries if entry.object_id in reviews]
+        serializer = self.get_serializer(ranked, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("feed", "search"):
+            return queryset.select_related("comic", "novel")
+        # ReviewSerializer meng-embed judul lengkap (genres, reviews_count)
+        return queryset.prefetch_related(*title_prefetches())
+
     def get_permissions(self):
         if self.action in ["update", "partial_update", "destroy"]:
             return [IsAuthenticated()]
@@ -37,17 +119,32 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
     def perform_update(self, serializer):
+        old_target = serializer.instance.comic or serializer.instance.novel
+        old_rating = serializer.instance.rating
         review = serializer.save()
         if review.comic:
             review.comic.update_average_rating()
         if review.novel:
             review.novel.update_average_rating()
 
+        target = review.comic or review.novel
+        if old_target == target:
+            if old_rating != review.rating:
+                RatingSummary.record(target, added=review.rating, removed=old_rating)
+        else:
+            # Review dipindah ke judul lain
+            old_target.update_average_rating()
+            RatingSummary.record(old_target, removed=old_rating)
+            RatingSummary.record(target, added=review.rating)
+
     def perform_destroy(self, instance):
         comic = instance.comic
         novel = instance.novel
+        rating = instance.rating
         instance.delete()
         if comic:
             comic.update_average_rating()
+            RatingSummary.record(comic, removed=rating)
         if novel:
             novel.update_average_rating()
+            RatingSummary.record(novel, removed=rating)
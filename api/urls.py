@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -6,7 +6,11 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from api.auth.views import TokenRefreshView
+
 urlpatterns = [
+    # Menggantikan token/refresh dari dj_rest_auth.urls (harus didaftarkan lebih dulu)
+    re_path(r"^auth/token/refresh/?$", TokenRefreshView.as_view(), name="token_refresh"),
     path("auth/", include("dj_rest_auth.urls")),
     path("auth/registration/", include("dj_rest_auth.registration.urls")),
     path("", include("api.contents.urls")),
@@ -14,6 +18,9 @@ urlpatterns = [
     path("library/", include("api.library.urls")),
     path("interactions/", include("api.interactions.urls")),
     path("profiles/", include("api.profiles.urls")),
+    path("metrics/", include("api.metrics.urls")),
+    # Endpoint baca versi async (ASGI)
+    path("async/", include("api.async_urls")),
 ]
 
 # Enable swagger doc
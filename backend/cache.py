@@ -0,0 +1,351 @@
+"""
+Cache dua tingkat: LRU in-process (L1) di depan cache bersama (L2, alias lain di
+CACHES, mis. Redis, file atau database cache).
+
+Baca: L1 dulu, lalu L2 (hasilnya disalin ke L1). Tulis dan hapus selalu ke L2,
+lalu key-nya diumumkan lewat log invalidation di L2: counter urutan
+`tiered:seq` dan satu entry `tiered:log:<n>` per key. Setiap proses membaca log
+tersebut paling lama setiap SYNC_INTERVAL detik dan membuang key yang berubah
+dari L1-nya; kalau log sudah hilang atau tertinggal terlalu jauh, seluruh L1
+dikosongkan.
+
+TTL per namespace (prefix key) diatur lewat OPTIONS["NAMESPACES"]:
+    "profile-stats": {"timeout": 3600, "local_timeout": 30}
+    "response-cache:lock": {"local": False}
+`timeout` dipakai untuk L2 jika pemanggil tidak memberi timeout sendiri,
+`local_timeout` membatasi umur entry di L1, dan `local: False` melewati L1
+(untuk key yang harus selalu dibaca dari L2, seperti lock); perubahan key seperti
+ini juga tidak ditulis ke log invalidation.
+
+Jika L2 adalah RedisCache, kenaikan counter dan entry log ditulis dalam satu round
+trip (script Lua); backend lain memakai add + incr + set_many.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.redis import RedisCache
+
+SEQ_KEY = "tiered:seq"
+LOG_KEY = "tiered:log:{seq}"
+# Log invalidation cukup hidup lebih lama dari interval sync terlama yang wajar
+LOG_TIMEOUT = 300
+# Lebih dari ini entry log yang tertinggal, L1 langsung dikosongkan
+MAX_LOG_GAP = 1000
+
+# KEYS[1] = counter; ARGV = prefix key log, timeout log, lalu key L1 yang diumumkan
+REDIS_PUBLISH_SCRIPT = """
+local count = #ARGV - 2
+local last = redis.call('INCRBY', KEYS[1], count)
+for i = 1, count do
+    redis.call('SET', ARGV[1] .. (last - count + i), ARGV[i + 2], 'EX', ARGV[2])
+end
+return last
+"""
+
+# django.core.cache.caches membuat instance backend per thread; L1 dan posisi
+# log disimpan per proses (seperti LocMemCache) supaya semua thread berbagi
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class _LocalTier:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key L1 -> (pickled value, expires_at)
+        self.entries = OrderedDict()
+        self.seen_seq = None
+        self.next_sync = 0.0
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "resets": 0}
+
+
+def _tier(name):
+    with _tiers_lock:
+        tier = _tiers.get(name)
+        if tier is None:
+            tier = _tiers[name] = _LocalTier()
+        return tier
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = options.get("L2", "shared")
+        self._local_timeout = options.get("LOCAL_TIMEOUT", 60)
+        self._sync_interval = options.get("SYNC_INTERVAL", 1.0)
+        # Prefix terpanjang dicocokkan lebih dulu
+        self._namespaces = sorted(
+            options.get("NAMESPACES", {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+        tier = _tier(f"{location}:{self._l2_alias}")
+        self._lock = tier.lock
+        self._local = tier.entries
+        self._stats = tier.stats
+        self._tier = tier
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # NAMESPACE
+    def _namespace(self, key):
+        for prefix, config in self._namespaces:
+            if key.startswith(prefix):
+                return config
+        return {}
+
+    def _shared_timeout(self, key, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            return self._namespace(key).get("timeout", DEFAULT_TIMEOUT)
+        return timeout
+
+    def _uses_local(self, key):
+        return self._namespace(key).get("local", True)
+
+    def _local_expiry(self, key, timeout):
+        """Umur entry L1: local_timeout namespace, tidak lebih lama dari timeout L2"""
+        local_timeout = self._namespace(key).get("local_timeout", self._local_timeout)
+        timeout = self._shared_timeout(key, timeout)
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.l2.default_timeout
+        if timeout is not None:
+            if timeout <= 0:
+                return None
+            local_timeout = min(local_timeout, timeout)
+        return time.monotonic() + local_timeout
+
+    # L1
+    def _local_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _local_get(self, local_key):
+        with self._lock:
+            item = self._local.get(local_key)
+            if item is None:
+                return None
+            pickled, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._local[local_key]
+                return None
+            self._local.move_to_end(local_key)
+        return pickle.loads(pickled)
+
+    def _local_set(self, key, local_key, value, timeout):
+        if not self._uses_local(key):
+            return
+        expires_at = self._local_expiry(key, timeout)
+        if expires_at is None:
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[local_key] = (pickled, expires_at)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _local_delete(self, *local_keys):
+        with self._lock:
+            for local_key in local_keys:
+                self._local.pop(local_key, None)
+
+    def _local_clear(self):
+        with self._lock:
+            self._local.clear()
+            self._stats["resets"] += 1
+
+    # INVALIDATION LOG
+    def _publish(self, *keys, version=None):
+        """Umumkan key yang berubah supaya proses lain membuangnya dari L1"""
+        # Key yang tidak pernah disimpan di L1 (mis. lock) tidak perlu diumumkan
+        local_keys = [self._local_key(key, version) for key in keys if self._uses_local(key)]
+        if not local_keys or self._publish_redis(local_keys):
+            return
+        l2 = self.l2
+        l2.add(SEQ_KEY, 0, None)
+        try:
+            last = l2.incr(SEQ_KEY, len(local_keys))
+        except ValueError:
+            # Counter hilang di antara add dan incr; proses lain akan reset L1
+            return
+        first = last - len(local_keys) + 1
+        l2.set_many(
+            {LOG_KEY.format(seq=seq): local_key for seq, local_key in zip(range(first, last + 1), local_keys)},
+            LOG_TIMEOUT,
+        )
+
+    def _publish_redis(self, local_keys):
+        """Counter + log dalam satu round trip; False jika L2 bukan Redis"""
+        l2 = self.l2
+        if not isinstance(l2, RedisCache):
+            return False
+        log_prefix = l2.make_and_validate_key(LOG_KEY.format(seq=""))
+        if l2.make_and_validate_key(LOG_KEY.format(seq=0)) != f"{log_prefix}0":
+            # KEY_FUNCTION custom: nama key log tidak bisa disusun di dalam script
+            return False
+        seq_key = l2.make_and_validate_key(SEQ_KEY)
+        # Nilai log harus diserialisasi sama seperti RedisCache.set_many
+        client = l2._cache.get_client(seq_key, write=True)
+        serializer = l2._cache._serializer
+        client.register_script(REDIS_PUBLISH_SCRIPT)(
+            keys=[seq_key],
+            args=[log_prefix, LOG_TIMEOUT, *[serializer.dumps(local_key) for local_key in local_keys]],
+        )
+        return True
+
+    def _sync(self, force=False):
+        tier = self._tier
+        now = time.monotonic()
+        if not force and now < tier.next_sync:
+            return
+        tier.next_sync = now + self._sync_interval
+
+        l2 = self.l2
+        seq = l2.get(SEQ_KEY) or 0
+        seen = tier.seen_seq
+        if seen is None or seq == seen:
+            # Proses baru: L1 masih kosong, cukup catat posisi log
+            tier.seen_seq = seq
+            return
+        if seq < seen or seq - seen > MAX_LOG_GAP:
+            self._local_clear()
+        else:
+            wanted = [LOG_KEY.format(seq=n) for n in range(seen + 1, seq + 1)]
+            changed = l2.get_many(wanted)
+            if len(changed) < len(wanted):
+                # Sebagian log sudah expire atau belum selesai ditulis
+                self._local_clear()
+            else:
+                self._local_delete(*changed.values())
+        tier.seen_seq = seq
+
+    def sync(self):
+        """Terapkan log invalidation sekarang juga (tanpa menunggu SYNC_INTERVAL)"""
+        self._sync(force=True)
+
+    # CACHE API
+    def get(self, key, default=None, version=None):
+        self._sync()
+        local_key = self._local_key(key, version)
+        if self._uses_local(key):
+            value = self._local_get(local_key)
+            if value is not None:
+                self._count("local_hits")
+                return value
+
+        sentinel = object()
+        value = self.l2.get(key, sentinel, version=version)
+        if value is sentinel:
+            self._count("misses")
+            return default
+        self._count("shared_hits")
+        self._local_set(key, local_key, value, DEFAULT_TIMEOUT)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found, pending = {}, []
+        for key in keys:
+            value = self._local_get(self._local_key(key, version)) if self._uses_local(key) else None
+            if value is not None:
+                found[key] = value
+            else:
+                pending.append(key)
+        self._count("local_hits", len(found))
+
+        if pending:
+            shared = self.l2.get_many(pending, version=version)
+            for key, value in shared.items():
+                self._local_set(key, self._local_key(key, version), value, DEFAULT_TIMEOUT)
+            self._count("shared_hits", len(shared))
+            self._count("misses", len(pending) - len(shared))
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self._local_key(key, version)
+        self.l2.set(key, value, self._shared_timeout(key, timeout), version=version)
+        self._publish(key, version=version)
+        self._local_set(key, local_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        by_timeout = {}
+        for key, value in data.items():
+            by_timeout.setdefault(self._shared_timeout(key, timeout), {})[key] = value
+        failed = []
+        for shared_timeout, chunk in by_timeout.items():
+            failed.extend(self.l2.set_many(chunk, shared_timeout, version=version))
+
+        written = [key for key in data if key not in failed]
+        self._publish(*written, version=version)
+        for key in written:
+            self._local_set(key, self._local_key(key, version), data[key], timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # Atomik di L2 (dipakai untuk lock); L1 hanya diisi jika berhasil
+        added = self.l2.add(key, value, self._shared_timeout(key, timeout), version=version)
+        if added:
+            self._publish(key, version=version)
+            self._local_set(key, self._local_key(key, version), value, timeout)
+        return added
+
+    def delete(self, key, version=None):
+        local_key = self._local_key(key, version)
+        self._local_delete(local_key)
+        deleted = self.l2.delete(key, version=version)
+        self._publish(key, version=version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        local_keys = [self._local_key(key, version) for key in keys]
+        self._local_delete(*local_keys)
+        self.l2.delete_many(keys, version=version)
+        self._publish(*keys, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, self._shared_timeout(key, timeout), version=version)
+
+    def has_key(self, key, version=None):
+        self._sync()
+        if self._uses_local(key) and self._local_get(self._local_key(key, version)) is not None:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self._local_key(key, version)
+        self._local_delete(local_key)
+        value = self.l2.incr(key, delta, version=version)
+        self._publish(key, version=version)
+        return value
+
+    def clear(self):
+        # Counter dilanjutkan lebih dari MAX_LOG_GAP setelah nilai lamanya, jadi setiap
+        # proses (termasuk yang terakhir sync saat seq masih 0) melihat gap dan reset L1
+        l2 = self.l2
+        seq = (l2.get(SEQ_KEY) or 0) + MAX_LOG_GAP + 1
+        self._local_clear()
+        l2.clear()
+        l2.set(SEQ_KEY, seq, None)
+        self._tier.seen_seq = seq
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    # METRICS
+    def _count(self, name, n=1):
+        if n:
+            with self._lock:
+                self._stats[name] += n
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+        return stats
@@ -0,0 +1,115 @@
+"""
+Metrik koneksi database per proses.
+
+Engine di backend.db.postgresql dan backend.db.sqlite3 adalah engine Django biasa
+yang mencatat setiap koneksi yang dibuka/ditutup. Waktu tunggu = durasi
+get_new_connection: handshake TCP + auth untuk koneksi baru, atau waktu menunggu
+koneksi kosong saat memakai pool psycopg.
+"""
+import threading
+import time
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class ConnectionMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # id(DatabaseWrapper) -> thread pemilik koneksi yang sedang terbuka
+        self._open = {}
+        # Thread yang sedang melayani request
+        self._active = set()
+        self._connects = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def opened(self, wrapper, waited):
+        with self._lock:
+            self._open[id(wrapper)] = threading.get_ident()
+            self._connects += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def closed(self, wrapper):
+        with self._lock:
+            self._open.pop(id(wrapper), None)
+
+    def request_started(self):
+        with self._lock:
+            self._active.add(threading.get_ident())
+
+    def request_finished(self):
+        with self._lock:
+            self._active.discard(threading.get_ident())
+
+    def snapshot(self):
+        with self._lock:
+            in_use = sum(1 for owner in self._open.values() if owner in self._active)
+            return {
+                "open": len(self._open),
+                "in_use": in_use,
+                "idle": len(self._open) - in_use,
+                "connects": self._connects,
+                "wait_ms_avg": self._wait_total / self._connects * 1000 if self._connects else 0.0,
+                "wait_ms_max": self._wait_max * 1000,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._connects = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+
+
+connection_metrics = ConnectionMetrics()
+
+
+class InstrumentedDatabaseWrapperMixin:
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        connection_metrics.opened(self, time.perf_counter() - start)
+        return connection
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            connection_metrics.closed(self)
+
+
+def pool_stats():
+    """Metrik koneksi proses ini, ditambah statistik pool psycopg per alias jika aktif"""
+    stats = connection_metrics.snapshot()
+    pools = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        raw = pool.get_stats()
+        size, available = raw.get("pool_size", 0), raw.get("pool_available", 0)
+        served = raw.get("requests_num", 0)
+        pools[alias] = {
+            "size": size,
+            "in_use": size - available,
+            "idle": available,
+            "waiting": raw.get("requests_waiting", 0),
+            "wait_ms_avg": raw.get("requests_wait_ms", 0) / served if served else 0.0,
+            "timeouts": raw.get("requests_errors", 0),
+        }
+    if pools:
+        stats["pools"] = pools
+    return stats
+
+
+def _request_started(**kwargs):
+    connection_metrics.request_started()
+
+
+def _request_finished(**kwargs):
+    connection_metrics.request_finished()
+
+
+request_started.connect(_request_started, dispatch_uid="db_metrics_request_started")
+request_finished.connect(_request_finished, dispatch_uid="db_metrics_request_finished")
@@ -0,0 +1,269 @@
+"""
+Profiling per request (opsional, PROFILING_ENABLED).
+
+ProfilingMiddleware mencatat untuk setiap request:
+- waktu dan jumlah query DB, lewat execute_wrapper di setiap koneksi (dipasang
+  saat koneksi dibuat, jadi ikut juga untuk query dari thread sync_to_async),
+- waktu serialisasi: akses `serializer.data` paling luar (termasuk query lazy
+  yang dipicunya) untuk serializer dari get_serializer() view yang memakai
+  SerializerTimingMixin, atau yang dibungkus timed_serializer(),
+- waktu render response (DRF Response / TemplateResponse).
+
+Hasilnya dikirim sebagai header `Server-Timing` dan log terstruktur di logger
+`backend.profiling` (field-nya juga ada di `record.profile`).
+
+Sebagian request (PROFILING_SAMPLE_RATE) dijalankan di bawah cProfile; jika
+request tersebut lebih lambat dari PROFILING_SLOW_MS, statistik fungsi teratas
+ditulis ke log dan file .prof disimpan di PROFILING_DUMP_DIR (jika diisi).
+Hanya satu request per proses yang diprofil pada satu waktu; di ASGI cProfile
+hanya melihat thread event loop.
+"""
+import cProfile
+import io
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Jumlah baris statistik cProfile yang ditulis ke log
+PROFILE_STATS_LIMIT = 30
+
+_current = ContextVar("request_profile", default=None)
+# Per context (bukan per profil): section yang jalan paralel di thread lain punya
+# salinan context sendiri
+_serialize_depth = ContextVar("serialize_depth", default=0)
+# cProfile memakai hook global per thread; batasi satu profil aktif per proses
+_profiler_lock = threading.Lock()
+_instrument_lock = threading.Lock()
+_instrumented = False
+
+
+class RequestProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_ms = 0.0
+        self.queries = 0
+        self.serialize_ms = 0.0
+        self.render_ms = 0.0
+        self.render_start = None
+        # Query dan serialisasi bisa dicatat dari beberapa thread sekaligus
+        # (section /page/, sync_to_async)
+        self._lock = threading.Lock()
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def add_query(self, ms):
+        with self._lock:
+            self.db_ms += ms
+            self.queries += 1
+
+    def add_serialization(self, ms):
+        with self._lock:
+            self.serialize_ms += ms
+
+    def timings(self, total_ms):
+        return {
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(self.db_ms, 2),
+            "queries": self.queries,
+            "serialize_ms": round(self.serialize_ms, 2),
+            "render_ms": round(self.render_ms, 2),
+        }
+
+    def server_timing(self, total_ms):
+        return ", ".join([
+            f'db;dur={self.db_ms:.2f};desc="{self.queries} queries"',
+            f"serialize;dur={self.serialize_ms:.2f}",
+            f"render;dur={self.render_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query((time.perf_counter() - start) * 1000)
+
+
+def _install_wrapper(connection, **kwargs):
+    # execute_wrappers milik objek koneksi dan bertahan setelah reconnect
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def _timed_serialization(profile):
+    # Serializer yang dipanggil di dalam serializer lain tidak dihitung dua kali
+    token = _serialize_depth.set(_serialize_depth.get() + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _serialize_depth.reset(token)
+        if not _serialize_depth.get():
+            profile.add_serialization((time.perf_counter() - start) * 1000)
+
+
+class _TimedSerializer:
+    """Proxy serializer: akses `.data` dicatat ke profil request"""
+
+    def __init__(self, serializer, profile):
+        self._serializer = serializer
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._serializer, name)
+
+    @property
+    def data(self):
+        with _timed_serialization(self._profile):
+            return self._serializer.data
+
+
+def timed_serializer(serializer):
+    """Bungkus serializer jika request sedang diprofil; selain itu dikembalikan apa adanya"""
+    profile = _current.get()
+    if profile is None:
+        return serializer
+    return _TimedSerializer(serializer, profile)
+
+
+class SerializerTimingMixin:
+    """Mixin view DRF: serializer dari get_serializer() masuk waktu serialisasi profil"""
+
+    def get_serializer(self, *args, **kwargs):
+        return timed_serializer(super().get_serializer(*args, **kwargs))
+
+
+def _instrument():
+    """Pasang hook DB sekali per proses"""
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return
+        connection_created.connect(_install_wrapper, weak=False)
+        for alias in connections:
+            _install_wrapper(connections[alias])
+        _instrumented = True
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        _instrument()
+
+    def process_template_response(self, request, response):
+        profile = _current.get()
+        if profile is not None:
+            profile.render_start = time.perf_counter()
+            response.add_post_render_callback(self._rendered)
+        return response
+
+    @staticmethod
+    def _rendered(response):
+        profile = _current.get()
+        if profile is not None and profile.render_start is not None:
+            profile.render_ms += (time.perf_counter() - profile.render_start) * 1000
+
+    def _start(self):
+        profiler = None
+        if random.random() < settings.PROFILING_SAMPLE_RATE and _profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return RequestProfile(), profiler
+
+    @staticmethod
+    def _stop(profiler):
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+
+    def _finish(self, request, response, profile, profiler):
+        total_ms = profile.total_ms
+        response["Server-Timing"] = profile.server_timing(total_ms)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **profile.timings(total_ms),
+        }
+        slow = total_ms >= settings.PROFILING_SLOW_MS
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"profile": fields},
+        )
+        if profiler is not None and slow:
+            self._dump(request, profiler, fields)
+        return response
+
+    def _dump(self, request, profiler, fields):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_STATS_LIMIT)
+        logger.warning(
+            "slow request profile method=%s path=%s total_ms=%s\n%s",
+            request.method, request.path, fields["total_ms"], stream.getvalue(),
+            extra={"profile": fields},
+        )
+        if settings.PROFILING_DUMP_DIR:
+            directory = Path(settings.PROFILING_DUMP_DIR)
+            slug = re.sub(r"[^\w-]+", "_", request.path).strip("_") or "root"
+            name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{slug}.prof"
+            # Gagal menyimpan dump tidak boleh menggagalkan request
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(directory / name)
+            except OSError:
+                logger.exception("cannot write profile dump to %s", directory)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Koneksi yang sudah terbuka sebelum hook dipasang (mis. thread lama)
+        for alias in connections:
+            _install_wrapper(connections[alias])
+        profile, profiler = self._start()
+        token = _current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+            self._stop(profiler)
+        return self._finish(request, response, profile, profiler)
+
+    async def __acall__(self, request):
+        profile, profiler = self._start()
+        token = _current.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+            self._stop(profiler)
+        return self._finish(request, response, profile, profiler)
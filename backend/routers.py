@@ -0,0 +1,141 @@
+"""
+Routing baca ke read replica (settings.DATABASE_REPLICAS).
+
+Replica hanya dipakai untuk request GET/HEAD/OPTIONS ke /api/ (diaktifkan
+StickyPrimaryMiddleware); request lain, management command dan thread latar tetap
+membaca dari primary. Dalam request yang boleh memakai replica, baca tetap ke
+primary jika:
+- request sudah menulis (db_for_write dipanggil, termasuk select_for_update dan
+  get_or_create), supaya baca berikutnya melihat tulisan itu,
+- sedang di dalam transaction.atomic() di primary,
+- client baru saja menulis: setelah request yang menulis, middleware memasang
+  cookie sticky selama REPLICA_STICKY_SECONDS (lebih lama dari lag replikasi),
+  dan selama cookie itu ada semua baca client tersebut ke primary.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_COOKIE = "primary_sticky"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class _RoutingState:
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+# Default: semua baca ke primary. Objek state bersifat mutable supaya flag `wrote`
+# dari thread sync_to_async (yang menyalin context) terlihat oleh middleware.
+_state = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Izinkan (atau larang) baca dari replica di dalam blok ini"""
+    token = _state.set(_RoutingState(use_replica=enabled))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Paksa semua baca di dalam blok ini ke primary"""
+    with replica_reads(enabled=False) as state:
+        yield state
+
+
+class PrimaryReplicaRouter:
+    def _replicas(self):
+        return settings.DATABASE_REPLICAS
+
+    def db_for_read(self, model, **hints):
+        replicas = self._replicas()
+        if not replicas:
+            return None
+        state = _state.get()
+        if (
+            state is None
+            or not state.use_replica
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Object dari replica dan primary adalah data yang sama
+        databases = {DEFAULT_DB_ALIAS, *self._replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica ikut skema primary lewat replikasi
+        if db in self._replicas():
+            return False
+        return None
+
+
+class StickyPrimaryMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _state_for(self, request):
+        return _RoutingState(
+            use_replica=(
+                bool(settings.DATABASE_REPLICAS)
+                and request.method in SAFE_METHODS
+                and request.path.startswith("/api/")
+                and STICKY_COOKIE not in request.COOKIES
+            )
+        )
+
+    def _finish(self, request, response, state):
+        if settings.DATABASE_REPLICAS and (state.wrote or request.method not in SAFE_METHODS):
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self._state_for(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self._state_for(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(request, response, state)
@@ -6,6 +6,9 @@ from pathlib import Path
 import environ
 import os
 from datetime import timedelta
+from importlib.util import find_spec
+
+from django.core.exceptions import ImproperlyConfigured
 
 # Django-environ
 env = environ.Env()
@@ -16,6 +19,11 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Take environment variables from .env file
 environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
 
+def require_package(module, package, setting):
+    """Dependency opsional (ada di requirements.txt) wajib terpasang jika fiturnya dipakai"""
+    if find_spec(module) is None:
+        raise ImproperlyConfigured(f"{setting} needs the `{package}` package: pip install \"{package}\"")
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env.str("SECRET_KEY")
 
@@ -56,8 +64,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Paling luar supaya total waktu mencakup semua middleware; nonaktif kecuali PROFILING_ENABLED
+    'backend.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Sebelum session/auth supaya query keduanya ikut aturan routing replica
+    'backend.routers.StickyPrimaryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,9 +98,75 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 # Database
-DATABASES = {"default": env.db()}
+# Engine Django yang sama, ditambah metrik koneksi (backend.db)
+INSTRUMENTED_ENGINES = {
+    "django.db.backends.postgresql": "backend.db.postgresql",
+    "django.db.backends.sqlite3": "backend.db.sqlite3",
+}
+
+
+def database_config(url):
+    config = env.db_url_config(url)
+    config["ENGINE"] = INSTRUMENTED_ENGINES.get(config["ENGINE"], config["ENGINE"])
+    # Koneksi dipakai ulang sampai DB_CONN_MAX_AGE detik (default 0 = tutup tiap request),
+    # dicek dulu sebelum dipakai ulang supaya koneksi mati tidak menggagalkan request.
+    # Hanya untuk WSGI: di ASGI tiap request async/thread pool membuka koneksi persisten
+    # sendiri sehingga jumlah koneksi tidak terbatas; pakai DB_POOL
+    config["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", 0)
+    config["CONN_HEALTH_CHECKS"] = env.bool("DB_CONN_HEALTH_CHECKS", True)
+    # Pool psycopg 3 (butuh paket psycopg[pool]) menggantikan koneksi persisten
+    if env.bool("DB_POOL", False) and config["ENGINE"] == "backend.db.postgresql":
+        require_package("psycopg_pool", "psycopg[binary,pool]", "DB_POOL")
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", 2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", 10),
+            "timeout": env.float("DB_POOL_TIMEOUT", 10.0),
+        }
+    return config
+
+
+DATABASES = {"default": database_config(env.str("DATABASE_URL"))}
+
+# Read replica: GET/HEAD /api/ dibaca dari salah satu replica (backend.routers),
+# kecuali client yang baru menulis (sticky ke primary selama REPLICA_STICKY_SECONDS)
+DATABASE_ROUTERS = ["backend.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_STICKY_SECONDS = env.int("REPLICA_STICKY_SECONDS", 5)
+for index, url in enumerate(env.list("REPLICA_DATABASE_URLS", default=[]), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = database_config(url)
+    DATABASE_REPLICAS.append(alias)
+
+# Cache: LRU in-process (L1) di depan cache bersama antar worker (L2, CACHE_URL).
+# Contoh L2: redis://127.0.0.1:6379/1, filecache:///var/tmp/django_cache, dbcache://cache_table
+CACHES = {
+    "default": {
+        "BACKEND": "backend.cache.TieredCache",
+        "OPTIONS": {
+            "L2": "shared",
+            "MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES", 10000),
+            "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT", 60),
+            "SYNC_INTERVAL": env.float("CACHE_SYNC_INTERVAL", 1.0),
+            "NAMESPACES": {
+                "profile-stats": {"timeout": 60 * 60, "local_timeout": 30},
+                "user-lookup": {"timeout": 60 * 60, "local_timeout": 300},
+                # Status akun (user dinonaktifkan admin) harus cepat terbaca ulang
+                "user-state": {"timeout": 5 * 60, "local_timeout": 30},
+                "response-cache:entry": {"local_timeout": 60},
+                "response-cache:tag": {"local_timeout": 60},
+                # Lock single-flight harus selalu dibaca dari L2
+                "response-cache:lock": {"local": False},
+            },
+        },
+    },
+    "shared": env.cache("CACHE_URL", default="locmemcache://"),
+}
+if CACHES["shared"]["BACKEND"] == "django.core.cache.backends.redis.RedisCache":
+    require_package("redis", "redis", "CACHE_URL")
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -158,7 +236,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
+        "api.auth.authentication.StatelessJWTCookieAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -167,6 +245,32 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Response cache untuk request katalog anonim (contents.cache)
+RESPONSE_CACHE_ENABLED = env.bool("RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", 300)
+
+# Profiling per request (backend.profiling): header Server-Timing dan log per request,
+# cProfile untuk sebagian request (SAMPLE_RATE) yang lebih lambat dari SLOW_MS
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", False)
+PROFILING_SLOW_MS = env.float("PROFILING_SLOW_MS", 500.0)
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", 0.01)
+PROFILING_DUMP_DIR = env.str("PROFILING_DUMP_DIR", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "backend.profiling": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# Write-behind like buffer (untuk review yang viral)
+LIKE_WRITE_BEHIND = env.bool("LIKE_WRITE_BEHIND", False)
+LIKE_FLUSH_INTERVAL = env.float("LIKE_FLUSH_INTERVAL", 2.0)
+
 # allauth
 ACCOUNT_SIGNUP_FIELDS = ["username*", "email*", "password1*", "password2*"]
 ACCOUNT_LOGIN_METHODS = ["username", "email"]
@@ -197,5 +301,8 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Interval (detik) sinkronisasi Bloom filter refresh-token blacklist per proses
+TOKEN_BLACKLIST_SYNC_INTERVAL = env.float("TOKEN_BLACKLIST_SYNC_INTERVAL", 1.0)
+
 # Custom User Model
 AUTH_USER_MODEL = "member.User"
\ No newline at end of file
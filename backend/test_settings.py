@@ -0,0 +1,9 @@
+"""
+Settings untuk `python manage.py test` (dipilih manage.py, atau lewat --settings).
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+# Alias "replica" memakai database test yang sama dengan default; routing
+# diaktifkan per test lewat override_settings(DATABASE_REPLICAS=["replica"])
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
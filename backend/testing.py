@@ -0,0 +1,9 @@
+"""Helper bersama untuk tests.py di setiap app"""
+
+
+def statements(ctx):
+    """Query dari CaptureQueriesContext yang benar-benar dikirim, tanpa SAVEPOINT/RELEASE dari atomic()"""
+    return [
+        q["sql"] for q in ctx.captured_queries
+        if not q["sql"].upper().startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    ]
@@ -0,0 +1,340 @@
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache, RedisSerializer
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.profiles.views import _submit_section
+from backend import cache as tiered
+from backend.cache import TieredCache
+from backend.profiling import RequestProfile
+from backend.routers import STICKY_COOKIE, replica_reads
+from backend.settings import require_package
+from contents.models import Comic, Novel
+from interactions.models import Like
+from member.models import User
+from reviews.models import Review
+
+
+class TieredCacheTests(SimpleTestCase):
+    OPTIONS = {
+        "L2": "shared",
+        "SYNC_INTERVAL": 60,
+        "NAMESPACES": {
+            "short": {"timeout": 30, "local_timeout": 5},
+            "lock": {"local": False},
+        },
+    }
+
+    def setUp(self):
+        caches["shared"].clear()
+        # Dua "proses": L1 terpisah, L2 yang sama
+        location = uuid.uuid4().hex
+        self.a = self._cache(f"{location}-a")
+        self.b = self._cache(f"{location}-b")
+
+    def _cache(self, location):
+        cache = TieredCache(location, {"OPTIONS": self.OPTIONS})
+        cache.sync()
+        return cache
+
+    def test_reads_fill_local_tier(self):
+        self.a.set("key", "value")
+        self.assertEqual(self.b.get("key"), "value")
+        self.assertEqual(self.b.get("key"), "value")
+        stats = self.b.stats()
+        self.assertEqual((stats["shared_hits"], stats["local_hits"]), (1, 1))
+
+    def test_write_in_other_process_invalidates_after_sync(self):
+        self.a.set("key", "old")
+        self.assertEqual(self.b.get("key"), "old")
+
+        self.a.set("key", "new")
+        # Sebelum SYNC_INTERVAL lewat, L1 proses lain masih menyimpan nilai lama
+        self.assertEqual(self.b.get("key"), "old")
+        self.b.sync()
+        self.assertEqual(self.b.get("key"), "new")
+
+        self.a.delete("key")
+        self.b.sync()
+        self.assertIsNone(self.b.get("key"))
+
+    def test_missing_log_entries_reset_local_tier(self):
+        self.a.set("key", "old")
+        self.b.get("key")
+        self.a.set("key", "new")
+        caches["shared"].delete(tiered.LOG_KEY.format(seq=caches["shared"].get(tiered.SEQ_KEY)))
+        self.b.sync()
+        self.assertEqual(self.b.stats()["resets"], 1)
+        self.assertEqual(self.b.get("key"), "new")
+
+    def test_large_log_gap_resets_local_tier(self):
+        self.b.get("unrelated")
+        with mock.patch.object(tiered, "MAX_LOG_GAP", 2):
+            self.a.set_many({f"key{i}": i for i in range(3)})
+            self.b.sync()
+        self.assertEqual(self.b.stats()["resets"], 1)
+
+    def test_namespaces(self):
+        self.a.set("lock:1", 1)
+        self.assertEqual(self.a.get("lock:1"), 1)
+        self.assertEqual(self.a.stats()["local_entries"], 0)
+
+        with mock.patch.object(caches["shared"], "set", wraps=caches["shared"].set) as shared_set:
+            self.a.set("short:1", 1)
+        self.assertEqual(shared_set.call_args_list[0].args[2], 30)
+        with mock.patch("backend.cache.time.monotonic", return_value=tiered.time.monotonic() + 10):
+            self.assertEqual(self.a.get("short:1"), 1)
+        self.assertEqual(self.a.stats()["local_hits"], 0)
+
+    def test_keys_outside_local_tier_are_not_published(self):
+        self.a.set("key", 1)
+        seq = caches["shared"].get(tiered.SEQ_KEY)
+        self.assertTrue(self.a.add("lock:1", 1))
+        self.a.delete("lock:1")
+        self.a.set_many({"lock:2": 1, "key": 2})
+        self.assertEqual(caches["shared"].get(tiered.SEQ_KEY), seq + 1)
+        self.assertEqual(caches["shared"].get(tiered.LOG_KEY.format(seq=seq + 1)), self.a.make_key("key"))
+
+    def test_redis_publishes_counter_and_log_in_one_call(self):
+        l2 = RedisCache("redis://127.0.0.1:6379/1", {})
+        client = l2.__dict__["_cache"] = mock.Mock(_serializer=RedisSerializer())
+        script = client.get_client.return_value.register_script.return_value
+        with mock.patch.object(TieredCache, "l2", l2):
+            self.a.delete_many(["key", "lock:1", "other"])
+        script.assert_called_once_with(
+            keys=[l2.make_key(tiered.SEQ_KEY)],
+            args=[
+                l2.make_key("tiered:log:"),
+                tiered.LOG_TIMEOUT,
+                *[RedisSerializer().dumps(self.a.make_key(key)) for key in ("key", "other")],
+            ],
+        )
+        client.get_client.return_value.register_script.assert_called_once_with(tiered.REDIS_PUBLISH_SCRIPT)
+        client.incr.assert_not_called()
+
+    def test_add_only_fills_local_tier_on_success(self):
+        self.assertTrue(self.a.add("key", "first"))
+        self.assertFalse(self.b.add("key", "second"))
+        self.assertEqual(self.b.get("key"), "first")
+        self.assertEqual(self.b.stats()["shared_hits"], 1)
+
+    def test_clear_resets_other_processes(self):
+        self.a.set("key", "value")
+        self.b.get("key")
+        self.a.clear()
+        self.b.sync()
+        self.assertIsNone(self.b.get("key"))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class AsyncViewTests(TransactionTestCase):
+    # Section view async jalan di thread lain dengan koneksi sendiri, jadi data harus commit
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="secret-pass-123")
+        self.fan = User.objects.create_user(username="fan", password="secret-pass-123")
+        comics = [Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga") for i in range(3)]
+        novel = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        reviews = [
+            Review.objects.create(user=self.user, comic=comic, content="Review", rating=Decimal("8.0"))
+            for comic in comics[:2]
+        ]
+        Review.objects.create(user=self.user, novel=novel, content="Review", rating=Decimal("6.0"))
+        Like.objects.create(user=self.fan, review=reviews[0])
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.fan)}"}
+
+    async def _both(self, path, **headers):
+        sync_response = await sync_to_async(self.client.get)(f"/api{path}", headers=headers)
+        async_response = await self.async_client.get(f"/api/async{path}", headers=headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        return async_response.json(), sync_response.json()
+
+    async def test_catalog_matches_sync_endpoints(self):
+        async_data, sync_data = await self._both("/comics/?ordering=title")
+        self.assertEqual(async_data, sync_data)
+        self.assertEqual([c["reviews_count"] for c in async_data["results"]], [1, 1, 0])
+
+        comic = await Comic.objects.afirst()
+        async_data, sync_data = await self._both(f"/comics/{comic.pk}/")
+        self.assertEqual(async_data, sync_data)
+
+        response = await self.async_client.get("/api/async/novels/999/")
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get("/api/async/comics/?page=9")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_feed_uses_token_user(self):
+        async_data, sync_data = await self._both("/reviews/feed/", **self.auth)
+        self.assertEqual(async_data, sync_data)
+        self.assertEqual(sum(r["is_liked"] for r in async_data["results"]), 1)
+
+        response = await self.async_client.get("/api/async/reviews/feed/", headers={"Authorization": "Bearer bad"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_profile_stats_and_page(self):
+        async_data, sync_data = await self._both("/profiles/reader/stats/")
+        self.assertEqual(async_data, sync_data)
+        self.assertEqual(async_data["reviews"]["total"], 3)
+        self.assertEqual(async_data["reviews"]["likes_received"], 1)
+
+        async_data, sync_data = await self._both("/profiles/reader/page/", **self.auth)
+        self.assertEqual(async_data, sync_data)
+        self.assertEqual(set(async_data), {"profile", "stats", "favorites", "library", "reviews"})
+
+        response = await self.async_client.get("/api/async/profiles/nobody/stats/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_writes_are_rejected(self):
+        response = await self.async_client.post("/api/async/comics/")
+        self.assertEqual(response.status_code, 405)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0, RESPONSE_CACHE_ENABLED=False)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+
+    def _timings(self, response):
+        timings = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, duration, *desc = metric.split(";")
+            timings[name] = (float(duration.removeprefix("dur=")), desc)
+        return timings
+
+    def test_server_timing_and_log(self):
+        with self.assertLogs("backend.profiling", "INFO") as logs:
+            response = self.client.get("/api/comics/")
+        self.assertEqual(response.status_code, 200)
+        timings = self._timings(response)
+        self.assertEqual(set(timings), {"db", "serialize", "render", "total"})
+        self.assertRegex(timings["db"][1][0], r'desc="[1-9]\d* queries"')
+        self.assertGreater(timings["serialize"][0], 0)
+        self.assertGreater(timings["render"][0], 0)
+        self.assertEqual(logs.records[0].profile["path"], "/api/comics/")
+        self.assertEqual(logs.records[0].profile["status"], 200)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_SLOW_MS=0)
+    def test_slow_sampled_request_logs_profile(self):
+        with self.assertLogs("backend.profiling", "WARNING") as logs:
+            self.client.get("/api/comics/")
+        self.assertTrue(any("slow request profile" in line and "cumulative" in line for line in logs.output))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get("/api/comics/")
+        self.assertNotIn("Server-Timing", response)
+
+    def test_serializer_class_is_not_patched(self):
+        self.client.get("/api/comics/")
+        self.assertEqual(BaseSerializer.data.fget.__module__, "rest_framework.serializers")
+
+    def test_counters_are_thread_safe(self):
+        profile = RequestProfile()
+
+        def record():
+            for _ in range(1000):
+                profile.add_query(0.5)
+                profile.add_serialization(0.25)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(record) for _ in range(8)]:
+                future.result()
+        self.assertEqual(profile.queries, 8000)
+        self.assertEqual(profile.db_ms, 4000)
+        self.assertEqual(profile.serialize_ms, 2000)
+
+
+class MetricsTests(TestCase):
+    def test_admin_only(self):
+        self.assertIn(self.client.get("/api/metrics/").status_code, (401, 403))
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="admin", is_staff=True))
+        response = client.get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreaterEqual(data["database"]["open"], 1)
+        self.assertEqual(
+            set(data["database"]) - {"pools"},
+            {"open", "in_use", "idle", "connects", "wait_ms_avg", "wait_ms_max"},
+        )
+        self.assertIn("hit_ratio", data["response_cache"])
+
+    def test_missing_optional_package_is_reported(self):
+        require_package("django", "Django", "TEST")
+        with self.assertRaisesMessage(ImproperlyConfigured, 'DB_POOL needs the `psycopg[binary,pool]` package'):
+            require_package("no_such_module_for_tests", "psycopg[binary,pool]", "DB_POOL")
+
+
+@unittest.skipUnless("replica" in settings.DATABASES, "needs backend.test_settings")
+@override_settings(DATABASE_REPLICAS=["replica"], RESPONSE_CACHE_ENABLED=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    # "replica" adalah mirror database test default (backend/test_settings.py). Bukan
+    # TestCase: di dalam atomic() test semua baca memang diarahkan ke primary
+    databases = {"default", "replica"}
+
+    def test_anonymous_catalog_read_uses_replica(self):
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get("/api/genres/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse(primary.captured_queries)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_sticky_cookie_reads_from_primary(self):
+        self.client.cookies[STICKY_COOKIE] = "1"
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get("/api/genres/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(replica.captured_queries)
+
+    def test_write_request_sets_sticky_cookie(self):
+        User.objects.create_user(username="reader", password="secret-pass-123")
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.post(
+                "/api/auth/login/",
+                {"username": "reader", "password": "secret-pass-123"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(replica.captured_queries)
+        self.assertEqual(response.cookies[STICKY_COOKIE]["max-age"], 5)
+
+    def test_reads_after_write_or_in_atomic_use_primary(self):
+        with replica_reads():
+            self.assertEqual(Comic.objects.all().db, "replica")
+            with transaction.atomic():
+                self.assertEqual(Comic.objects.all().db, "default")
+            self.assertEqual(Comic.objects.all().db, "replica")
+
+            Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+            self.assertEqual(Comic.objects.all().db, "default")
+
+        with replica_reads():
+            self.assertEqual(Comic.objects.select_for_update().db, "default")
+            self.assertEqual(Comic.objects.all().db, "default")
+
+    def test_profile_sections_keep_request_routing(self):
+        # Section /page/ jalan di thread executor; state routing ikut disalin
+        with replica_reads():
+            self.assertEqual(_submit_section(lambda: Comic.objects.all().db).result(), "replica")
+            with replica_reads(enabled=False):
+                self.assertEqual(_submit_section(lambda: Comic.objects.all().db).result(), "default")
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(Comic.objects.all().db, "default")
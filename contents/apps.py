@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "contents"
+
+    def ready(self):
+        # Daftarkan signal invalidation response cache katalog
+        from contents import cache  # noqa: F401
@@ -0,0 +1,245 @@
+"""
+Response cache untuk request katalog anonim (GET/HEAD tanpa user login).
+
+Entry disimpan per path + query params yang dinormalisasi, bersama versi setiap
+tag dependensinya (mis. `comic:12`, `catalog:comics`, `genres`). Invalidation
+cukup mengganti versi tag; entry yang versi tag-nya sudah beda dianggap miss.
+Versi tag berupa token acak tanpa timeout, jadi tag yang ter-evict juga otomatis
+membuat entry lama tidak valid.
+
+Key yang sedang dihitung dijaga single-flight: satu thread per proses (lock lokal)
+dan satu proses per key (lock `cache.add`), sisanya menunggu hasilnya.
+"""
+import threading
+import time
+import uuid
+from hashlib import sha1
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from contents.models import Comic, Genre, Novel
+from reviews.models import RatingSummary, Review
+
+ENTRY_KEY = "response-cache:entry:{digest}"
+LOCK_KEY = "response-cache:lock:{digest}"
+TAG_KEY = "response-cache:tag:{tag}"
+# Batas waktu satu request menghitung ulang entry; setelah itu waiter menghitung sendiri
+LOCK_TIMEOUT = 10
+WAIT_INTERVAL = 0.02
+
+
+def catalog_tag(kind):
+    return f"catalog:{kind}s"
+
+
+def object_tag(kind, object_id):
+    # pk dari URL berupa string ("05"), samakan dengan pk dari signal
+    try:
+        object_id = int(object_id)
+    except (TypeError, ValueError):
+        pass
+    return f"{kind}:{object_id}"
+
+
+def trending_tag(kind):
+    return f"trending:{kind}"
+
+
+def normalized_key(request):
+    """Key dari host + path + query params yang diurutkan (param kosong dibuang)"""
+    params = sorted(
+        (name, value)
+        for name, values in request.GET.lists()
+        for value in values
+        if value != ""
+    )
+    raw = f"{request.get_host()}{request.path}?{urlencode(params)}"
+    return sha1(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self):
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    # METRICS
+    def _count(self, name, n=1):
+        with self._metrics_lock:
+            self._metrics[name] += n
+
+    def metrics(self):
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        served = metrics["hits"] + metrics["coalesced"] + metrics["misses"]
+        metrics["hit_ratio"] = (metrics["hits"] + metrics["coalesced"]) / served if served else 0.0
+        return metrics
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+    # TAGS
+    def tag_versions(self, tags):
+        keys = {TAG_KEY.format(tag=tag): tag for tag in tags}
+        found = cache.get_many(list(keys))
+        missing = {key: uuid.uuid4().hex for key in keys if key not in found}
+        for key, version in missing.items():
+            # add() supaya proses lain yang lebih dulu membuat versi tidak ditimpa
+            if not cache.add(key, version, None):
+                missing[key] = cache.get(key, version)
+        found.update(missing)
+        return {keys[key]: version for key, version in found.items()}
+
+    def invalidate(self, *tags):
+        """Ganti versi tag setelah transaksi commit"""
+        tags = {tag for tag in tags if tag}
+        if not tags:
+            return
+
+        def bump():
+            cache.set_many({TAG_KEY.format(tag=tag): uuid.uuid4().hex for tag in tags}, None)
+            self._count("invalidations", len(tags))
+
+        transaction.on_commit(bump)
+
+    # ENTRIES
+    def _fresh(self, digest):
+        entry = cache.get(ENTRY_KEY.format(digest=digest))
+        if entry is None:
+            return None
+        if self.tag_versions(entry["tags"]) != entry["tags"]:
+            return None
+        return entry
+
+    def _acquire_local(self, digest):
+        """Lock per key dengan refcount, dihapus setelah tidak ada thread yang memakai"""
+        with self._locks_guard:
+            slot = self._locks.get(digest)
+            if slot is None:
+                slot = self._locks[digest] = [threading.Lock(), 0]
+            slot[1] += 1
+            return slot
+
+    def _release_local(self, digest, slot):
+        with self._locks_guard:
+            slot[1] -= 1
+            if not slot[1]:
+                del self._locks[digest]
+
+    def _wait_for(self, digest):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        lock_key = LOCK_KEY.format(digest=digest)
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            entry = self._fresh(digest)
+            if entry is not None:
+                return entry
+            if cache.get(lock_key) is None:
+                break
+        return None
+
+    def get_or_build(self, digest, tags, build):
+        """
+        Return (entry, status) dengan status HIT, COALESCED atau MISS. `build` dipanggil
+        tanpa argumen dan harus return (status_code, data) atau None jika tidak boleh di-cache.
+        """
+        entry = self._fresh(digest)
+        if entry is not None:
+            self._count("hits")
+            return entry, "HIT"
+
+        slot = self._acquire_local(digest)
+        try:
+            with slot[0]:
+                entry = self._fresh(digest)
+                if entry is not None:
+                    self._count("coalesced")
+                    return entry, "COALESCED"
+
+                lock_key = LOCK_KEY.format(digest=digest)
+                owner = cache.add(lock_key, 1, LOCK_TIMEOUT)
+                if not owner:
+                    # Proses lain sedang menghitung key yang sama
+                    entry = self._wait_for(digest)
+                    if entry is not None:
+                        self._count("coalesced")
+                        return entry, "COALESCED"
+
+                try:
+                    self._count("misses")
+                    # Versi tag diambil sebelum build: invalidation di tengah build
+                    # membuat entry ini langsung basi
+                    versions = self.tag_versions(tags)
+                    built = build()
+                    if built is None:
+                        return None, "MISS"
+                    status_code, data = built
+                    entry = {"tags": versions, "status": status_code, "data": data}
+                    cache.set(ENTRY_KEY.format(digest=digest), entry, settings.RESPONSE_CACHE_TIMEOUT)
+                    return entry, "MISS"
+                finally:
+                    if owner:
+                        cache.delete(lock_key)
+        finally:
+            self._release_local(digest, slot)
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_titles(kind, object_ids):
+    """Invalidate detail, list dan trending untuk judul yang ditulis tanpa signal"""
+    tags = [object_tag(kind, object_id) for object_id in object_ids]
+    response_cache.invalidate(catalog_tag(kind), trending_tag(kind), *tags)
+
+
+def invalidate_title(kind, object_id):
+    invalidate_titles(kind, [object_id])
+
+
+# SIGNALS
+@receiver(post_save, sender=Comic)
+@receiver(post_delete, sender=Comic)
+@receiver(post_save, sender=Novel)
+@receiver(post_delete, sender=Novel)
+def invalidate_title_responses(sender, instance, **kwargs):
+    invalidate_title(sender._meta.model_name, instance.pk)
+
+
+@receiver(m2m_changed, sender=Comic.genres.through)
+@receiver(m2m_changed, sender=Novel.genres.through)
+def invalidate_title_genres(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # instance adalah Genre, pk_set berisi judul (None untuk post_clear)
+        invalidate_titles(model._meta.model_name, pk_set or ())
+    else:
+        invalidate_title(instance._meta.model_name, instance.pk)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre_responses(sender, instance, **kwargs):
+    # Genre ikut diserialisasi di setiap judul
+    response_cache.invalidate("genres")
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=RatingSummary)
+@receiver(post_delete, sender=RatingSummary)
+def invalidate_reviewed_title(sender, instance, **kwargs):
+    # reviews_count, histogram dan popularity judul berubah
+    if instance.comic_id:
+        invalidate_title("comic", instance.comic_id)
+    if instance.novel_id:
+        invalidate_title("novel", instance.novel_id)
@@ -0,0 +1,148 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Count, Max, Min
+
+from contents.cache import invalidate_titles
+from contents.models import Comic, Novel
+from reviews.models import Review, RatingSummary
+
+MODELS = {"comic": Comic, "novel": Novel}
+
+
+def _init_worker():
+    # Dengan start method "spawn" worker harus setup Django sendiri
+    import django
+
+    django.setup()
+
+
+def recompute_chunk(kind, start, end):
+    """
+    Hitung ulang average_rating, review_count, histogram dan popularity untuk judul
+    dengan id di [start, end). Review dibaca dengan satu aggregate (GROUP BY judul, rating).
+    Return (jumlah judul, jumlah judul yang berubah).
+    """
+    model = MODELS[kind]
+    target_field = f"{kind}_id"
+
+    try:
+        stats = defaultdict(lambda: {"count": 0, "total": Decimal(0), "histogram": [0] * RatingSummary.BUCKETS})
+        rows = (
+            Review.objects.filter(**{f"{target_field}__gte": start, f"{target_field}__lt": end})
+            .order_by()
+            .values_list(target_field, "rating")
+            .annotate(n=Count("pk"))
+        )
+        for target_id, rating, n in rows:
+            entry = stats[target_id]
+            entry["count"] += n
+            entry["total"] += rating * n
+            entry["histogram"][RatingSummary.bucket_for(rating)] += n
+
+        with transaction.atomic():
+            targets = list(model.objects.filter(pk__gte=start, pk__lt=end).only("pk", "average_rating"))
+            summaries = {
+                getattr(summary, target_field): summary
+                for summary in RatingSummary.objects.filter(
+                    **{f"{target_field}__gte": start, f"{target_field}__lt": end}
+                )
+            }
+
+            changed_targets, changed_summaries, new_summaries = [], [], []
+            for target in targets:
+                entry = stats.get(target.pk)
+                count = entry["count"] if entry else 0
+                histogram = entry["histogram"] if entry else [0] * RatingSummary.BUCKETS
+                average = round(entry["total"] / count, 1) if entry else Decimal("0.0")
+                popularity = RatingSummary.popularity_for(average, count)
+
+                if target.average_rating != average:
+                    target.average_rating = average
+                    changed_targets.append(target)
+
+                summary = summaries.get(target.pk)
+                if summary is None:
+                    if count:
+                        new_summaries.append(RatingSummary(
+                            **{target_field: target.pk},
+                            review_count=count, histogram=histogram, popularity=popularity,
+                        ))
+                elif (summary.review_count, list(summary.histogram), summary.popularity) != (count, histogram, popularity):
+                    summary.review_count = count
+                    summary.histogram = histogram
+                    summary.popularity = popularity
+                    changed_summaries.append(summary)
+
+            model.objects.bulk_update(changed_targets, ["average_rating"], batch_size=1000)
+            RatingSummary.objects.bulk_update(
+                changed_summaries, ["review_count", "histogram", "popularity"], batch_size=1000
+            )
+            RatingSummary.objects.bulk_create(new_summaries, batch_size=1000)
+
+            changed = {t.pk for t in changed_targets} | {
+                getattr(s, target_field) for s in changed_summaries + new_summaries
+            }
+            # bulk_update/bulk_create tidak mengirim signal
+            invalidate_titles(kind, changed)
+        return len(targets), len(changed)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Recompute average rating, review count and popularity for every comic/novel"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=["comic", "novel", "all"], default="all")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Title ids per chunk")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: CPU count, 1 on SQLite); 1 runs every chunk in this process",
+        )
+
+    def handle(self, *args, **options):
+        kinds = list(MODELS) if options["kind"] == "all" else [options["kind"]]
+        chunk_size = options["chunk_size"]
+        workers = options["workers"]
+        if workers is None:
+            # SQLite hanya mengizinkan satu writer, worker paralel akan saling menunggu lock
+            workers = 1 if connection.vendor == "sqlite" else os.cpu_count() or 1
+
+        chunks = []
+        for kind in kinds:
+            bounds = MODELS[kind].objects.aggregate(low=Min("pk"), high=Max("pk"))
+            if bounds["low"] is None:
+                continue
+            for start in range(bounds["low"], bounds["high"] + 1, chunk_size):
+                chunks.append((kind, start, start + chunk_size))
+
+        titles = changed = 0
+        start_time = time.perf_counter()
+        if workers <= 1:
+            for chunk in chunks:
+                done, updated = recompute_chunk(*chunk)
+                titles += done
+                changed += updated
+        else:
+            # Koneksi parent tidak boleh diwariskan ke worker hasil fork
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = [pool.submit(recompute_chunk, *chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    done, updated = future.result()
+                    titles += done
+                    changed += updated
+        elapsed = time.perf_counter() - start_time
+
+        self.stdout.write(self.style.SUCCESS(
+            f"titles={titles} updated={changed} chunks={len(chunks)} workers={workers} "
+            f"elapsed={elapsed:.3f}s rows/sec={titles / elapsed if elapsed else 0:.0f}"
+        ))
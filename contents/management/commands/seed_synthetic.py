@@ -0,0 +1,358 @@
+import itertools
+import random
+import time
+from array import array
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from contents.cache import catalog_tag, response_cache
+from contents.models import Comic, Genre, Novel
+from interactions.models import Favorite, Like
+from library.models import UserLibrary
+from member.models import Profile, User
+from reviews import search
+from reviews.models import Review
+
+GENRES = [
+    "Action", "Adventure", "Comedy", "Drama", "Fantasy", "Romance", "Slice of Life",
+    "Mystery", "Horror", "Sci-Fi", "Isekai", "Martial Arts", "Sports", "Historical",
+    "Psychological", "Supernatural", "School", "Thriller", "Mecha", "Music",
+]
+TITLE_WORDS = [
+    "Crimson", "Silent", "Eternal", "Broken", "Hidden", "Last", "Iron", "Golden", "Shadow",
+    "Frozen", "Wandering", "Celestial", "Blade", "Moon", "Kingdom", "Dragon", "Garden",
+    "Academy", "Empire", "Tower", "Heart", "Storm", "Flower", "Star", "Knight", "Witch",
+    "Sword", "Dream", "Ocean", "Flame", "Soul", "Throne", "Spring", "Winter", "Road",
+]
+NAME_PARTS = ["ka", "ri", "to", "mi", "na", "sa", "yu", "ko", "ta", "ha", "ji", "ro", "ne", "shi", "mo"]
+REVIEW_WORDS = [
+    "story", "art", "characters", "plot", "pacing", "ending", "great", "slow", "amazing",
+    "boring", "beautiful", "twist", "arc", "protagonist", "villain", "romance", "action",
+    "world", "building", "emotional", "funny", "dark", "chapter", "volume", "translation",
+    "recommend", "favorite", "masterpiece", "overrated", "underrated", "fights", "drawing",
+    "style", "development", "cliffhanger", "hiatus", "worth", "reading", "again", "love",
+    "sequel", "adaptation", "anime", "side", "cast", "healing", "revenge", "tournament",
+    "magic", "system", "dungeon", "guild", "tragic", "wholesome", "dialogue", "panels",
+    "coloring", "backstory", "flashback", "rival", "mentor", "sacrifice", "betrayal",
+    "redemption", "comedic", "timing", "soundtrack", "finale", "prologue", "bittersweet",
+]
+# Urutan REVIEW_WORDS = urutan frekuensi (Zipf), kata terakhir paling jarang
+LIBRARY_STATUSES = ["plan_to_read", "reading", "completed", "on_hold", "dropped"]
+LIBRARY_STATUS_WEIGHTS = [25, 35, 25, 5, 10]
+# Rating cenderung tinggi (seperti rating user sungguhan)
+RATINGS = [Decimal(n) for n in range(1, 11)]
+RATING_WEIGHTS = [1, 1, 2, 3, 5, 8, 14, 20, 15, 8]
+
+
+class _Zipf:
+    """Sampler rank 0..n-1 dengan P(rank k) ~ 1 / (k + 1) ** s"""
+
+    def __init__(self, n, s, rng):
+        self.population = range(n)
+        self.cum_weights = list(itertools.accumulate(1 / (k ** s) for k in range(1, n + 1)))
+        self.rng = rng
+
+    def sample(self, k):
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+
+def _batches(total, size):
+    for start in range(0, total, size):
+        yield min(size, total - start)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic dataset (titles, users, library, reviews, likes, favorites) "
+        "with Zipf-distributed popularity, using bulk inserts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--titles", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--library", type=int, default=10_000_000, help="Library rows")
+        parser.add_argument("--reviews", type=int, default=1_000_000)
+        parser.add_argument("--likes", type=int, default=5_000_000)
+        parser.add_argument("--favorites", type=int, default=500_000)
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiply every row count")
+        parser.add_argument("--novel-ratio", type=float, default=0.3, help="Share of titles that are novels")
+        parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for title/review popularity")
+        parser.add_argument("--user-zipf", type=float, default=0.8, help="Zipf exponent for user activity")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="synthetic", help="Username prefix (must be unused)")
+        parser.add_argument("--password", default="synthetic-pass", help="Password for every generated user")
+
+    def handle(self, *args, **options):
+        counts = {
+            name: max(int(options[name] * options["scale"]), 1)
+            for name in ("titles", "users", "library", "reviews", "likes", "favorites")
+        }
+        self.prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{self.prefix}_").exists():
+            raise CommandError(f"Users with prefix '{self.prefix}_' already exist; use another --prefix")
+
+        self.rng = random.Random(options["seed"])
+        self.word_zipf = _Zipf(len(REVIEW_WORDS), 1.2, self.rng)
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        # Diambil sekali: connection.ops per row terlalu mahal untuk jutaan row
+        self._adapt_datetime = connection.ops.adapt_datetimefield_value
+        total_start = time.perf_counter()
+
+        genre_ids = self._phase("genres", self._genres)
+        self._phase("titles", lambda: self._titles(counts["titles"], options["novel_ratio"], genre_ids))
+        self._phase("users", lambda: self._users(counts["users"], options["password"]))
+
+        self.title_zipf = _Zipf(len(self.titles), options["zipf"], self.rng)
+        self.user_zipf = _Zipf(len(self.user_ids), options["user_zipf"], self.rng)
+        self._phase("library", lambda: self._library(counts["library"]))
+        self._phase("reviews", lambda: self._reviews(counts["reviews"]))
+        self._phase("likes", lambda: self._likes(counts["likes"], options["zipf"]))
+        self._phase("favorites", lambda: self._favorites(counts["favorites"]))
+
+        # Data turunan yang biasanya dijaga signal/model method
+        self._phase("search_index", search.rebuild_index)
+        self._phase("like_counts", lambda: call_command("reconcile_like_counts", stdout=self.stdout))
+        self._phase("ratings", lambda: call_command("recompute_ratings", stdout=self.stdout))
+        self._phase("trending", lambda: call_command("update_trending", stdout=self.stdout))
+        response_cache.invalidate(catalog_tag("comic"), catalog_tag("novel"), "genres")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded prefix={self.prefix} elapsed={time.perf_counter() - total_start:.1f}s"
+        ))
+
+    # HELPERS
+    def _phase(self, name, run):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        if isinstance(result, int):
+            self.stdout.write(
+                f"phase={name} rows={result} elapsed={elapsed:.1f}s "
+                f"rows/sec={result / elapsed if elapsed else 0:.0f}"
+            )
+        else:
+            self.stdout.write(f"phase={name} elapsed={elapsed:.1f}s")
+        return result
+
+    def _ago(self, mean_days, max_days=3 * 365):
+        """Waktu di masa lalu, lebih banyak yang baru (eksponensial)"""
+        days = min(self.rng.expovariate(1 / mean_days), max_days)
+        return self.now - timedelta(days=days)
+
+    def _words(self, vocabulary, low, high):
+        return " ".join(self.rng.choices(vocabulary, k=self.rng.randint(low, high)))
+
+    def _text(self, low, high):
+        return " ".join(REVIEW_WORDS[i] for i in self.word_zipf.sample(self.rng.randint(low, high)))
+
+    def _name(self):
+        parts = self.rng.randint(2, 4)
+        return "".join(self.rng.choices(NAME_PARTS, k=parts)).capitalize()
+
+    # PHASES
+    def _genres(self):
+        Genre.objects.bulk_create([Genre(name=name) for name in GENRES], ignore_conflicts=True)
+        return list(Genre.objects.values_list("pk", flat=True))
+
+    def _titles(self, total, novel_ratio, genre_ids):
+        novels = int(total * novel_ratio)
+        # Rank popularitas -> id judul (positif = comic, negatif = novel) dan total chapter
+        titles, chapters = array("q"), array("l")
+        genre_zipf = _Zipf(len(genre_ids), 1.0, self.rng)
+        rows = 0
+        for model, count, kind_field, types in (
+            (Comic, total - novels, "comic_type", [c for c, _ in Comic.TYPE_CHOICES]),
+            (Novel, novels, "novel_type", [c for c, _ in Novel.TYPE_CHOICES]),
+        ):
+            through = model.genres.through
+            sign = 1 if model is Comic else -1
+            owner_field = f"{model._meta.model_name}_id"
+            for size in _batches(count, self.batch_size):
+                objs = []
+                for _ in range(size):
+                    status = self.rng.choices(["ongoing", "completed", "hiatus"], [50, 40, 10])[0]
+                    total_chapters = max(int(self.rng.lognormvariate(4, 1)), 1)
+                    objs.append(model(
+                        title=self._words(TITLE_WORDS, 2, 4),
+                        author=f"{self._name()} {self._name()}",
+                        release_year=self.rng.randint(1980, self.now.year),
+                        status=status,
+                        description=self._text(10, 40),
+                        total_chapters=total_chapters,
+                        total_volumes=total_chapters // 10,
+                        **{kind_field: self.rng.choice(types)},
+                    ))
+                objs = model.objects.bulk_create(objs)
+                links = []
+                for obj in objs:
+                    titles.append(sign * obj.pk)
+                    chapters.append(obj.total_chapters)
+                    picked = {genre_ids[i] for i in genre_zipf.sample(self.rng.randint(1, 3))}
+                    links.extend(through(**{owner_field: obj.pk, "genre_id": genre_id}) for genre_id in picked)
+                through.objects.bulk_create(links)
+                rows += len(objs)
+        ranks = list(range(len(titles)))
+        self.rng.shuffle(ranks)
+        self.titles = array("q", (titles[i] for i in ranks))
+        self.chapters = array("l", (chapters[i] for i in ranks))
+        return rows
+
+    def _users(self, total, password):
+        # Hash sekali untuk semua user (hashing per user terlalu lambat)
+        password = make_password(password)
+        self.user_ids = array("q")
+        for start in range(0, total, self.batch_size):
+            users = User.objects.bulk_create([
+                User(
+                    username=f"{self.prefix}_{i}",
+                    email=f"{self.prefix}_{i}@example.com",
+                    password=password,
+                    first_name=self._name(),
+                    date_joined=self._ago(365),
+                )
+                for i in range(start, min(start + self.batch_size, total))
+            ])
+            # User.save yang biasanya membuat profile tidak dipanggil oleh bulk_create
+            Profile.objects.bulk_create([
+                Profile(user_id=user.pk, bio=self._text(0, 20)) for user in users
+            ])
+            self.user_ids.extend(user.pk for user in users)
+        # User dengan index kecil = paling aktif (rank Zipf mengikuti urutan id)
+        return len(self.user_ids)
+
+    def _sample_pairs(self, size):
+        """Pasangan (user_id, rank judul) unik dalam satu batch"""
+        users = self.user_zipf.sample(size)
+        titles = self.title_zipf.sample(size)
+        return {(self.user_ids[u], t) for u, t in zip(users, titles)}
+
+    def _insert(self, model, fields, rows, unique, condition=None):
+        """
+        INSERT multi-row yang melewati konflik pada unique constraint `unique` (kolom,
+        plus kolom not-null untuk partial index), tanpa membuat instance model
+        (bulk_create terlalu lambat untuk jutaan row). Nilai harus sudah siap DB.
+        Konflik di constraint lain tetap error.
+        """
+        ops = connection.ops
+        opts = model._meta
+        fields = [opts.get_field(name) for name in fields]
+        columns = ", ".join(ops.quote_name(field.column) for field in fields)
+        target = ", ".join(ops.quote_name(opts.get_field(name).column) for name in unique)
+        # Partial index hanya cocok sebagai target jika predikatnya ikut disebut
+        where = f" WHERE {ops.quote_name(opts.get_field(condition).column)} IS NOT NULL" if condition else ""
+        prefix = f"INSERT INTO {ops.quote_name(opts.db_table)} ({columns}) VALUES "
+        suffix = f"ON CONFLICT ({target}){where} DO NOTHING"
+        placeholder = f"({', '.join(['%s'] * len(fields))})"
+        rows = list(rows)
+        batch = ops.bulk_batch_size(fields, rows)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(rows), batch):
+                chunk = rows[start:start + batch]
+                cursor.execute(
+                    f"{prefix}{', '.join([placeholder] * len(chunk))} {suffix}",
+                    [value for row in chunk for value in row],
+                )
+
+    def _insert_per_title(self, model, fields, rows):
+        """
+        _insert untuk row (user, comic, novel, ...): comic dan novel punya partial
+        unique index sendiri, dan ON CONFLICT hanya bisa menunjuk satu index
+        """
+        comics = [row for row in rows if row[1] is not None]
+        novels = [row for row in rows if row[1] is None]
+        self._insert(model, fields, comics, ["user", "comic"], condition="comic")
+        self._insert(model, fields, novels, ["user", "novel"], condition="novel")
+
+    def _timestamp(self, mean_days):
+        return self._adapt_datetime(self._ago(mean_days))
+
+    def _title_columns(self, rank):
+        title_id = self.titles[rank]
+        return (title_id, None) if title_id > 0 else (None, -title_id)
+
+    def _library(self, total):
+        before = UserLibrary.objects.count()
+        fields = [
+            "user", "comic", "novel", "status", "progress", "new_chapters",
+            "started_at", "completed_at", "created_at", "updated_at",
+        ]
+        for size in _batches(total, self.batch_size):
+            rows = []
+            for user_id, rank in self._sample_pairs(size):
+                status = self.rng.choices(LIBRARY_STATUSES, LIBRARY_STATUS_WEIGHTS)[0]
+                chapters = self.chapters[rank]
+                created_at = self._timestamp(180)
+                rows.append((
+                    user_id,
+                    *self._title_columns(rank),
+                    status,
+                    chapters if status == "completed" else self.rng.randint(0, chapters),
+                    0,
+                    created_at if status != "plan_to_read" else None,
+                    self._timestamp(30) if status == "completed" else None,
+                    created_at,
+                    self._timestamp(30),
+                ))
+            self._insert_per_title(UserLibrary, fields, rows)
+        return UserLibrary.objects.count() - before
+
+    def _reviews(self, total):
+        before = Review.objects.count()
+        rating_field = Review._meta.get_field("rating")
+        ratings = [rating_field.get_db_prep_save(rating, connection) for rating in RATINGS]
+        fields = ["user", "comic", "novel", "content", "rating", "likes_count", "created_at"]
+        for size in _batches(total, self.batch_size):
+            rows = [
+                (
+                    user_id,
+                    *self._title_columns(rank),
+                    self._text(8, 60),
+                    self.rng.choices(ratings, RATING_WEIGHTS)[0],
+                    0,
+                    self._timestamp(120),
+                )
+                for user_id, rank in self._sample_pairs(size)
+            ]
+            self._insert_per_title(Review, fields, rows)
+        return Review.objects.count() - before
+
+    def _likes(self, total, zipf):
+        review_ids = array("q", Review.objects.filter(
+            user_id__gte=self.user_ids[0], user_id__lte=self.user_ids[-1]
+        ).values_list("pk", flat=True))
+        self.rng.shuffle(review_ids)
+        review_zipf = _Zipf(len(review_ids), zipf, self.rng)
+        before = Like.objects.count()
+        for size in _batches(total, self.batch_size):
+            users = self.user_zipf.sample(size)
+            reviews = review_zipf.sample(size)
+            pairs = {(self.user_ids[u], review_ids[r]) for u, r in zip(users, reviews)}
+            self._insert(
+                Like,
+                ["user", "review", "created_at"],
+                [(user_id, review_id, self._timestamp(30)) for user_id, review_id in pairs],
+                ["user", "review"],
+            )
+        return Like.objects.count() - before
+
+    def _favorites(self, total):
+        # Position per (user, tipe) naik terus dengan jarak RANK_GAP, jadi tidak pernah
+        # bentrok; yang bisa bentrok hanya (user, judul)
+        positions = {}
+        before = Favorite.objects.count()
+        for size in _batches(total, self.batch_size):
+            rows = []
+            for user_id, rank in self._sample_pairs(size):
+                key = (user_id, self.titles[rank] > 0)
+                positions[key] = positions.get(key, 0) + Favorite.RANK_GAP
+                rows.append((user_id, *self._title_columns(rank), positions[key], self._timestamp(90)))
+            self._insert_per_title(Favorite, ["user", "comic", "novel", "position", "created_at"], rows)
+        return Favorite.objects.count() - before
@@ -1,3 +1,193 @@
-from django.test import TestCase
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from contents.cache import response_cache
+from contents.models import Comic, Genre, Novel
+from member.models import User
+from reviews.models import RatingSummary, Review
+
+
+class RecomputeRatingsTests(TestCase):
+    def setUp(self):
+        self.comics = [
+            Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga") for i in range(3)
+        ]
+        self.novel = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        self.users = [User.objects.create(username=f"reviewer{i}") for i in range(3)]
+
+    def _recompute(self, *args):
+        out = StringIO()
+        call_command("recompute_ratings", "--chunk-size", "2", "--workers", "1", *args, stdout=out)
+        return dict(pair.split("=") for pair in out.getvalue().split())
+
+    def test_rebuilds_averages_and_summaries(self):
+        # bulk_create melewati serializer, jadi average dan RatingSummary belum terisi
+        Review.objects.bulk_create([
+            Review(user=self.users[0], comic=self.comics[0], content="A", rating=Decimal("8.0")),
+            Review(user=self.users[1], comic=self.comics[0], content="B", rating=Decimal("5.5")),
+            Review(user=self.users[2], comic=self.comics[2], content="C", rating=Decimal("10.0")),
+            Review(user=self.users[0], novel=self.novel, content="D", rating=Decimal("3.0")),
+        ])
+
+        result = self._recompute()
+        self.assertEqual(result["titles"], "4")
+        self.assertEqual(result["updated"], "3")
+        self.assertEqual(result["chunks"], "3")
+
+        self.comics[0].refresh_from_db()
+        self.assertEqual(self.comics[0].average_rating, Decimal("6.8"))
+        summary = RatingSummary.objects.get(comic=self.comics[0])
+        self.assertEqual(summary.review_count, 2)
+        self.assertEqual({i: n for i, n in enumerate(summary.histogram) if n}, {8: 1, 5: 1})
+        self.assertAlmostEqual(summary.popularity, RatingSummary.popularity_for(Decimal("6.8"), 2))
+        self.assertFalse(RatingSummary.objects.filter(comic=self.comics[1]).exists())
+        self.assertEqual(RatingSummary.objects.get(novel=self.novel).review_count, 1)
+
+        # Run kedua tidak mengubah apa pun
+        self.assertEqual(self._recompute()["updated"], "0")
+
+    def test_resets_stale_summary(self):
+        comic = self.comics[1]
+        comic.average_rating = Decimal("9.0")
+        comic.save(update_fields=["average_rating"])
+        RatingSummary.record(comic, added=Decimal("9.0"))
+
+        self.assertEqual(self._recompute("--kind", "comic")["updated"], "1")
+        comic.refresh_from_db()
+        self.assertEqual(comic.average_rating, Decimal("0.0"))
+        summary = RatingSummary.objects.get(comic=comic)
+        self.assertEqual((summary.review_count, summary.popularity), (0, 0))
+        self.assertFalse(any(summary.histogram))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class CatalogListTests(TestCase):
+    def setUp(self):
+        users = [User.objects.create(username=f"reviewer{i}") for i in range(4)]
+        for i in range(5):
+            comic = Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga")
+            for user in users[:i]:
+                Review.objects.create(user=user, comic=comic, content="Review", rating="7.0")
+
+    def test_reviews_count_is_annotated(self):
+        # count + halaman + prefetch genres, berapa pun ukuran halamannya
+        for page_size in (1, 10):
+            with self.subTest(page_size=page_size), \
+                    mock.patch.object(PageNumberPagination, "page_size", page_size), \
+                    self.assertNumQueries(3):
+                response = self.client.get("/api/comics/", {"ordering": "title"})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["reviews_count"] for c in response.json()["results"]], [0, 1, 2, 3, 4])
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.reset_metrics()
+        self.genre = Genre.objects.create(name="Action")
+        self.comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.comic.genres.add(self.genre)
+
+    def _get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response["X-Cache"], response.json()
+
+    def _commit(self):
+        # Versi tag diganti di on_commit
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def test_anonymous_reads_hit_and_users_bypass(self):
+        self.assertEqual(self._get("/api/comics/")[0], "MISS")
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get("/api/comics/")[0], "HIT")
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="reader"))
+        self.assertEqual(client.get("/api/comics/")["X-Cache"], "BYPASS")
+        self.assertEqual(response_cache.metrics()["hits"], 1)
+
+    def test_query_params_are_normalized(self):
+        self.assertEqual(self._get("/api/comics/", ordering="title", page=1)[0], "MISS")
+        self.assertEqual(self.client.get("/api/comics/?page=1&search=&ordering=title")["X-Cache"], "HIT")
+        self.assertEqual(self._get("/api/comics/", ordering="-title")[0], "MISS")
+
+    def test_title_save_invalidates_list_and_detail(self):
+        detail = f"/api/comics/{self.comic.pk}/"
+        self._get("/api/comics/")
+        self._get(detail)
+        other = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        self._get(f"/api/novels/{other.pk}/")
+
+        with self._commit():
+            self.comic.title = "Renamed"
+            self.comic.save()
+        status, data = self._get(detail)
+        self.assertEqual((status, data["title"]), ("MISS", "Renamed"))
+        self.assertEqual(self._get("/api/comics/")[0], "MISS")
+        # Judul lain tidak ikut di-invalidate
+        self.assertEqual(self._get(f"/api/novels/{other.pk}/")[0], "HIT")
+
+    def test_genre_change_invalidates_titles(self):
+        self._get(f"/api/comics/{self.comic.pk}/")
+        with self._commit():
+            self.genre.name = "Adventure"
+            self.genre.save()
+        status, data = self._get(f"/api/comics/{self.comic.pk}/")
+        self.assertEqual(status, "MISS")
+        self.assertIn("Adventure", str(data))
+
+    def test_review_invalidates_rating_summary(self):
+        url = f"/api/comics/{self.comic.pk}/rating-summary/"
+        self.assertEqual(self._get(url)[1]["review_count"], 0)
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="reader"))
+        with self._commit():
+            response = client.post(
+                "/api/reviews/", {"comic": self.comic.pk, "content": "Review", "rating": "8.0"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        status, data = self._get(url)
+        self.assertEqual((status, data["review_count"]), ("MISS", 1))
+
+    def test_invalidation_waits_for_commit(self):
+        self._get("/api/comics/")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.comic.title = "Renamed"
+            self.comic.save()
+        self.assertEqual(self._get("/api/comics/")[0], "HIT")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._get("/api/comics/")[0], "MISS")
+
+
+class SyntheticBenchmarkSmokeTests(TransactionTestCase):
+    # Section /page/ dibaca di thread executor dengan koneksi sendiri, jadi data harus commit
+
+    def test_seed_then_benchmark_every_scenario(self):
+        call_command("seed_synthetic", "--scale", "0.0001", stdout=StringIO())
+        User.objects.create_user(username="admin", password="secret-pass-123", is_staff=True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "api.json"
+            call_command(
+                "benchmark_api", "--requests", "1", "--warmup", "0", "--query-samples", "1",
+                "--output", str(output), stdout=StringIO(),
+            )
+            results = json.loads(output.read_text())
+
+        self.assertGreater(results["dataset"]["reviews"], 0)
+        failed = {name: r["status"] for name, r in results["scenarios"].items() if not r["ok"]}
+        self.assertEqual(failed, {})
+        self.assertIn("genre-create", results["scenarios"])
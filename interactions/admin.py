@@ -4,10 +4,10 @@ from .models import Favorite, Like
 
 @admin.register(Favorite)
 class FavoriteAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "get_target", "rank", "created_at")
+    list_display = ("id", "user", "get_target", "position", "created_at")
     list_filter = ("created_at",)
     search_fields = ("user__username", "comic__title", "novel__title")
-    ordering = ("user", "rank")
+    ordering = ("user", "position")
     readonly_fields = ("created_at",)
     
     raw_id_fields = ("user", "comic", "novel")
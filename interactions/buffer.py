@@ -0,0 +1,222 @@
+"""
+Write-behind buffer untuk Like (opsional, aktif lewat settings.LIKE_WRITE_BEHIND).
+
+Toggle hanya dicatat di memori proses; flusher berkala menulis semuanya sekaligus
+dengan INSERT/DELETE multi-row dan satu UPDATE counter. Pembacaan (likes_count,
+is_liked) menggabungkan toggle yang belum di-flush supaya tetap konsisten.
+
+Buffer ini milik satu proses: worker lain baru melihat toggle (is_liked dan
+likes_count) setelah flush, paling lama LIKE_FLUSH_INTERVAL. Counter di DB tetap
+tepat karena flush hanya menambah/mengurangi likes_count sesuai row Like yang
+benar-benar ter-insert/terhapus (RETURNING), walaupun dua worker mem-buffer toggle
+yang bertentangan untuk like yang sama.
+"""
+import atexit
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Case, Exists, F, OuterRef, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from interactions.models import Like
+from member.stats import invalidate_review_owners
+from reviews.models import Review
+
+
+class LikeBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (user_id, review_id) -> (state di DB, state yang diinginkan); hanya berisi
+        # like yang state-nya berbeda dengan DB
+        self._pending = {}
+        # review_id -> delta likes_count yang belum ada di DB
+        self._deltas = defaultdict(int)
+        self._flushing = False
+
+    def state(self, user_id, review_id):
+        """State like yang sudah di-buffer, atau None jika harus dibaca dari DB"""
+        with self._lock:
+            pending = self._pending.get((user_id, review_id))
+        return None if pending is None else pending[1]
+
+    def delta(self, review_id):
+        with self._lock:
+            return self._deltas.get(review_id, 0)
+
+    def _add_delta(self, review_id, delta):
+        self._deltas[review_id] += delta
+        if not self._deltas[review_id]:
+            del self._deltas[review_id]
+
+    def toggle(self, user_id, review_id, liked_in_db):
+        """Balik state like dan catat delta counter; return state baru"""
+        key = (user_id, review_id)
+        with self._lock:
+            original, current = self._pending.get(key, (liked_in_db, liked_in_db))
+            desired = not current
+            self._add_delta(review_id, 1 if desired else -1)
+            if desired == original:
+                self._pending.pop(key, None)
+            else:
+                self._pending[key] = (original, desired)
+            return desired
+
+    def flush(self):
+        """Tulis semua toggle yang di-buffer ke DB; return jumlah toggle yang ditulis"""
+        with self._lock:
+            if self._flushing or not self._pending:
+                return 0
+            self._flushing = True
+            # Snapshot; buffer tetap berisi batch ini sampai DB commit, jadi pembacaan
+            # selama flush tetap melihatnya
+            batch = dict(self._pending)
+            deltas = {}
+            for (_, review_id), (_, desired) in batch.items():
+                deltas[review_id] = deltas.get(review_id, 0) + (1 if desired else -1)
+
+        try:
+            with transaction.atomic():
+                applied = self._write(batch)
+        except Exception:
+            # Batch tidak dihapus dari buffer, flush berikutnya mencoba lagi
+            with self._lock:
+                self._flushing = False
+            raise
+
+        with self._lock:
+            for key, (original, flushed) in batch.items():
+                # Toggle selama flush: state yang diinginkan sekarang, dibanding DB baru
+                desired = self._pending[key][1] if key in self._pending else original
+                if desired == flushed:
+                    self._pending.pop(key, None)
+                else:
+                    self._pending[key] = (flushed, desired)
+            for review_id, delta in deltas.items():
+                self._add_delta(review_id, -delta)
+            self._flushing = False
+
+        if applied:
+            invalidate_review_owners(applied)
+        return len(batch)
+
+    def _write(self, batch):
+        """INSERT/DELETE like dan update counter sesuai row yang benar-benar berubah"""
+        like_table = connection.ops.quote_name(Like._meta.db_table)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        to_like = [key for key, (_, desired) in batch.items() if desired]
+        to_unlike = [key for key, (_, desired) in batch.items() if not desired]
+        # Satu batch maksimal 300 like (3 parameter per row) supaya aman untuk limit SQLite
+        size = 300
+        applied = defaultdict(int)
+        with connection.cursor() as cursor:
+            for start in range(0, len(to_like), size):
+                chunk = to_like[start:start + size]
+                cursor.execute(
+                    f"INSERT INTO {like_table} (user_id, review_id, created_at) VALUES "
+                    f"{', '.join(['(%s, %s, %s)'] * len(chunk))} "
+                    f"ON CONFLICT (user_id, review_id) DO NOTHING RETURNING review_id",
+                    [value for user_id, review_id in chunk for value in (user_id, review_id, now)],
+                )
+                for (review_id,) in cursor.fetchall():
+                    applied[review_id] += 1
+            for start in range(0, len(to_unlike), size):
+                chunk = to_unlike[start:start + size]
+                cursor.execute(
+                    f"DELETE FROM {like_table} WHERE "
+                    f"{' OR '.join(['(user_id = %s AND review_id = %s)'] * len(chunk))} RETURNING review_id",
+                    [value for key in chunk for value in key],
+                )
+                for (review_id,) in cursor.fetchall():
+                    applied[review_id] -= 1
+
+        applied = {review_id: delta for review_id, delta in applied.items() if delta}
+        if applied:
+            Review.objects.filter(pk__in=list(applied)).update(
+                likes_count=Greatest(
+                    F("likes_count") + Case(
+                        *[When(pk=review_id, then=Value(delta)) for review_id, delta in applied.items()],
+                        default=Value(0),
+                    ),
+                    Value(0),
+                )
+            )
+        return applied
+
+
+class LikeFlusher(threading.Thread):
+    """Thread daemon yang mem-flush buffer setiap `interval` detik"""
+
+    def __init__(self, buffer, interval):
+        super().__init__(name="like-flusher", daemon=True)
+        self.buffer = buffer
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.buffer.flush()
+            except Exception:
+                # Batch sudah dikembalikan ke buffer, coba lagi di interval berikutnya
+                pass
+            finally:
+                connections.close_all()
+
+    def stop(self):
+        self._stopped.set()
+
+
+like_buffer = LikeBuffer()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def _ensure_flusher():
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = LikeFlusher(like_buffer, settings.LIKE_FLUSH_INTERVAL)
+            _flusher.start()
+            atexit.register(like_buffer.flush)
+
+
+def write_behind_enabled():
+    return settings.LIKE_WRITE_BEHIND
+
+
+def toggle_like(user, review_id):
+    """
+    Toggle like lewat buffer: satu SELECT (review + like milik user), tanpa write.
+    Return (liked, likes_count); raise Review.DoesNotExist jika review tidak ada.
+    """
+    _ensure_flusher()
+    row = (
+        Review.objects.filter(pk=review_id)
+        .annotate(liked=Exists(Like.objects.filter(user=user, review=OuterRef("pk"))))
+        .values_list("likes_count", "liked")
+        .first()
+    )
+    if row is None:
+        raise Review.DoesNotExist("Review not found.")
+
+    likes_count, liked_in_db = row
+    liked = like_buffer.toggle(user.pk, review_id, liked_in_db)
+    return liked, max(likes_count + like_buffer.delta(review_id), 0)
+
+
+def buffered_likes_count(review):
+    """likes_count review ditambah delta yang belum di-flush"""
+    if not write_behind_enabled():
+        return review.likes_count
+    return max(review.likes_count + like_buffer.delta(review.pk), 0)
+
+
+def buffered_is_liked(user, review, liked_in_db):
+    """Prioritaskan state like di buffer di atas state DB"""
+    if not write_behind_enabled():
+        return liked_in_db()
+    state = like_buffer.state(user.pk, review.pk)
+    return liked_in_db() if state is None else state
@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from contents.models import Comic
+from interactions.models import Favorite
+from member.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark reordering a favorites list (data is rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        repeat = options["repeat"]
+
+        try:
+            with transaction.atomic():
+                user = User.objects.create(username="reorder_bench", password="!")
+                comics = Comic.objects.bulk_create(
+                    [Comic(title=f"Reorder {i}", author="bench", comic_type="manga") for i in range(items)]
+                )
+                favorites = Favorite.objects.bulk_create(
+                    [
+                        Favorite(user=user, comic=comic, position=(i + 1) * Favorite.RANK_GAP)
+                        for i, comic in enumerate(comics)
+                    ]
+                )
+                ids = [favorite.pk for favorite in favorites]
+
+                def per_row(ranks):
+                    # Cara lama: satu UPDATE per item (posisi dibuat negatif dulu agar tidak bentrok)
+                    with transaction.atomic():
+                        Favorite.objects.filter(user=user).update(position=-F("pk"))
+                        for pk, rank in ranks.items():
+                            Favorite.objects.filter(pk=pk, user=user).update(position=rank * Favorite.RANK_GAP)
+
+                def set_based(ranks):
+                    Favorite.reorder(user, ranks)
+
+                for name, reorder in (("per-row loop", per_row), ("set-based", set_based)):
+                    timings = []
+                    for _ in range(repeat):
+                        random.shuffle(ids)
+                        ranks = {pk: rank for rank, pk in enumerate(ids, start=1)}
+                        with CaptureQueriesContext(connection) as ctx:
+                            start = time.perf_counter()
+                            reorder(ranks)
+                            timings.append(time.perf_counter() - start)
+                    self.stdout.write(
+                        f"{name}: items={items} best={min(timings) * 1000:.1f}ms "
+                        f"avg={sum(timings) / len(timings) * 1000:.1f}ms queries={len(ctx.captured_queries)}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from interactions.models import Favorite
+
+
+class Command(BaseCommand):
+    help = "Renumber favorite positions for lists whose gaps are nearly exhausted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-gap",
+            type=int,
+            default=8,
+            help="Rebalance a list when two neighbouring positions are closer than this",
+        )
+
+    def handle(self, *args, **options):
+        min_gap = options["min_gap"]
+        total = 0
+
+        for kind in ("comic", "novel"):
+            rows = (
+                Favorite.objects.filter(**{f"{kind}__isnull": False})
+                .order_by("user_id", "position")
+                .values_list("user_id", "position")
+            )
+            crowded = set()
+            previous_user, previous_position = None, None
+            for user_id, position in rows.iterator(chunk_size=5000):
+                if user_id == previous_user and position - previous_position < min_gap:
+                    crowded.add(user_id)
+                previous_user, previous_position = user_id, position
+
+            for user_id in crowded:
+                Favorite.rebalance(user_id, kind)
+            total += len(crowded)
+            self.stdout.write(f"{kind}: rebalanced {len(crowded)} list(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {total} favorite list(s)"))
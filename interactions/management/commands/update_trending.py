@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interactions import trending
+
+
+class Command(BaseCommand):
+    help = "Refresh hourly trending buckets and rebuild the trending rankings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and refresh every N seconds (0 = run once)",
+        )
+        parser.add_argument("--top", type=int, default=trending.TOP_N)
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            buckets = trending.refresh_buckets()
+            entries = trending.rebuild_scores(top_n=options["top"])
+            self.stdout.write(
+                f"buckets={buckets} ranked={entries} elapsed={time.perf_counter() - start:.2f}s"
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,86 @@
+from django.db import migrations, models
+
+RANK_GAP = 1024
+
+
+def ranks_to_positions(apps, schema_editor):
+    Favorite = apps.get_model("interactions", "Favorite")
+
+    favorites = list(
+        Favorite.objects.order_by("user_id", "position", "pk").only(
+            "pk", "user_id", "comic_id", "novel_id", "position"
+        )
+    )
+    counters = {}
+    for favorite in favorites:
+        key = (favorite.user_id, "comic" if favorite.comic_id else "novel")
+        counters[key] = counters.get(key, 0) + 1
+        favorite.position = counters[key] * RANK_GAP
+    Favorite.objects.bulk_update(favorites, ["position"], batch_size=500)
+
+
+def positions_to_ranks(apps, schema_editor):
+    Favorite = apps.get_model("interactions", "Favorite")
+
+    favorites = list(Favorite.objects.order_by("user_id", "position", "pk"))
+    counters = {}
+    for favorite in favorites:
+        key = (favorite.user_id, "comic" if favorite.comic_id else "novel")
+        counters[key] = counters.get(key, 0) + 1
+        favorite.position = counters[key]
+    Favorite.objects.bulk_update(favorites, ["position"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("interactions", "0003_alter_favorite_options"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_comic_rank_per_user",
+        ),
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_novel_rank_per_user",
+        ),
+        migrations.RenameField(
+            model_name="favorite",
+            old_name="rank",
+            new_name="position",
+        ),
+        migrations.AlterField(
+            model_name="favorite",
+            name="position",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(ranks_to_positions, reverse_code=positions_to_ranks),
+        migrations.AlterField(
+            model_name="favorite",
+            name="position",
+            field=models.BigIntegerField(blank=True),
+        ),
+        migrations.AlterModelOptions(
+            name="favorite",
+            options={"ordering": ["position"]},
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("comic__isnull", False)),
+                fields=("user", "position", "comic"),
+                name="unique_comic_rank_per_user",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("novel__isnull", False)),
+                fields=("user", "position", "novel"),
+                name="unique_novel_rank_per_user",
+            ),
+        ),
+    ]
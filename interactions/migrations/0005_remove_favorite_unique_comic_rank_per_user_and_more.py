@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:26
+
+import django.db.models.constraints
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("interactions", "0004_favorite_position"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_comic_rank_per_user",
+        ),
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_novel_rank_per_user",
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("user", "position", "comic"),
+                name="unique_comic_rank_per_user",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("user", "position", "novel"),
+                name="unique_novel_rank_per_user",
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interactions", "0005_remove_favorite_unique_comic_rank_per_user_and_more"),
+        ("reviews", "0003_review_likes_count_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("review", "Review"),
+                            ("comic", "Comic"),
+                            ("novel", "Novel"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("bucket_start", models.DateTimeField()),
+                ("likes", models.PositiveIntegerField(default=0)),
+                ("reviews", models.PositiveIntegerField(default=0)),
+                ("library_adds", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TrendingScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("review", "Review"),
+                            ("comic", "Comic"),
+                            ("novel", "Novel"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("score", models.FloatField()),
+                ("rank", models.PositiveIntegerField()),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["kind", "rank"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="like",
+            index=models.Index(
+                fields=["created_at"], name="interaction_created_b04aa4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="trendingbucket",
+            index=models.Index(
+                fields=["bucket_start"], name="interaction_bucket__1c77ce_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="trendingbucket",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id", "bucket_start"),
+                name="unique_trending_bucket",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="trendingscore",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "rank"), name="unique_trending_rank"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="trendingscore",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="unique_trending_object"
+            ),
+        ),
+    ]
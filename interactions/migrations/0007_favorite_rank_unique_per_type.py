@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-19 19:59
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+RANK_GAP = 1024
+
+
+def renumber_duplicate_positions(apps, schema_editor):
+    # Constraint lama ikut memuat comic/novel sehingga position ganda bisa lolos;
+    # renumber list yang punya position ganda sebelum constraint baru dipasang
+    Favorite = apps.get_model("interactions", "Favorite")
+    for kind in ("comic", "novel"):
+        lists = Favorite.objects.filter(**{f"{kind}__isnull": False})
+        users = (
+            lists.values("user_id", "position")
+            .annotate(n=Count("pk"))
+            .filter(n__gt=1)
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        for user_id in list(users):
+            favorites = list(lists.filter(user_id=user_id).order_by("position", "pk"))
+            for index, favorite in enumerate(favorites, start=1):
+                favorite.position = index * RANK_GAP
+            Favorite.objects.bulk_update(favorites, ["position"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("interactions", "0006_trendingbucket_trendingscore_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_comic_rank_per_user",
+        ),
+        migrations.RemoveConstraint(
+            model_name="favorite",
+            name="unique_novel_rank_per_user",
+        ),
+        migrations.RunPython(renumber_duplicate_positions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("comic__isnull", False)),
+                fields=("user", "position"),
+                name="unique_comic_rank_per_user",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("novel__isnull", False)),
+                fields=("user", "position"),
+                name="unique_novel_rank_per_user",
+            ),
+        ),
+    ]
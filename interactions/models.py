@@ -1,7 +1,11 @@
-from django.db import models, transaction
+from django.db import models, transaction, connection
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import Q, Max, F
+from django.db.models import Q, Max, F, Count, Case, When, Value, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from reviews.models import Review
 
 class BaseInteraction(models.Model):
     user = models.ForeignKey(
@@ -14,7 +18,38 @@ class BaseInteraction(models.Model):
     class Meta:
         abstract = True
 
+class FavoriteQuerySet(models.QuerySet):
+    def with_rank(self):
+        """Annotate rank dense (1, 2, 3, ...) per user per tipe dari position yang sparse"""
+        def count_before(kind):
+            return Coalesce(
+                Subquery(
+                    Favorite.objects.filter(
+                        user=OuterRef("user"),
+                        position__lt=OuterRef("position"),
+                        **{f"{kind}__isnull": False},
+                    )
+                    .order_by()
+                    .values("user")
+                    .annotate(n=Count("pk"))
+                    .values("n")
+                ),
+                0,
+            )
+
+        return self.annotate(
+            rank=Case(
+                When(comic__isnull=False, then=count_before("comic")),
+                default=count_before("novel"),
+                output_field=models.IntegerField(),
+            ) + 1
+        )
+
+
 class Favorite(BaseInteraction):
+    # Jarak antar position, supaya insert/move cukup menulis satu row
+    RANK_GAP = 1024
+
     comic = models.ForeignKey(
         "contents.Comic",
         on_delete=models.CASCADE,
@@ -29,17 +64,22 @@ class Favorite(BaseInteraction):
         blank=True,
         related_name="favorites"
     )
-    rank = models.PositiveIntegerField(null=True, blank=True)
+    # Sort key sparse; rank yang terlihat user dihitung dari urutan position
+    position = models.BigIntegerField(blank=True)
+
+    objects = FavoriteQuerySet.as_manager()
 
     class Meta:
-        ordering = ["rank"]
+        ordering = ["position"]
         constraints = [
             # Unique per user per target
             models.UniqueConstraint(fields=["user", "comic"], condition=Q(comic__isnull=False), name="unique_user_comic_favorite"),
             models.UniqueConstraint(fields=["user", "novel"], condition=Q(novel__isnull=False), name="unique_user_novel_favorite"),
-            # Unique rank per type
-            models.UniqueConstraint(fields=["user", "rank", "comic"], condition=Q(comic__isnull=False), name="unique_comic_rank_per_user"),
-            models.UniqueConstraint(fields=["user", "rank", "novel"], condition=Q(novel__isnull=False), name="unique_novel_rank_per_user"),
+            # Unique position per user per tipe. Partial index tidak bisa deferrable, jadi
+            # reorder menulis di atas position terbesar dan rebalance memakai position
+            # negatif sementara
+            models.UniqueConstraint(fields=["user", "position"], condition=Q(comic__isnull=False), name="unique_comic_rank_per_user"),
+            models.UniqueConstraint(fields=["user", "position"], condition=Q(novel__isnull=False), name="unique_novel_rank_per_user"),
         ]
 
     def clean(self):
@@ -47,58 +87,156 @@ class Favorite(BaseInteraction):
             raise ValidationError("Favorite must target either a comic or a novel.")
         if self.comic and self.novel:
             raise ValidationError("Favorite cannot target both comic and novel.")
-        if self.rank is not None and self.rank < 1:
-            raise ValidationError("Rank must be >= 1.")
+
+    @property
+    def kind(self):
+        return "comic" if self.comic_id else "novel"
+
+    def _list_queryset(self):
+        """Favorite milik user yang sama dengan tipe yang sama"""
+        return Favorite.objects.filter(user_id=self.user_id, **{f"{self.kind}__isnull": False})
+
+    @staticmethod
+    def _lock_user(user_id):
+        """
+        Kunci row user. Semua penulis position (append, move_to, reorder, rebalance)
+        mengambil kunci ini, jadi mereka tidak bisa memilih position yang sama
+        """
+        list(get_user_model().objects.select_for_update().filter(pk=user_id).values_list("pk"))
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        if not self.comic_id and not self.novel_id:
+            raise ValidationError("Favorite must have a target")
+
         with transaction.atomic():
-            if self.comic:
-                qs = Favorite.objects.select_for_update().filter(user=self.user, comic__isnull=False)
-            elif self.novel:
-                qs = Favorite.objects.select_for_update().filter(user=self.user, novel__isnull=False)
-            else:
-                raise ValidationError("Favorite must have a target")
-
-            # Jika rank tidak diberikan, append terakhir
-            if not self.pk and self.rank is None:
-                max_rank = qs.aggregate(max=Max("rank"))["max"] or 0
-                self.rank = max_rank + 1
-
-            # Geser rank lain jika rank baru bentrok
-            elif self.pk:
-                old = Favorite.objects.select_for_update().get(pk=self.pk)
-                if old.rank != self.rank:
-                    if self.rank < old.rank:
-                        # naikkan rank antara rank baru sampai rank lama
-                        qs.filter(rank__gte=self.rank, rank__lt=old.rank).update(rank=F("rank") + 1)
-                    elif self.rank > old.rank:
-                        # turunkan rank antara rank lama sampai rank baru
-                        qs.filter(rank__lte=self.rank, rank__gt=old.rank).update(rank=F("rank") - 1)
-            else:
-                # Untuk new object dengan rank diberikan, geser rank lain biarr tidak double
-                qs.filter(rank__gte=self.rank).update(rank=F("rank") + 1)
+            # Jika position tidak diberikan, append terakhir. Row user dikunci supaya
+            # dua append bersamaan tidak membaca Max yang sama
+            if self.position is None:
+                self._lock_user(self.user_id)
+                max_position = self._list_queryset().aggregate(max=Max("position"))["max"] or 0
+                self.position = max_position + self.RANK_GAP
 
+            self.full_clean()
             super().save(*args, **kwargs)
 
-    def delete(self, *args, **kwargs):
+    def get_rank(self):
+        """Rank dense untuk instance yang tidak di-annotate lewat with_rank()"""
+        rank = getattr(self, "rank", None)
+        if rank is None:
+            rank = self._list_queryset().filter(position__lt=self.position).count() + 1
+        return rank
+
+    def move_to(self, rank):
+        """
+        Pindahkan favorite ke rank tertentu (mulai dari 1).
+        Cukup baca dua tetangga lalu update row ini saja; rebalance hanya jika gap habis.
+        Row user dikunci, jadi dua move bersamaan ke gap yang sama tidak memilih
+        position yang sama.
+        """
+        rank = max(1, rank)
         with transaction.atomic():
-            if self.comic:
-                qs = Favorite.objects.select_for_update().filter(user=self.user, comic__isnull=False, rank__gt=self.rank)
-            elif self.novel:
-                qs = Favorite.objects.select_for_update().filter(user=self.user, novel__isnull=False, rank__gt=self.rank)
+            self._lock_user(self.user_id)
+            others = self._list_queryset().exclude(pk=self.pk).order_by("position")
+            positions = others.values_list("position", flat=True)
+
+            if rank == 1:
+                before = None
+                after = positions.first()
             else:
-                qs = Favorite.objects.none()
-            # turunkan semua rank lebih besar 1
-            qs.update(rank=F("rank") - 1)
-            super().delete(*args, **kwargs)
+                window = list(positions[rank - 2:rank])
+                if window:
+                    before = window[0]
+                    after = window[1] if len(window) > 1 else None
+                else:
+                    before = others.aggregate(max=Max("position"))["max"]
+                    after = None
+
+            if before is None and after is None:
+                position = self.RANK_GAP
+            elif before is None:
+                position = after // 2 if after > 1 else None
+            elif after is None:
+                position = before + self.RANK_GAP
+            else:
+                position = (before + after) // 2 if after - before > 1 else None
+
+            if position is None:
+                # Gap habis, renumber list ini lalu ulangi
+                Favorite.rebalance(self.user_id, self.kind)
+                self.refresh_from_db(fields=["position"])
+                return self.move_to(rank)
+
+            self.position = position
+            Favorite.objects.filter(pk=self.pk).update(position=position)
+
+    @classmethod
+    def reorder(cls, user, ranks):
+        """
+        Set rank banyak favorite sekaligus. `ranks` berupa {favorite_id: rank}; rank
+        adalah rank akhir dalam list tipe favorite itu (rank melebihi panjang list
+        berarti paling akhir). Favorite yang tidak disebut tetap berurutan di sela-selanya.
+
+        Satu item: move_to (satu row). Lebih dari satu: urutan dense seluruh list
+        dihitung di Python lalu ditulis dengan satu UPDATE ... CASE. Position baru
+        dimulai di atas position terbesar list, jadi tidak bentrok dengan unique
+        constraint di tengah UPDATE.
+        """
+        with transaction.atomic():
+            cls._lock_user(user.pk)
+            rows = list(
+                cls.objects.filter(user=user)
+                .order_by("position", "pk")
+                .values_list("pk", "comic_id", "position")
+            )
+            kinds = {pk: "comic" if comic_id else "novel" for pk, comic_id, _ in rows}
+            if not set(ranks) <= set(kinds):
+                raise ValidationError("Some favorites don't belong to you or don't exist.")
+
+            if len(ranks) == 1:
+                [(pk, rank)] = ranks.items()
+                cls.objects.get(pk=pk).move_to(rank)
+                return 1
+
+            whens, ids = [], []
+            for kind in set(kinds[pk] for pk in ranks):
+                listed = sorted((rank, pk) for pk, rank in ranks.items() if kinds[pk] == kind)
+                order = [pk for pk, _, _ in rows if kinds[pk] == kind and pk not in ranks]
+                for rank, pk in listed:
+                    order.insert(min(rank - 1, len(order)), pk)
+                base = max(position for pk, _, position in rows if kinds[pk] == kind)
+                whens += [
+                    When(pk=pk, then=Value(base + index * cls.RANK_GAP))
+                    for index, pk in enumerate(order, start=1)
+                ]
+                ids += order
+            cls.objects.filter(pk__in=ids).update(
+                position=Case(*whens, output_field=models.BigIntegerField())
+            )
+        return len(ranks)
+
+    @classmethod
+    def rebalance(cls, user_id, kind):
+        """Renumber position satu list menjadi kelipatan RANK_GAP"""
+        with transaction.atomic():
+            cls._lock_user(user_id)
+            favorites = list(
+                cls.objects.select_for_update()
+                .filter(user_id=user_id, **{f"{kind}__isnull": False})
+                .order_by("position", "pk")
+            )
+            # Negatifkan dulu supaya nilai baru tidak bentrok dengan unique constraint
+            cls.objects.filter(pk__in=[f.pk for f in favorites]).update(position=-F("position"))
+            for index, favorite in enumerate(favorites, start=1):
+                favorite.position = index * cls.RANK_GAP
+            cls.objects.bulk_update(favorites, ["position"], batch_size=500)
+        return len(favorites)
 
     @property
     def target(self):
         return self.comic or self.novel
 
     def __str__(self):
-        return f"{self.user.username} #{self.rank} → {self.target}"
+        return f"{self.user.username} #{self.position} → {self.target}"
 
 
 # LIKE
@@ -122,17 +260,155 @@ class Like(BaseInteraction):
         indexes = [
             models.Index(fields=["review", "created_at"]),
             models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["created_at"]),
         ]
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Review.objects.filter(pk=self.review_id).update(likes_count=F("likes_count") + 1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            deleted, per_model = super().delete(*args, **kwargs)
+            if deleted:
+                Review.objects.filter(pk=self.review_id, likes_count__gt=0).update(
+                    likes_count=F("likes_count") - 1
+                )
+        return deleted, per_model
+
     @classmethod
-    def toggle(cls, user, review):
-        try:
-            like = cls.objects.get(user=user, review=review)
-            like.delete()
-            return None, False
-        except cls.DoesNotExist:
-            like = cls.objects.create(user=user, review=review)
-            return like, True
+    def toggle(cls, user, review_id):
+        """
+        Like/unlike review secara atomik tanpa SELECT terlebih dahulu.
+        Postgres: satu statement (CTE insert-on-conflict + delete + update counter).
+        Database lain: dua statement, UPDATE counter ... RETURNING yang sekaligus melihat
+        apakah like sudah ada, lalu INSERT atau DELETE like.
+        Return (liked, likes_count); raise Review.DoesNotExist jika review tidak ada.
+        """
+        from member.stats import invalidate_profile_stats
+
+        like_table = connection.ops.quote_name(cls._meta.db_table)
+        review_table = connection.ops.quote_name(Review._meta.db_table)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    f"""
+                    WITH inserted AS (
+                        INSERT INTO {like_table} (user_id, review_id, created_at)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (user_id, review_id) DO NOTHING
+                        RETURNING 1
+                    ), deleted AS (
+                        DELETE FROM {like_table}
+                        WHERE user_id = %s AND review_id = %s
+                          AND NOT EXISTS (SELECT 1 FROM inserted)
+                        RETURNING 1
+                    )
+                    UPDATE {review_table}
+                    SET likes_count = likes_count
+                        + (SELECT COUNT(*) FROM inserted) - (SELECT COUNT(*) FROM deleted)
+                    WHERE id = %s
+                    RETURNING likes_count, EXISTS (SELECT 1 FROM inserted), user_id
+                    """,
+                    [user.pk, review_id, now, user.pk, review_id, review_id],
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    raise Review.DoesNotExist("Review not found.")
+                # Signal tidak terpanggil untuk SQL langsung
+                invalidate_profile_stats(row[2])
+                return row[1], row[0]
+
+            # Counter di-update lebih dulu: UPDATE mengunci row review (SQLite: lock tulis),
+            # jadi toggle lain untuk review ini menunggu sampai transaksi selesai
+            cursor.execute(
+                f"UPDATE {review_table} SET likes_count = likes_count + CASE WHEN EXISTS "
+                f"(SELECT 1 FROM {like_table} WHERE user_id = %s AND review_id = %s) THEN -1 ELSE 1 END "
+                f"WHERE id = %s RETURNING likes_count, user_id, EXISTS "
+                f"(SELECT 1 FROM {like_table} WHERE user_id = %s AND review_id = %s)",
+                [user.pk, review_id, review_id, user.pk, review_id],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise Review.DoesNotExist("Review not found.")
+            likes_count, owner_id, existed = row
+            liked = not existed
+            if liked:
+                cursor.execute(
+                    f"INSERT INTO {like_table} (user_id, review_id, created_at) VALUES (%s, %s, %s) "
+                    f"ON CONFLICT (user_id, review_id) DO NOTHING",
+                    [user.pk, review_id, now],
+                )
+            else:
+                cursor.execute(
+                    f"DELETE FROM {like_table} WHERE user_id = %s AND review_id = %s",
+                    [user.pk, review_id],
+                )
+            if not cursor.rowcount:
+                # Tanpa lock baris (isolasi lain) toggle lain bisa mendahului; koreksi counter
+                cursor.execute(
+                    f"UPDATE {review_table} SET likes_count = likes_count + %s WHERE id = %s "
+                    f"RETURNING likes_count",
+                    [-1 if liked else 1, review_id],
+                )
+                likes_count = cursor.fetchone()[0]
+            invalidate_profile_stats(owner_id)
+            return liked, likes_count
 
     def __str__(self):
         return f"{self.user.username} liked review #{self.review_id}"
+
+
+# TRENDING
+class TrendingBucket(models.Model):
+    """Jumlah aktivitas per objek per jam, dipakai untuk rolling window trending"""
+    KIND_CHOICES = [
+        ("review", "Review"),
+        ("comic", "Comic"),
+        ("novel", "Novel"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    bucket_start = models.DateTimeField()
+    likes = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    library_adds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id", "bucket_start"],
+                name="unique_trending_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["bucket_start"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} @ {self.bucket_start:%Y-%m-%d %H:00}"
+
+
+class TrendingScore(models.Model):
+    """Ranking trending yang sudah dihitung; feed cukup baca top-N dari sini"""
+    kind = models.CharField(max_length=10, choices=TrendingBucket.KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    score = models.FloatField()
+    rank = models.PositiveIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["kind", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "rank"], name="unique_trending_rank"),
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_trending_object"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} (rank {self.rank}, score {self.score:.2f})"
@@ -1,3 +1,496 @@
-from django.test import TestCase
+import threading
+import unittest
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.testing import statements
+from contents.models import Comic, Novel
+from interactions import trending
+from interactions.buffer import LikeBuffer
+from interactions.models import Favorite, Like, TrendingBucket
+from member.models import User
+from reviews.models import Review
+
+
+class LikeToggleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="liker")
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.review = Review.objects.create(user=self.user, comic=comic, content="Nice", rating=8)
+
+    def test_toggle_like_then_unlike(self):
+        liked, likes_count = Like.toggle(self.user, self.review.pk)
+        self.assertTrue(liked)
+        self.assertEqual(likes_count, 1)
+        self.assertTrue(Like.objects.filter(user=self.user, review=self.review).exists())
+
+        liked, likes_count = Like.toggle(self.user, self.review.pk)
+        self.assertFalse(liked)
+        self.assertEqual(likes_count, 0)
+        self.assertFalse(Like.objects.filter(user=self.user, review=self.review).exists())
+
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.likes_count, 0)
+
+    def test_like_and_unlike_use_at_most_two_statements(self):
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as ctx:
+                Like.toggle(self.user, self.review.pk)
+            self.assertLessEqual(len(statements(ctx)), 2)
+
+    def test_toggle_missing_review_rolls_back(self):
+        with self.assertRaises(Review.DoesNotExist):
+            Like.toggle(self.user, self.review.pk + 1000)
+        self.assertFalse(Like.objects.exists())
+
+
+class LikeCounterTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username="author")
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.review = Review.objects.create(user=author, comic=comic, content="Nice", rating=8)
+        self.users = [User.objects.create(username=f"liker{i}") for i in range(3)]
+
+    def _likes_count(self):
+        self.review.refresh_from_db(fields=["likes_count"])
+        return self.review.likes_count
+
+    def test_save_and_delete_keep_counter(self):
+        likes = [Like.objects.create(user=user, review=self.review) for user in self.users]
+        self.assertEqual(self._likes_count(), 3)
+
+        stale = Like.objects.get(pk=likes[0].pk)
+        likes[0].delete()
+        self.assertEqual(self._likes_count(), 2)
+        # Delete kedua lewat instance lain untuk row yang sama tidak mengurangi lagi
+        stale.delete()
+        self.assertEqual(self._likes_count(), 2)
+
+        likes[1].save()
+        self.assertEqual(self._likes_count(), 2)
+
+    def test_counter_never_goes_negative(self):
+        like = Like.objects.create(user=self.users[0], review=self.review)
+        Review.objects.filter(pk=self.review.pk).update(likes_count=0)
+        like.delete()
+        self.assertEqual(self._likes_count(), 0)
+
+    def test_reconcile_fixes_drift_after_bulk_delete(self):
+        for user in self.users:
+            Like.objects.create(user=user, review=self.review)
+        # Bulk delete melewati Like.delete, counter jadi basi
+        Like.objects.filter(user__in=self.users[:2]).delete()
+        self.assertEqual(self._likes_count(), 3)
+
+        out = StringIO()
+        call_command("reconcile_like_counts", "--dry-run", stdout=out)
+        self.assertIn("Found 1", out.getvalue())
+        self.assertEqual(self._likes_count(), 3)
+
+        call_command("reconcile_like_counts", stdout=StringIO())
+        self.assertEqual(self._likes_count(), 1)
+
+
+class LikeBufferTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username="author")
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.review = Review.objects.create(user=author, comic=comic, content="Nice", rating=8)
+        self.users = [User.objects.create(username=f"liker{i}") for i in range(3)]
+        self.buffer = LikeBuffer()
+
+    def _likes_count(self):
+        self.review.refresh_from_db(fields=["likes_count"])
+        return self.review.likes_count
+
+    def _displayed(self):
+        return self._likes_count() + self.buffer.delta(self.review.pk)
+
+    def test_flush_writes_likes_and_counter(self):
+        Like.objects.create(user=self.users[2], review=self.review)
+        self.buffer.toggle(self.users[0].pk, self.review.pk, False)
+        self.buffer.toggle(self.users[1].pk, self.review.pk, False)
+        self.buffer.toggle(self.users[2].pk, self.review.pk, True)
+        self.assertTrue(self.buffer.state(self.users[0].pk, self.review.pk))
+        self.assertEqual(self._displayed(), 2)
+        self.assertFalse(Like.objects.filter(user=self.users[0]).exists())
+
+        self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(self._likes_count(), 2)
+        self.assertEqual(
+            set(Like.objects.values_list("user_id", flat=True)),
+            {self.users[0].pk, self.users[1].pk},
+        )
+        self.assertEqual(self.buffer.delta(self.review.pk), 0)
+        self.assertIsNone(self.buffer.state(self.users[0].pk, self.review.pk))
+
+    def test_double_toggle_cancels_out(self):
+        self.buffer.toggle(self.users[0].pk, self.review.pk, False)
+        self.buffer.toggle(self.users[0].pk, self.review.pk, False)
+        self.assertIsNone(self.buffer.state(self.users[0].pk, self.review.pk))
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self._likes_count(), 0)
+
+    def test_failed_flush_keeps_buffer(self):
+        self.buffer.toggle(self.users[0].pk, self.review.pk, False)
+        with mock.patch.object(LikeBuffer, "_write", side_effect=DatabaseError("down")):
+            with self.assertRaises(DatabaseError):
+                self.buffer.flush()
+        self.assertTrue(self.buffer.state(self.users[0].pk, self.review.pk))
+        self.assertEqual(self._displayed(), 1)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self._likes_count(), 1)
+        self.assertEqual(self.buffer.delta(self.review.pk), 0)
+
+    def test_toggle_while_flushing(self):
+        user_id, review_id = self.users[0].pk, self.review.pk
+        self.buffer.toggle(user_id, review_id, False)
+        write = LikeBuffer._write
+
+        def write_then_toggle(buffer, batch):
+            applied = write(buffer, batch)
+            # Batch masih terlihat selama flush; toggle ini membatalkan like
+            self.assertTrue(buffer.state(user_id, review_id))
+            self.assertEqual(buffer.toggle(user_id, review_id, False), False)
+            return applied
+
+        with mock.patch.object(LikeBuffer, "_write", write_then_toggle):
+            self.buffer.flush()
+        self.assertEqual(self._likes_count(), 1)
+        self.assertFalse(self.buffer.state(user_id, review_id))
+        self.assertEqual(self._displayed(), 0)
+
+        self.buffer.flush()
+        self.assertEqual(self._likes_count(), 0)
+        self.assertFalse(Like.objects.exists())
+        self.assertIsNone(self.buffer.state(user_id, review_id))
+
+    def test_conflicting_buffers_keep_counter_exact(self):
+        # Dua worker mem-buffer like yang sama; hanya satu row yang benar-benar ditulis
+        other = LikeBuffer()
+        self.buffer.toggle(self.users[0].pk, self.review.pk, False)
+        other.toggle(self.users[0].pk, self.review.pk, False)
+        self.buffer.flush()
+        other.flush()
+        self.assertEqual(self._likes_count(), 1)
+        self.assertEqual(Like.objects.count(), 1)
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now().replace(minute=30, second=0, microsecond=0)
+        self.author = User.objects.create(username="author")
+        self.comics = [
+            Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga")
+            for i in range(2)
+        ]
+
+    def _bucket(self, kind, object_id, hours_ago, **counts):
+        start = self.now.replace(minute=0) - timedelta(hours=hours_ago)
+        return TrendingBucket.objects.create(kind=kind, object_id=object_id, bucket_start=start, **counts)
+
+    def _scores(self, kind):
+        return list(trending.trending_scores(kind).values_list("object_id", "score", "rank"))
+
+    def test_score_halves_every_half_life(self):
+        self._bucket("comic", self.comics[0].pk, 0, likes=10)
+        self._bucket("comic", self.comics[1].pk, trending.HALF_LIFE_HOURS, likes=10)
+        trending.rebuild_scores(now=self.now.replace(minute=0))
+
+        (first, fresh, rank1), (second, old, rank2) = self._scores("comic")
+        self.assertEqual((first, rank1, second, rank2), (self.comics[0].pk, 1, self.comics[1].pk, 2))
+        self.assertAlmostEqual(fresh, 10.0)
+        self.assertAlmostEqual(old, 5.0)
+
+    def test_recent_activity_outranks_larger_old_activity(self):
+        self._bucket("comic", self.comics[0].pk, 3 * trending.HALF_LIFE_HOURS, likes=20)
+        self._bucket("comic", self.comics[1].pk, 0, reviews=1)
+        trending.rebuild_scores(now=self.now)
+        self.assertEqual([row[0] for row in self._scores("comic")], [self.comics[1].pk, self.comics[0].pk])
+
+    def test_buckets_outside_window_are_ignored(self):
+        self._bucket("comic", self.comics[0].pk, trending.WINDOW.days * 24 + 1, likes=100)
+        trending.rebuild_scores(now=self.now)
+        self.assertEqual(self._scores("comic"), [])
+
+    def test_refresh_buckets_counts_likes_for_review_and_title(self):
+        review = Review.objects.create(user=self.author, comic=self.comics[0], content="Nice", rating=8)
+        for i in range(2):
+            Like.objects.create(user=User.objects.create(username=f"liker{i}"), review=review)
+        Review.objects.filter(pk=review.pk).update(created_at=self.now - timedelta(hours=2))
+
+        trending.refresh_buckets(now=self.now)
+        buckets = {
+            (b.kind, b.object_id): (b.likes, b.reviews)
+            for b in TrendingBucket.objects.all()
+        }
+        self.assertEqual(buckets[("review", review.pk)], (2, 0))
+        likes = sum(b.likes for b in TrendingBucket.objects.filter(kind="comic", object_id=self.comics[0].pk))
+        reviews = sum(b.reviews for b in TrendingBucket.objects.filter(kind="comic", object_id=self.comics[0].pk))
+        self.assertEqual((likes, reviews), (2, 1))
+
+        # Refresh ulang tidak menggandakan bucket
+        trending.refresh_buckets(now=self.now)
+        self.assertEqual(
+            sum(b.likes for b in TrendingBucket.objects.filter(kind="review", object_id=review.pk)), 2
+        )
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Concurrent writers need a database with row-level locking",
+)
+class LikeToggleConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+    TOGGLES_PER_THREAD = 25
+
+    def test_concurrent_toggles_keep_counter_consistent(self):
+        author = User.objects.create(username="author")
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        review = Review.objects.create(user=author, comic=comic, content="Nice", rating=8)
+        users = [User.objects.create(username=f"liker{i}") for i in range(4)]
+
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(index):
+            user = users[index % len(users)]
+            try:
+                barrier.wait()
+                for _ in range(self.TOGGLES_PER_THREAD):
+                    Like.toggle(user, review.pk)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        review.refresh_from_db()
+        self.assertEqual(review.likes_count, Like.objects.filter(review=review).count())
+
+
+class FavoriteOrderingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="fan")
+        self.comics = [
+            Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga")
+            for i in range(4)
+        ]
+        self.favorites = [Favorite.objects.create(user=self.user, comic=comic) for comic in self.comics]
+
+    def _order(self):
+        return list(
+            Favorite.objects.filter(user=self.user, comic__isnull=False)
+            .order_by("position")
+            .values_list("pk", flat=True)
+        )
+
+    def test_append_uses_sparse_positions(self):
+        self.assertEqual(
+            [f.position for f in self.favorites],
+            [Favorite.RANK_GAP * i for i in range(1, 5)],
+        )
+
+    def test_with_rank_is_dense_per_type(self):
+        novel = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        novel_favorite = Favorite.objects.create(user=self.user, novel=novel)
+        ranks = dict(Favorite.objects.filter(user=self.user).with_rank().values_list("pk", "rank"))
+        self.assertEqual([ranks[f.pk] for f in self.favorites], [1, 2, 3, 4])
+        self.assertEqual(ranks[novel_favorite.pk], 1)
+        self.assertEqual(self.favorites[2].get_rank(), 3)
+
+    def test_move_to_writes_only_moved_row(self):
+        last = self.favorites[-1]
+        with CaptureQueriesContext(connection) as ctx:
+            last.move_to(2)
+        updates = [sql for sql in statements(ctx) if sql.upper().startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        expected = [self.favorites[0].pk, last.pk, self.favorites[1].pk, self.favorites[2].pk]
+        self.assertEqual(self._order(), expected)
+
+    def test_move_to_first_and_past_end(self):
+        self.favorites[2].move_to(1)
+        self.favorites[0].move_to(99)
+        expected = [self.favorites[2].pk, self.favorites[1].pk, self.favorites[3].pk, self.favorites[0].pk]
+        self.assertEqual(self._order(), expected)
+
+    def test_exhausted_gap_rebalances(self):
+        # Dua favorite pertama bertetangga tanpa ruang di antaranya
+        Favorite.objects.filter(pk=self.favorites[1].pk).update(position=self.favorites[0].position + 1)
+        last = self.favorites[-1]
+        last.move_to(2)
+
+        self.assertEqual(
+            self._order(),
+            [self.favorites[0].pk, last.pk, self.favorites[1].pk, self.favorites[2].pk],
+        )
+        positions = sorted(Favorite.objects.filter(user=self.user).values_list("position", flat=True))
+        self.assertTrue(all(b - a > 1 for a, b in zip(positions, positions[1:])))
+
+    def test_rebalance_renumbers_list(self):
+        Favorite.objects.filter(pk=self.favorites[0].pk).update(position=5)
+        Favorite.objects.filter(pk=self.favorites[1].pk).update(position=6)
+        self.assertEqual(Favorite.rebalance(self.user.pk, "comic"), 4)
+        self.assertEqual(
+            list(Favorite.objects.filter(user=self.user).order_by("position").values_list("position", flat=True)),
+            [Favorite.RANK_GAP * i for i in range(1, 5)],
+        )
+
+    def test_reorder_permutes_list(self):
+        f = self.favorites
+        Favorite.reorder(self.user, {f[0].pk: 4, f[1].pk: 3, f[2].pk: 2, f[3].pk: 1})
+        self.assertEqual(self._order(), [f[3].pk, f[2].pk, f[1].pk, f[0].pk])
+
+    def test_reorder_rejects_foreign_favorites(self):
+        other = User.objects.create(username="other")
+        foreign = Favorite.objects.create(user=other, comic=self.comics[0])
+        with self.assertRaises(ValidationError):
+            Favorite.reorder(self.user, {self.favorites[0].pk: 2, foreign.pk: 1})
+        self.assertEqual(self._order(), [f.pk for f in self.favorites])
+
+    def test_partial_reorder_uses_final_ranks(self):
+        # Position sparse dari append dan move_to tidak boleh membuat rank bentrok
+        f = self.favorites + [
+            Favorite.objects.create(
+                user=self.user, comic=Comic.objects.create(title="Comic 4", author="Author", comic_type="manga")
+            )
+        ]
+        f[1].move_to(4)
+        self.assertEqual(self._order(), [f[0].pk, f[2].pk, f[3].pk, f[1].pk, f[4].pk])
+
+        with CaptureQueriesContext(connection) as ctx:
+            Favorite.reorder(self.user, {f[4].pk: 2, f[0].pk: 3})
+        updates = [sql for sql in statements(ctx) if sql.upper().startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self._order(), [f[2].pk, f[4].pk, f[0].pk, f[3].pk, f[1].pk])
+
+        ranks = dict(Favorite.objects.filter(user=self.user).with_rank().values_list("pk", "rank"))
+        self.assertEqual((ranks[f[4].pk], ranks[f[0].pk]), (2, 3))
+
+    def test_single_item_reorder_moves_one_row(self):
+        f = self.favorites
+        with CaptureQueriesContext(connection) as ctx:
+            Favorite.reorder(self.user, {f[3].pk: 2})
+        updates = [sql for sql in statements(ctx) if sql.upper().startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn(f"= {f[3].pk}", updates[0])
+        self.assertEqual(self._order(), [f[0].pk, f[3].pk, f[1].pk, f[2].pk])
+
+    def test_reorder_rank_past_end_goes_last(self):
+        f = self.favorites
+        Favorite.reorder(self.user, {f[0].pk: 10, f[1].pk: 1})
+        self.assertEqual(self._order(), [f[1].pk, f[2].pk, f[3].pk, f[0].pk])
+
+    def test_reorder_keeps_lists_per_type(self):
+        novels = [
+            Favorite.objects.create(
+                user=self.user, novel=Novel.objects.create(title=f"Novel {i}", author="Author", novel_type="web novel")
+            )
+            for i in range(2)
+        ]
+        f = self.favorites
+        Favorite.reorder(self.user, {f[3].pk: 1, f[2].pk: 2, novels[1].pk: 1, novels[0].pk: 2})
+        self.assertEqual(self._order(), [f[3].pk, f[2].pk, f[0].pk, f[1].pk])
+        self.assertEqual(
+            list(Favorite.objects.filter(user=self.user, novel__isnull=False).values_list("pk", flat=True)),
+            [novels[1].pk, novels[0].pk],
+        )
+
+    def test_partial_reorder_through_api(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        f = self.favorites
+        response = client.post(
+            "/api/interactions/favorites/reorder/",
+            {"favorites": [{"id": f[3].pk, "rank": 2}, {"id": f[0].pk, "rank": 3}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._order(), [f[1].pk, f[3].pk, f[0].pk, f[2].pk])
+
+    def test_position_is_unique_per_user(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Favorite.objects.filter(pk=self.favorites[1].pk).update(position=self.favorites[0].position)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Concurrent writers need a database with row-level locking",
+)
+class FavoriteConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def test_concurrent_appends_get_distinct_positions(self):
+        user = User.objects.create(username="fan")
+        comics = [
+            Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga")
+            for i in range(self.THREADS)
+        ]
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(comic):
+            try:
+                barrier.wait()
+                Favorite.objects.create(user=user, comic=comic)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(comic,)) for comic in comics]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        positions = list(Favorite.objects.filter(user=user).values_list("position", flat=True))
+        self.assertEqual(len(set(positions)), self.THREADS)
+
+    def test_concurrent_moves_into_same_gap(self):
+        user = User.objects.create(username="fan")
+        favorites = [
+            Favorite.objects.create(
+                user=user, comic=Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga")
+            )
+            for i in range(self.THREADS + 2)
+        ]
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(favorite):
+            try:
+                barrier.wait()
+                # Semua thread mengincar gap antara rank 1 dan rank 2
+                favorite.move_to(2)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(f,)) for f in favorites[2:]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        positions = list(Favorite.objects.filter(user=user).values_list("position", flat=True))
+        self.assertEqual(len(set(positions)), len(favorites))
@@ -0,0 +1,126 @@
+"""
+Trending feed untuk review dan comic/novel.
+
+Aktivitas (like, review baru, library add) dirangkum ke bucket per jam oleh job
+berkala, lalu skor dengan time-decay dihitung dari bucket dan disimpan sebagai
+ranking di TrendingScore. Request feed hanya membaca top-N dari tabel tersebut.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from contents.cache import response_cache, trending_tag
+from interactions.models import Like, TrendingBucket, TrendingScore
+from library.models import UserLibrary
+from reviews.models import Review
+
+WINDOW = timedelta(days=7)
+HALF_LIFE_HOURS = 24
+TOP_N = 200
+WEIGHTS = {
+    "likes": 1.0,
+    "reviews": 3.0,
+    "library_adds": 2.0,
+}
+
+
+def _floor_hour(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _hourly(queryset, *group_by):
+    return (
+        queryset.annotate(bucket=TruncHour("created_at"))
+        .order_by()
+        .values(*group_by, "bucket")
+        .annotate(n=Count("pk"))
+    )
+
+
+def refresh_buckets(now=None):
+    """
+    Hitung ulang bucket mulai dari bucket terakhir (bisa masih parsial) sampai sekarang,
+    lalu buang bucket yang sudah di luar window. Return jumlah bucket yang ditulis.
+    """
+    now = now or timezone.now()
+    window_start = _floor_hour(now - WINDOW)
+    latest = TrendingBucket.objects.aggregate(latest=Max("bucket_start"))["latest"]
+    since = max(latest, window_start) if latest else window_start
+
+    counters = defaultdict(lambda: {"likes": 0, "reviews": 0, "library_adds": 0})
+
+    likes = Like.objects.filter(created_at__gte=since)
+    for row in _hourly(likes, "review_id", "review__comic_id", "review__novel_id"):
+        counters[("review", row["review_id"], row["bucket"])]["likes"] += row["n"]
+        # Like pada review ikut menaikkan judul yang direview
+        if row["review__comic_id"]:
+            counters[("comic", row["review__comic_id"], row["bucket"])]["likes"] += row["n"]
+        if row["review__novel_id"]:
+            counters[("novel", row["review__novel_id"], row["bucket"])]["likes"] += row["n"]
+
+    sources = (
+        (Review.objects.filter(created_at__gte=since), "reviews"),
+        (UserLibrary.objects.filter(created_at__gte=since), "library_adds"),
+    )
+    for queryset, field in sources:
+        for row in _hourly(queryset, "comic_id", "novel_id"):
+            if row["comic_id"]:
+                counters[("comic", row["comic_id"], row["bucket"])][field] += row["n"]
+            if row["novel_id"]:
+                counters[("novel", row["novel_id"], row["bucket"])][field] += row["n"]
+
+    buckets = [
+        TrendingBucket(kind=kind, object_id=object_id, bucket_start=bucket, **counts)
+        for (kind, object_id, bucket), counts in counters.items()
+    ]
+    with transaction.atomic():
+        TrendingBucket.objects.filter(bucket_start__gte=since).delete()
+        TrendingBucket.objects.filter(bucket_start__lt=window_start).delete()
+        TrendingBucket.objects.bulk_create(buckets, batch_size=1000)
+    return len(buckets)
+
+
+def rebuild_scores(now=None, top_n=TOP_N):
+    """Hitung skor time-decay dari bucket dan ganti ranking per kind"""
+    now = now or timezone.now()
+    scores = defaultdict(float)
+
+    rows = TrendingBucket.objects.filter(bucket_start__gte=now - WINDOW).values_list(
+        "kind", "object_id", "bucket_start", "likes", "reviews", "library_adds"
+    )
+    for kind, object_id, bucket_start, likes, reviews, library_adds in rows.iterator(chunk_size=5000):
+        age_hours = max((now - bucket_start).total_seconds() / 3600, 0)
+        decay = 0.5 ** (age_hours / HALF_LIFE_HOURS)
+        activity = (
+            likes * WEIGHTS["likes"]
+            + reviews * WEIGHTS["reviews"]
+            + library_adds * WEIGHTS["library_adds"]
+        )
+        scores[(kind, object_id)] += activity * decay
+
+    by_kind = defaultdict(list)
+    for (kind, object_id), score in scores.items():
+        by_kind[kind].append((score, object_id))
+
+    entries = []
+    for kind, items in by_kind.items():
+        items.sort(key=lambda item: (-item[0], item[1]))
+        entries.extend(
+            TrendingScore(kind=kind, object_id=object_id, score=score, rank=rank, computed_at=now)
+            for rank, (score, object_id) in enumerate(items[:top_n], start=1)
+        )
+
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(entries, batch_size=1000)
+        response_cache.invalidate(trending_tag("comic"), trending_tag("novel"))
+    return len(entries)
+
+
+def trending_scores(kind):
+    """Ranking trending satu kind, urut berdasarkan rank"""
+    return TrendingScore.objects.filter(kind=kind).order_by("rank")
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserLibrary
+from .models import ChapterRelease, UserLibrary
 
 
 @admin.register(UserLibrary)
@@ -57,4 +57,14 @@ class UserLibraryAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Optimize queries with select_related"""
         qs = super().get_queryset(request)
-        return qs.select_related('user', 'comic', 'novel')
\ No newline at end of file
+        return qs.select_related('user', 'comic', 'novel')
+
+@admin.register(ChapterRelease)
+class ChapterReleaseAdmin(admin.ModelAdmin):
+    list_display = ("id", "get_target", "old_total", "new_total", "created_at")
+    raw_id_fields = ("comic", "novel")
+    ordering = ("pk",)
+
+    def get_target(self, obj):
+        return obj.get_target()
+    get_target.short_description = "Target"
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from contents.models import Comic
+from library.models import UserLibrary
+from member.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark chapter-release fan-out for a single title (data is rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=100_000)
+        parser.add_argument("--batch-size", type=int, default=UserLibrary.FANOUT_BATCH_SIZE)
+        parser.add_argument("--old-total", type=int, default=100)
+
+    def handle(self, *args, **options):
+        readers = options["readers"]
+        old_total = options["old_total"]
+
+        try:
+            with transaction.atomic():
+                comic = Comic.objects.create(
+                    title="Fan-out Benchmark", author="bench", comic_type="manga",
+                    total_chapters=old_total,
+                )
+                users = User.objects.bulk_create(
+                    [User(username=f"fanout_bench_{i}", password="!") for i in range(readers)],
+                    batch_size=5000,
+                )
+                statuses = UserLibrary.FANOUT_STATUSES + ["plan_to_read", "dropped"]
+                UserLibrary.objects.bulk_create(
+                    [
+                        UserLibrary(
+                            user=user,
+                            comic=comic,
+                            status=statuses[i % len(statuses)],
+                            # Setengah reader caught up, sisanya tertinggal
+                            progress=old_total if i % 2 == 0 else old_total // 2,
+                        )
+                        for i, user in enumerate(users)
+                    ],
+                    batch_size=5000,
+                )
+
+                start = time.perf_counter()
+                updated = UserLibrary.fan_out_chapter_release(
+                    comic, old_total, old_total + 1, batch_size=options["batch_size"]
+                )
+                elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"readers={readers} notified={updated} "
+                    f"elapsed={elapsed:.3f}s rows/sec={updated / elapsed if elapsed else 0:.0f}"
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
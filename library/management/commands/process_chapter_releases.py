@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from library.models import ChapterRelease
+
+
+class Command(BaseCommand):
+    help = "Run chapter-release fan-outs left pending (e.g. the worker restarted before they finished)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=300,
+            help="Only pick releases older than this many seconds, so jobs still queued in a worker are left alone",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options["min_age"])
+        pending = set(ChapterRelease.objects.filter(created_at__lte=cutoff).values_list("comic_id", "novel_id"))
+        done = 0
+        # Per title: process_pending menjalankan semua rilis title itu berurutan
+        for comic_id, novel_id in pending:
+            target = {"comic_id": comic_id} if comic_id else {"novel_id": novel_id}
+            done += ChapterRelease.process_pending(**target)
+        self.stdout.write(self.style.SUCCESS(f"Processed {done} pending chapter release(s)"))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("library", "0004_alter_userlibrary_status_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userlibrary",
+            name="new_chapters",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="userlibrary",
+            index=models.Index(
+                fields=["comic", "status"], name="library_use_comic_i_8fe1c6_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userlibrary",
+            index=models.Index(
+                fields=["novel", "status"], name="library_use_novel_i_7d96b5_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("library", "0005_userlibrary_new_chapters_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userlibrary",
+            index=models.Index(
+                fields=["created_at"], name="library_use_created_4abff1_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 20:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("library", "0006_userlibrary_library_use_created_4abff1_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChapterRelease",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("old_total", models.PositiveIntegerField()),
+                ("new_total", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "comic",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contents.comic",
+                    ),
+                ),
+                (
+                    "novel",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contents.novel",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["created_at"], name="library_cha_created_2021dc_idx"
+                    )
+                ],
+            },
+        ),
+    ]
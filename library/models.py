@@ -1,9 +1,22 @@
-from django.db import models
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import models, transaction, connections
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from contents.models import Comic, Novel
 
+logger = logging.getLogger(__name__)
+
+# Chapter-release fan-out jalan di luar request admin (satu worker cukup). Job di
+# executor hanya mempercepat; yang durable adalah row ChapterRelease, yang
+# diproses ulang oleh `manage.py process_chapter_releases` jika proses mati
+_fanout_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chapter-fanout")
+
 
 class UserLibrary(models.Model):
     STATUS_CHOICES = [
@@ -22,6 +35,8 @@ class UserLibrary(models.Model):
         max_length=20, choices=STATUS_CHOICES, default="plan_to_read"
     )
     progress = models.PositiveIntegerField(default=0)
+    # Jumlah chapter baru sejak user terakhir caught up (diisi oleh fan-out)
+    new_chapters = models.PositiveIntegerField(default=0)
 
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -29,6 +44,10 @@ class UserLibrary(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Status yang mendapat notifikasi "new chapters available"
+    FANOUT_STATUSES = ["reading", "on_hold", "completed"]
+    FANOUT_BATCH_SIZE = 5000
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -45,6 +64,9 @@ class UserLibrary(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['user', 'updated_at']),
+            models.Index(fields=['comic', 'status']),
+            models.Index(fields=['novel', 'status']),
+            models.Index(fields=['created_at']),
         ]
 
     # VALIDATION
@@ -67,10 +89,12 @@ class UserLibrary(models.Model):
     def save(self, *args, **kwargs):
         # Track perubahan status
         old_status = None
+        old_progress = None
         if self.pk:
             try:
                 old_instance = UserLibrary.objects.get(pk=self.pk)
                 old_status = old_instance.status
+                old_progress = old_instance.progress
             except UserLibrary.DoesNotExist:
                 pass
 
@@ -92,6 +116,10 @@ class UserLibrary(models.Model):
         if total > 0 and self.progress > total:
             self.progress = total
 
+        # Chapter baru yang sudah dibaca tidak dihitung lagi
+        if self.new_chapters and self.progress != old_progress:
+            self.new_chapters = min(self.new_chapters, max(total - self.progress, 0))
+
         # Validasi dasar
         self.full_clean()
         super().save(*args, **kwargs)
@@ -117,4 +145,116 @@ class UserLibrary(models.Model):
         return self.progress >= self.total_chapters if self.total_chapters > 0 else False
 
     def __str__(self):
-        return f"{self.user.username} - {self.get_target()} ({self.status})"
\ No newline at end of file
+        return f"{self.user.username} - {self.get_target()} ({self.status})"
+
+    # CHAPTER RELEASE FAN-OUT
+    @classmethod
+    def fan_out_chapter_release(cls, target, old_total, new_total, batch_size=None):
+        """
+        Tandai reader yang sudah caught up di `old_total` bahwa ada chapter baru,
+        termasuk reader yang masih punya chapter baru dari rilis sebelumnya.
+        Reader dicari per batch lewat index (comic, status)/(novel, status),
+        lalu counter ditulis dengan satu UPDATE per batch.
+        """
+        if old_total <= 0 or new_total <= old_total:
+            return 0
+
+        batch_size = batch_size or cls.FANOUT_BATCH_SIZE
+        target_field = "comic" if isinstance(target, Comic) else "novel"
+        readers = cls.objects.filter(
+            **{target_field: target},
+            status__in=cls.FANOUT_STATUSES,
+        ).filter(
+            Q(progress__gte=old_total) | Q(new_chapters__gt=0)
+        ).order_by("pk")
+
+        updated = 0
+        last_pk = 0
+        while True:
+            ids = list(readers.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            updated += cls.objects.filter(pk__in=ids).update(
+                new_chapters=new_total - F("progress")
+            )
+            last_pk = ids[-1]
+        return updated
+
+
+class ChapterRelease(models.Model):
+    """
+    Rilis chapter yang fan-out-nya belum selesai. Row ditulis di transaksi yang
+    sama dengan perubahan total_chapters dan dihapus setelah fan-out selesai, jadi
+    rilis tidak hilang saat worker restart atau deploy (at-least-once; fan-out
+    aman diulang karena counter ditulis absolut, new_total - progress).
+    """
+    comic = models.ForeignKey(Comic, on_delete=models.CASCADE, null=True, blank=True)
+    novel = models.ForeignKey(Novel, on_delete=models.CASCADE, null=True, blank=True)
+    old_total = models.PositiveIntegerField()
+    new_total = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"])]
+
+    def get_target(self):
+        return self.comic or self.novel
+
+    @classmethod
+    def process_pending(cls, **target):
+        """
+        Jalankan fan-out rilis yang tertunda (opsional hanya untuk satu comic/novel),
+        urut per id supaya rilis lama tidak menimpa counter rilis yang lebih baru.
+        Return jumlah rilis yang selesai.
+        """
+        done = 0
+        releases = cls.objects.filter(**target).select_related("comic", "novel").order_by("pk")
+        for release in releases:
+            target_obj = release.get_target()
+            if target_obj is not None:
+                UserLibrary.fan_out_chapter_release(target_obj, release.old_total, release.new_total)
+            release.delete()
+            done += 1
+        return done
+
+    def __str__(self):
+        return f"{self.get_target()}: {self.old_total} -> {self.new_total}"
+
+
+# SIGNALS - Fan-out ketika total_chapters Comic/Novel bertambah
+def _run_fan_out(target_field, pk):
+    try:
+        ChapterRelease.process_pending(**{target_field: pk})
+    except Exception:
+        # Row tetap ada; process_chapter_releases akan mengulanginya
+        logger.exception("chapter fan-out failed for %s %s", target_field, pk)
+    finally:
+        # Thread ini punya koneksi DB sendiri, tutup setelah job selesai
+        connections.close_all()
+
+
+@receiver(pre_save, sender=Comic)
+@receiver(pre_save, sender=Novel)
+def track_total_chapters(sender, instance, update_fields=None, **kwargs):
+    instance._old_total_chapters = None
+    if not instance.pk:
+        return
+    if update_fields is not None and "total_chapters" not in update_fields:
+        return
+    instance._old_total_chapters = (
+        sender.objects.filter(pk=instance.pk).values_list("total_chapters", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Comic)
+@receiver(post_save, sender=Novel)
+def fan_out_chapter_release(sender, instance, created, **kwargs):
+    old_total = getattr(instance, "_old_total_chapters", None)
+    if created or old_total is None or instance.total_chapters <= old_total:
+        return
+    target_field = "comic" if sender is Comic else "novel"
+    ChapterRelease.objects.create(
+        **{target_field: instance}, old_total=old_total, new_total=instance.total_chapters
+    )
+    args = (target_field, instance.pk)
+    transaction.on_commit(lambda: _fanout_executor.submit(_run_fan_out, *args))
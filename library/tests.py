@@ -1,3 +1,125 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from contents.models import Comic
+from library import models as library_models
+from library.models import ChapterRelease, UserLibrary
+from member.models import User
+
+
+def _entry(comic, username, **kwargs):
+    user = User.objects.create(username=username)
+    return UserLibrary.objects.create(user=user, comic=comic, **kwargs)
+
+
+class ChapterFanOutTests(TestCase):
+    def setUp(self):
+        self.comic = Comic.objects.create(
+            title="Comic", author="Author", comic_type="manga", total_chapters=10
+        )
+
+    def _release(self, old_total, new_total, **kwargs):
+        return UserLibrary.fan_out_chapter_release(self.comic, old_total, new_total, **kwargs)
+
+    def test_only_caught_up_readers_are_notified(self):
+        caught_up = _entry(self.comic, "caught_up", status="reading", progress=10)
+        behind = _entry(self.comic, "behind", status="reading", progress=3)
+        planned = _entry(self.comic, "planned", status="plan_to_read", progress=10)
+
+        self.assertEqual(self._release(10, 12), 1)
+
+        caught_up.refresh_from_db()
+        behind.refresh_from_db()
+        planned.refresh_from_db()
+        self.assertEqual(caught_up.new_chapters, 2)
+        self.assertEqual(behind.new_chapters, 0)
+        self.assertEqual(planned.new_chapters, 0)
+
+    def test_repeated_release_keeps_counting_unread_chapters(self):
+        entry = _entry(self.comic, "reader", status="reading", progress=10)
+        self._release(10, 12)
+        self._release(12, 15)
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.new_chapters, 5)
+
+    def test_batches_cover_every_reader(self):
+        entries = [_entry(self.comic, f"reader{i}", status="completed", progress=10) for i in range(5)]
+        self.assertEqual(self._release(10, 11, batch_size=2), 5)
+        self.assertEqual(
+            {e.new_chapters for e in UserLibrary.objects.filter(pk__in=[e.pk for e in entries])},
+            {1},
+        )
+
+    def test_reading_new_chapters_lowers_counter(self):
+        entry = _entry(self.comic, "reader", status="reading", progress=10)
+        self.comic.total_chapters = 15
+        self.comic.save()
+        self._release(10, 15)
+
+        entry.refresh_from_db()
+        entry.progress = 13
+        entry.save()
+        self.assertEqual(entry.new_chapters, 2)
+
+
+class ChapterFanOutSignalTests(TransactionTestCase):
+    # Fan-out jalan di executor setelah commit, dengan koneksi DB sendiri
+
+    def _wait_for_fan_out(self):
+        # Executor hanya punya satu worker, jadi job ini selesai setelah fan-out
+        library_models._fanout_executor.submit(lambda: None).result(timeout=10)
+
+    def test_total_chapters_increase_fans_out_after_commit(self):
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga", total_chapters=10)
+        entry = _entry(comic, "reader", status="reading", progress=10)
+
+        comic.total_chapters = 12
+        comic.save()
+        self._wait_for_fan_out()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.new_chapters, 2)
+        self.assertFalse(ChapterRelease.objects.exists())
+
+    def test_lost_job_is_picked_up_by_command(self):
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga", total_chapters=10)
+        entry = _entry(comic, "reader", status="reading", progress=10)
+
+        # Worker mati sebelum job jalan: rilis tetap tercatat
+        with mock.patch.object(library_models._fanout_executor, "submit"):
+            comic.total_chapters = 12
+            comic.save()
+            comic.total_chapters = 15
+            comic.save()
+        self.assertEqual(ChapterRelease.objects.count(), 2)
+
+        out = StringIO()
+        call_command("process_chapter_releases", "--min-age", "0", stdout=out)
+        self.assertIn("Processed 2", out.getvalue())
+        entry.refresh_from_db()
+        self.assertEqual(entry.new_chapters, 5)
+        self.assertFalse(ChapterRelease.objects.exists())
+
+    def test_failed_job_keeps_release(self):
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga", total_chapters=10)
+        with mock.patch.object(UserLibrary, "fan_out_chapter_release", side_effect=RuntimeError), \
+                self.assertLogs("library.models", "ERROR"):
+            comic.total_chapters = 12
+            comic.save()
+            self._wait_for_fan_out()
+        self.assertEqual(ChapterRelease.objects.count(), 1)
+
+    def test_unrelated_save_does_not_fan_out(self):
+        comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga", total_chapters=10)
+        entry = _entry(comic, "reader", status="reading", progress=10)
+
+        comic.title = "Renamed"
+        comic.save(update_fields=["title"])
+        self._wait_for_fan_out()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.new_chapters, 0)
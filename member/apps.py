@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class MemberConfig(AppConfig):
     name = "member"
+
+    def ready(self):
+        # Daftarkan signal invalidation statistik profil dan cache username
+        from member import lookup, stats  # noqa: F401
@@ -0,0 +1,169 @@
+"""
+Pipeline avatar profil.
+
+Upload disimpan content-addressed (avatars/<hash[:2]>/<hash>/original.<ext>), jadi
+upload yang identik hanya disimpan sekali. Varian persegi (small/medium/large) dalam
+WebP dan JPEG dibuat di background thread setelah transaksi commit; selama varian
+belum ada, URL avatar jatuh ke file original. File avatar lama dihapus setelah
+diganti, selama tidak dipakai profile lain.
+"""
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+SIZES = {"small": 96, "medium": 256, "large": 512}
+DEFAULT_SIZE = "small"
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+DEFAULT_FORMAT = "webp"
+# Format upload yang diterima -> ekstensi file original. Ekstensi diambil dari isi
+# file, bukan dari nama file kiriman client
+ORIGINAL_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+# Resize gambar berat dijalankan di luar request
+_avatar_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="avatar")
+
+
+class InvalidAvatar(Exception):
+    pass
+
+
+def content_hash(upload):
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def _directory(digest):
+    return f"avatars/{digest[:2]}/{digest}"
+
+
+def variant_name(digest, size=DEFAULT_SIZE, fmt=DEFAULT_FORMAT):
+    return f"{_directory(digest)}/{size}.{fmt}"
+
+
+def has_variants(digest):
+    # Varian terakhir yang ditulis menandakan semua varian sudah lengkap
+    return default_storage.exists(variant_name(digest, list(SIZES)[-1], list(FORMATS)[-1]))
+
+
+def validate(upload):
+    """
+    Cek header gambar saja (murah), decode penuh dilakukan di background.
+    Return ekstensi file original sesuai format gambar.
+    """
+    try:
+        with Image.open(upload) as image:
+            image_format = image.format
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise InvalidAvatar("Upload a valid image file.") from e
+    finally:
+        upload.seek(0)
+    if image_format not in ORIGINAL_EXTENSIONS:
+        raise InvalidAvatar("Upload a JPEG, PNG, GIF or WebP image.")
+    return ORIGINAL_EXTENSIONS[image_format]
+
+
+def store_original(upload, ext=None):
+    """
+    Simpan upload di path berdasarkan hash isinya; return (hash, nama file).
+    `ext` hasil validate(); jika kosong upload divalidasi di sini.
+    """
+    ext = ext or validate(upload)
+    digest = content_hash(upload)
+    name = f"{_directory(digest)}/original.{ext}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, upload)
+    return digest, name
+
+
+def render_variants(digest, original_name):
+    with default_storage.open(original_name, "rb") as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image).convert("RGB")
+
+    for size, pixels in SIZES.items():
+        square = ImageOps.fit(image, (pixels, pixels), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, params) in FORMATS.items():
+            name = variant_name(digest, size, fmt)
+            if default_storage.exists(name):
+                continue
+            buffer = io.BytesIO()
+            square.save(buffer, pil_format, **params)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def discard(name):
+    """
+    Hapus file avatar `name` jika tidak ada profile yang memakainya lagi. Original
+    content-addressed dihapus bersama seluruh varian di direktorinya.
+    """
+    from member.models import Profile
+
+    if not name or Profile.objects.filter(avatar=name).exists():
+        return
+    directory, _, filename = name.rpartition("/")
+    if filename.startswith("original.") and directory == _directory(directory.rpartition("/")[2]):
+        _, files = default_storage.listdir(directory)
+        for file in files:
+            default_storage.delete(f"{directory}/{file}")
+    else:
+        default_storage.delete(name)
+
+
+def _discard_in_background(name):
+    try:
+        discard(name)
+    finally:
+        connections.close_all()
+
+
+def process_avatar(profile_id, digest, original_name):
+    from member.models import Profile
+
+    try:
+        render_variants(digest, original_name)
+        # Hanya jika user belum mengganti avatar lagi selama diproses
+        if not Profile.objects.filter(pk=profile_id, avatar=original_name).update(avatar_hash=digest):
+            # Sudah diganti: varian yang baru ditulis jangan sampai tertinggal
+            discard(original_name)
+    finally:
+        connections.close_all()
+
+
+def set_avatar(profile, upload, ext=None):
+    """
+    Ganti avatar profile; varian dibuat di background kecuali hash yang sama sudah
+    pernah diproses. File lama dihapus setelah commit jika tidak dipakai profile lain.
+    """
+    previous = profile.avatar.name if profile.avatar else ""
+    digest, name = store_original(upload, ext)
+    profile.avatar.name = name
+    profile.avatar_hash = digest if has_variants(digest) else ""
+    profile.save(update_fields=["avatar", "avatar_hash", "updated_at"])
+
+    if not profile.avatar_hash:
+        args = (profile.pk, digest, name)
+        transaction.on_commit(lambda: _avatar_executor.submit(process_avatar, *args))
+    if previous and previous != name:
+        transaction.on_commit(lambda: _avatar_executor.submit(_discard_in_background, previous))
+    return profile
+
+
+def avatar_url(profile, size=DEFAULT_SIZE, fmt=DEFAULT_FORMAT):
+    """URL relatif varian avatar, original jika varian belum ada, atau None"""
+    if profile.avatar_hash:
+        return default_storage.url(variant_name(profile.avatar_hash, size, fmt))
+    if profile.avatar:
+        return profile.avatar.url
+    return None
@@ -0,0 +1,147 @@
+"""
+Akselerator pengecekan refresh-token blacklist.
+
+Setiap proses menyimpan Bloom filter berisi jti token yang di-blacklist. Token yang
+pasti tidak ada di filter lolos tanpa query; hanya hasil "mungkin ada" yang dicek
+ke tabel BlacklistedToken. Filter disinkronkan secara incremental paling lama setiap
+TOKEN_BLACKLIST_SYNC_INTERVAL detik, dan dibangun ulang berkala supaya token yang
+sudah di-prune ikut hilang.
+
+Sync membaca row dengan id di atas `floor`: id terbesar yang blacklisted_at-nya
+sudah lebih tua dari SYNC_MARGIN. Row yang lebih baru dibaca ulang di sync
+berikutnya, jadi transaksi yang commit terlambat (id lebih kecil dari row yang
+sudah terbaca) tetap masuk filter selama commit-nya tidak lebih lama dari
+SYNC_MARGIN.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+MIN_CAPACITY = 10_000
+ERROR_RATE = 0.01
+REBUILD_INTERVAL = 600
+# Batas lama transaksi blacklist sampai commit (termasuk selisih jam antar server)
+SYNC_MARGIN = timedelta(seconds=60)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        self.capacity = max(capacity, 1)
+        self.size = int(-self.capacity * math.log(error_rate) / math.log(2) ** 2) + 1
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k posisi dari dua hash 64-bit
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        positions = self._positions(key)
+        # Row yang dibaca ulang oleh sync tidak menambah count
+        if all(self.bits[position >> 3] & (1 << (position & 7)) for position in positions):
+            return
+        for position in positions:
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class BlacklistFilter:
+    def __init__(self, sync_interval, rebuild_interval=REBUILD_INTERVAL):
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._floor_id = 0
+        self._built_at = 0.0
+        self._synced_at = 0.0
+
+    @staticmethod
+    def _load(bloom, floor_id):
+        """
+        Tambahkan row dengan id di atas `floor_id` ke filter; return floor baru
+        (id terbesar yang sudah lewat SYNC_MARGIN)
+        """
+        settled_before = timezone.now() - SYNC_MARGIN
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=floor_id)
+            .order_by("id")
+            .values_list("id", "blacklisted_at", "token__jti")
+        )
+        for row_id, blacklisted_at, jti in rows.iterator(chunk_size=10_000):
+            bloom.add(jti)
+            if blacklisted_at < settled_before:
+                floor_id = row_id
+        return floor_id
+
+    def _rebuild(self, now):
+        count = BlacklistedToken.objects.count()
+        bloom = BloomFilter(max(count * 2, MIN_CAPACITY))
+        self._floor_id = self._load(bloom, 0)
+        self._bloom = bloom
+        self._built_at = self._synced_at = now
+
+    def _sync(self, now):
+        self._floor_id = self._load(self._bloom, self._floor_id)
+        self._synced_at = now
+        if self._bloom.count > self._bloom.capacity:
+            # Filter terlalu penuh, false positive naik
+            self._rebuild(now)
+
+    def _refresh_if_due(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._bloom is None or now - self._built_at >= self.rebuild_interval:
+                self._rebuild(now)
+            elif now - self._synced_at >= self.sync_interval:
+                self._sync(now)
+
+    def is_blacklisted(self, jti):
+        self._refresh_if_due()
+        with self._lock:
+            maybe = jti in self._bloom
+        if not maybe:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def reset(self):
+        """Paksa rebuild pada pengecekan berikutnya (mis. setelah prune)"""
+        with self._lock:
+            self._bloom = None
+
+
+blacklist_filter = BlacklistFilter(settings.TOKEN_BLACKLIST_SYNC_INTERVAL)
+
+
+class AcceleratedRefreshToken(RefreshToken):
+    """RefreshToken yang mengecek blacklist lewat Bloom filter sebelum ke database"""
+
+    def check_blacklist(self):
+        if blacklist_filter.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
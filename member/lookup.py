@@ -0,0 +1,136 @@
+"""
+Cache lookup user:
+
+- username -> (user_id, profile_id) untuk halaman publik (profil, library,
+  favorites dengan ?username=)
+- user_id -> (is_active, is_staff, is_superuser) untuk autentikasi JWT tanpa
+  memuat row User di setiap request
+
+Keduanya disimpan di cache default (TieredCache, namespace "user-lookup" dan
+"user-state" di settings). Signal User/Profile menghapus entry milik user yang
+berubah setelah commit; lewat log invalidation TieredCache proses lain ikut
+membuang salinan L1-nya dalam CACHE_SYNC_INTERVAL.
+"""
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import Http404
+
+from member.models import Profile, User
+
+USERNAME_KEY = "user-lookup:username:{username}"
+# user_id -> username, supaya bisa invalidate tanpa tahu username lama
+USER_USERNAME_KEY = "user-lookup:user:{user_id}"
+USER_STATE_KEY = "user-state:{user_id}"
+USER_STATE_FIELDS = ("is_active", "is_staff", "is_superuser")
+USERNAME_MAX_LENGTH = User._meta.get_field("username").max_length
+
+
+def _username_key(username):
+    # Username dari URL bisa berisi karakter apa saja
+    return USERNAME_KEY.format(username=quote(username, safe=""))
+
+
+class UsernameCache:
+    def get(self, username):
+        return cache.get(_username_key(username))
+
+    def set(self, username, user_id, profile_id):
+        user_key = USER_USERNAME_KEY.format(user_id=user_id)
+        # Username lama milik user yang sama tidak boleh tertinggal
+        previous = cache.get(user_key)
+        if previous is not None and previous != username:
+            cache.delete(_username_key(previous))
+        cache.set_many({_username_key(username): (user_id, profile_id), user_key: username})
+
+    def discard_user(self, user_id):
+        user_key = USER_USERNAME_KEY.format(user_id=user_id)
+        username = cache.get(user_key)
+        keys = [user_key]
+        if username is not None:
+            keys.append(_username_key(username))
+        cache.delete_many(keys)
+
+
+class UserStateCache:
+    def get(self, user_id):
+        return cache.get(USER_STATE_KEY.format(user_id=user_id))
+
+    def set(self, user_id, state):
+        cache.set(USER_STATE_KEY.format(user_id=user_id), state)
+
+    def discard(self, user_id):
+        cache.delete(USER_STATE_KEY.format(user_id=user_id))
+
+
+username_cache = UsernameCache()
+user_state_cache = UserStateCache()
+
+
+def resolve_username(username):
+    """Return (user_id, profile_id), atau None jika username tidak ada"""
+    if len(username) > USERNAME_MAX_LENGTH:
+        return None
+    cached = username_cache.get(username)
+    if cached is not None:
+        return cached
+
+    row = User.objects.filter(username=username).values_list("pk", "profile__pk").first()
+    if row is None:
+        return None
+    # User tanpa profile tidak di-cache, supaya profile yang dibuat belakangan terbaca
+    if row[1] is not None:
+        username_cache.set(username, *row)
+    return row
+
+
+def resolve_username_or_404(username):
+    row = resolve_username(username)
+    if row is None:
+        raise Http404("No User matches the given query.")
+    return row
+
+
+def get_user_state(user_id):
+    """Return dict is_active/is_staff/is_superuser, atau None jika user tidak ada"""
+    state = user_state_cache.get(user_id)
+    if state is None:
+        row = User.objects.filter(pk=user_id).values(*USER_STATE_FIELDS).first()
+        if row is None:
+            return None
+        state = row
+        user_state_cache.set(user_id, state)
+    return state
+
+
+# SIGNALS
+# Entry dihapus setelah commit, supaya tidak terisi ulang dengan data lama
+@receiver(post_save, sender=User)
+def invalidate_user_state(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(USER_STATE_FIELDS):
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: user_state_cache.discard(user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_username(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: username_cache.discard_user(user_id))
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Profile)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    user_id = instance.pk if sender is User else instance.user_id
+
+    def discard():
+        username_cache.discard_user(user_id)
+        user_state_cache.discard(user_id)
+
+    transaction.on_commit(discard)
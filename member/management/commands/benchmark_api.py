@@ -0,0 +1,453 @@
+import json
+import re
+import statistics
+import subprocess
+import time
+from http.cookies import SimpleCookie
+from pathlib import Path
+
+from allauth.account.forms import default_token_generator
+from allauth.account.utils import user_pk_to_url_str
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from contents.models import Comic, Genre, Novel
+from interactions.models import Favorite, Like
+from library.models import UserLibrary
+from member.models import User
+from reviews.models import Review
+
+RESULTS_DIR = Path(settings.BASE_DIR) / ".benchmarks"
+
+# Route yang sengaja tidak dijalankan
+SKIPPED_ROUTES = {
+    "api/comics/(?P<pk>[^/.]+)/upload_cover/$": "writes media files",
+    "api/novels/(?P<pk>[^/.]+)/upload_cover/$": "writes media files",
+    "api/profiles/(?P<username>[^/.]+)/upload_avatar/$": "writes media files",
+    # Email reset membutuhkan URL bernama password_reset_confirm (link frontend), belum ada
+    "api/auth/password/reset/?$": "reset email link is not configured",
+    "api/auth/registration/verify-email/?$": "email verification is disabled",
+    "api/auth/registration/resend-email/?$": "email verification is disabled",
+    "api/auth/registration/account-confirm-email/(?P<key>[-:\\w]+)/$": "email verification is disabled",
+    "api/auth/registration/account-email-verification-sent/?$": "email verification is disabled",
+    "api/library/": "router root shadowed by the list route",
+    "api/profiles/": "router root shadowed by the list route",
+    "api/reviews/": "router root shadowed by the list route",
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Scenario:
+    def __init__(self, name, path, method="get", auth=None, data=None, expect=200, cookies=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        # None (anonim), "user" atau "admin"
+        self.auth = auth
+        self.data = data
+        self.expect = expect
+        self.cookies = cookies
+
+    @property
+    def writes(self):
+        return self.method != "get"
+
+
+def _scenarios(f):
+    """Skenario per route; `f` berisi fixture (id dan username) dari database"""
+    user = f["username"]
+    scenarios = [
+        # Katalog
+        Scenario("api-root", "/api/"),
+        Scenario("stats", "/api/stats/"),
+        Scenario("genre-list", "/api/genres/"),
+        Scenario("genre-detail", f"/api/genres/{f['genre']}/"),
+        Scenario("genre-create", "/api/genres/", "post", "admin", {"name": "Benchmark Genre"}, 201),
+        Scenario("genre-update", f"/api/genres/{f['genre']}/", "patch", "admin", {"name": "Benchmark Genre"}),
+        Scenario("genre-delete", f"/api/genres/{f['genre']}/", "delete", "admin", expect=204),
+    ]
+    for kind, title_id in (("comic", f["comic"]), ("novel", f["novel"])):
+        base = f"/api/{kind}s/"
+        type_field, type_value = ("comic_type", "manga") if kind == "comic" else ("novel_type", "web novel")
+        payload = {"title": "Benchmark Title", "author": "bench", type_field: type_value, "genre_ids": [f["genre"]]}
+        scenarios += [
+            Scenario(f"{kind}-list", f"{base}?ordering=-updated_at"),
+            Scenario(f"{kind}-list-search", f"{base}?search=dragon"),
+            Scenario(f"{kind}-list-auth", f"{base}?ordering=-popularity", "get", "user"),
+            Scenario(f"{kind}-detail", f"{base}{title_id}/"),
+            Scenario(f"{kind}-rating-summary", f"{base}{title_id}/rating-summary/"),
+            Scenario(f"{kind}-trending", f"{base}trending/"),
+            Scenario(f"{kind}-recommendations", f"{base}recommendations/", "get", "user"),
+            Scenario(f"{kind}-create", base, "post", "admin", payload, 201),
+            Scenario(f"{kind}-update", f"{base}{title_id}/", "patch", "admin", {"total_chapters": 999}),
+            Scenario(f"{kind}-delete", f"{base}{title_id}/", "delete", "admin", expect=204),
+            Scenario(f"async-{kind}-list", f"/api/async/{kind}s/?ordering=-updated_at"),
+            Scenario(f"async-{kind}-detail", f"/api/async/{kind}s/{title_id}/"),
+        ]
+    scenarios += [
+        # Review
+        Scenario("review-list", "/api/reviews/"),
+        Scenario("review-detail", f"/api/reviews/{f['review']}/"),
+        Scenario("review-feed", "/api/reviews/feed/"),
+        Scenario("review-feed-auth", "/api/reviews/feed/", "get", "user"),
+        Scenario("review-search", f"/api/reviews/search/?q={f['search_term']}"),
+        Scenario("review-trending", "/api/reviews/trending/"),
+        Scenario("async-review-feed", "/api/async/reviews/feed/"),
+        Scenario(
+            "review-create", "/api/reviews/", "post", "user",
+            {"comic": f["unreviewed_comic"], "content": "benchmark review", "rating": "8.0"}, 201,
+        ),
+        Scenario("review-update", f"/api/reviews/{f['own_review']}/", "patch", "user", {"content": "edited"}),
+        Scenario("review-delete", f"/api/reviews/{f['own_review']}/", "delete", "user", expect=204),
+        # Library
+        Scenario("library-list", "/api/library/", "get", "user"),
+        Scenario("library-list-public", f"/api/library/?username={user}"),
+        Scenario("library-stats", "/api/library/stats/", "get", "user"),
+        Scenario("library-updates", "/api/library/updates/", "get", "user"),
+        Scenario("library-detail", f"/api/library/{f['library']}/", "get", "user"),
+        Scenario(
+            "library-create", "/api/library/", "post", "user",
+            {"comic": f["unlisted_comic"], "status": "reading"}, 201,
+        ),
+        Scenario("library-update", f"/api/library/{f['library']}/", "patch", "user", {"progress": 1}),
+        Scenario("library-delete", f"/api/library/{f['library']}/", "delete", "user", expect=204),
+        # Interactions
+        Scenario("interactions-root", "/api/interactions/"),
+        Scenario("favorite-list", "/api/interactions/favorites/", "get", "user"),
+        Scenario("favorite-list-public", f"/api/interactions/favorites/?username={user}"),
+        Scenario("favorite-detail", f"/api/interactions/favorites/{f['favorite']}/", "get", "user"),
+        Scenario(
+            "favorite-create", "/api/interactions/favorites/", "post", "user",
+            {"comic": f["unfavorited_comic"]}, 201,
+        ),
+        Scenario(
+            "favorite-reorder", "/api/interactions/favorites/reorder/", "post", "user",
+            {"favorites": [{"id": f["favorite"], "rank": 1}]},
+        ),
+        Scenario("favorite-delete", f"/api/interactions/favorites/{f['favorite']}/", "delete", "user", expect=204),
+        Scenario("like-list", "/api/interactions/likes/", "get", "user"),
+        Scenario("like-detail", f"/api/interactions/likes/{f['like']}/", "get", "user"),
+        Scenario("like-create", "/api/interactions/likes/", "post", "user", {"review": f["unliked_review"]}, 201),
+        Scenario("like-toggle", "/api/interactions/likes/toggle/", "post", "user", {"review": f["unliked_review"]}, 201),
+        Scenario("like-delete", f"/api/interactions/likes/{f['like']}/", "delete", "user", expect=204),
+        # Profiles
+        Scenario("profile-list", "/api/profiles/"),
+        Scenario("profile-detail", f"/api/profiles/{user}/"),
+        Scenario("profile-update", f"/api/profiles/{user}/", "patch", "user", {"bio": "benchmark"}),
+        Scenario("profile-delete", f"/api/profiles/{user}/", "delete", "user", expect=204),
+        Scenario("profile-favorites", f"/api/profiles/{user}/favorites/"),
+        Scenario("profile-library", f"/api/profiles/{user}/library/"),
+        Scenario("profile-reviews", f"/api/profiles/{user}/reviews/"),
+        Scenario("profile-stats", f"/api/profiles/{user}/stats/"),
+        Scenario("profile-page", f"/api/profiles/{user}/page/"),
+        Scenario("async-profile-stats", f"/api/async/profiles/{user}/stats/"),
+        Scenario("async-profile-page", f"/api/async/profiles/{user}/page/"),
+        # Auth
+        Scenario("auth-login", "/api/auth/login/", "post", None, {"username": user, "password": f["password"]}),
+        # JWT_AUTH_HTTPONLY: logout membaca refresh token dari cookie, bukan body
+        Scenario("auth-logout", "/api/auth/logout/", "post", "user", cookies={"refresh": f["refresh"]}),
+        Scenario("auth-user", "/api/auth/user/", "get", "user"),
+        Scenario("auth-user-update", "/api/auth/user/", "patch", "user", {"first_name": "Bench"}),
+        Scenario("auth-token-verify", "/api/auth/token/verify/", "post", None, {"token": f["access"]}),
+        Scenario("auth-token-refresh", "/api/auth/token/refresh/", "post", None, {"refresh": f["refresh"]}),
+        Scenario(
+            "auth-password-change", "/api/auth/password/change/", "post", "user",
+            {"old_password": f["password"], "new_password1": "bench-Pass-9876", "new_password2": "bench-Pass-9876"},
+        ),
+        Scenario(
+            "auth-password-reset-confirm", "/api/auth/password/reset/confirm/", "post", None,
+            {"uid": f["uid"], "token": f["reset_token"], "new_password1": "bench-Pass-9876", "new_password2": "bench-Pass-9876"},
+        ),
+        Scenario(
+            "auth-registration", "/api/auth/registration/", "post", None,
+            {"username": "bench_register", "email": "bench_register@example.com",
+             "password1": "bench-Pass-9876", "password2": "bench-Pass-9876"},
+            201,
+        ),
+        Scenario("metrics", "/api/metrics/", "get", "admin"),
+    ]
+    if settings.DEBUG:
+        scenarios += [
+            Scenario("schema", "/api/schema/"),
+            Scenario("docs", "/api/docs/"),
+            Scenario("redoc", "/api/redoc/"),
+        ]
+    return scenarios
+
+
+def _routes():
+    """Semua route di bawah /api/, tanpa varian format suffix (.json)"""
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            # Format sama dengan ResolverMatch.route: "^" regex dibuang
+            route = prefix + str(pattern.pattern).removeprefix("^")
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, route)
+            elif "format" not in route:
+                yield route
+
+    return {route for route in walk(get_resolver().url_patterns, "") if route.startswith("api/")}
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every /api/ route in-process and report throughput, p50/p99 latency and "
+        "queries per request; results are saved as JSON and can be compared with a baseline "
+        "(write requests are rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+        parser.add_argument("--max-seconds", type=float, default=5.0, help="Time budget per scenario")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--query-samples", type=int, default=3, help="Requests used to count queries")
+        parser.add_argument("--only", help="Regex on scenario names")
+        parser.add_argument("--skip-writes", action="store_true")
+        parser.add_argument("--no-response-cache", action="store_true")
+        parser.add_argument(
+            "--search-term",
+            default="bittersweet",
+            help="Review search term (one of the rarest seed_synthetic words by default)",
+        )
+        parser.add_argument("--username", help="User whose data is used (default: first user with library entries)")
+        parser.add_argument("--password", default="synthetic-pass", help="Password of --username (seed_synthetic default)")
+        parser.add_argument("--output", help=f"Result file (default: {RESULTS_DIR}/api-<commit>.json)")
+        parser.add_argument("--baseline", help="Compare with a saved result file")
+        parser.add_argument("--load", help="Do not run; load results from this file (use with --baseline)")
+        parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["load"]:
+            results = json.loads(Path(options["load"]).read_text())
+        else:
+            results = self._run(options)
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            regressions = self._compare(baseline, results, options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} scenario(s) regressed: {', '.join(regressions)}")
+
+    # RUN
+    def _run(self, options):
+        fixtures = self._fixtures(options)
+        scenarios = _scenarios(fixtures)
+        if options["only"]:
+            scenarios = [s for s in scenarios if re.search(options["only"], s.name)]
+        if options["skip_writes"]:
+            scenarios = [s for s in scenarios if not s.writes]
+
+        # Error 500 dicatat sebagai status (ok=false), bukan menghentikan seluruh suite
+        clients = {
+            None: Client(raise_request_exception=False),
+            "user": Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {fixtures['access']}"),
+            "admin": (
+                Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {fixtures['admin_access']}")
+                if fixtures["admin_access"] else None
+            ),
+        }
+        commit, dirty = _git_commit()
+        results = {
+            "commit": commit,
+            "dirty": dirty,
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "dataset": {
+                "titles": Comic.objects.count() + Novel.objects.count(),
+                "users": User.objects.count(),
+                "library": UserLibrary.objects.count(),
+                "reviews": Review.objects.count(),
+                "likes": Like.objects.count(),
+            },
+            "options": {name: options[name] for name in ("requests", "max_seconds", "no_response_cache")},
+            "scenarios": {},
+        }
+
+        covered = set()
+        overrides = {"EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend"}
+        if options["no_response_cache"]:
+            overrides["RESPONSE_CACHE_ENABLED"] = False
+        with override_settings(**overrides):
+            for scenario in scenarios:
+                covered.add(resolve(scenario.path.split("?")[0]).route)
+                client = clients[scenario.auth]
+                if client is None:
+                    self.stdout.write(f"scenario={scenario.name} skipped=no-staff-user")
+                    continue
+                result = self._measure(client, scenario, options)
+                results["scenarios"][scenario.name] = result
+                self.stdout.write(
+                    f"scenario={scenario.name:<28} status={result['status']} requests={result['requests']} "
+                    f"rps={result['rps']:.0f} p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms "
+                    f"queries={result['queries']:g}"
+                )
+
+        if not options["only"] and not options["skip_writes"]:
+            for route in sorted(_routes() - covered):
+                reason = SKIPPED_ROUTES.get(route, "no scenario")
+                self.stdout.write(f"route={route} skipped={reason.replace(' ', '-')}")
+
+        output = Path(options["output"] or RESULTS_DIR / f"api-{commit}{'-dirty' if dirty else ''}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Saved {len(results['scenarios'])} scenario(s) to {output}"))
+        return results
+
+    def _fixtures(self, options):
+        if options["username"]:
+            user = User.objects.filter(username=options["username"]).first()
+            if user is None:
+                raise CommandError(f"User '{options['username']}' not found")
+        else:
+            user_id = UserLibrary.objects.order_by("user_id").values_list("user_id", flat=True).first()
+            if user_id is None:
+                raise CommandError("No library data; run seed_synthetic first or pass --username")
+            user = User.objects.get(pk=user_id)
+
+        def first(queryset, field="pk"):
+            value = queryset.values_list(field, flat=True).first()
+            if value is None:
+                raise CommandError(f"Benchmark user '{user.username}' has no {queryset.model.__name__} data")
+            return value
+
+        popular = Review.objects.order_by("-likes_count", "-created_at")
+        admin = User.objects.filter(is_staff=True, is_active=True).order_by("pk").first()
+        refresh = RefreshToken.for_user(user)
+        return {
+            "username": user.username,
+            "search_term": options["search_term"],
+            "password": options["password"],
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+            "admin_access": str(RefreshToken.for_user(admin).access_token) if admin else None,
+            # dj-rest-auth memakai uid (base36) dan token allauth jika allauth terpasang
+            "uid": user_pk_to_url_str(user),
+            "reset_token": default_token_generator.make_token(user),
+            "genre": first(Genre.objects.order_by("pk")),
+            "comic": first(popular.filter(comic__isnull=False), "comic_id"),
+            "novel": first(popular.filter(novel__isnull=False), "novel_id"),
+            "review": first(popular),
+            "own_review": first(Review.objects.filter(user=user, comic__isnull=False)),
+            "library": first(UserLibrary.objects.filter(user=user)),
+            "favorite": first(Favorite.objects.filter(user=user)),
+            "like": first(Like.objects.filter(user=user)),
+            "unreviewed_comic": first(Comic.objects.exclude(review__user=user).order_by("pk")),
+            "unlisted_comic": first(Comic.objects.exclude(userlibrary__user=user).order_by("pk")),
+            "unfavorited_comic": first(Comic.objects.exclude(favorites__user=user).order_by("pk")),
+            "unliked_review": first(popular.exclude(likes__user=user)),
+        }
+
+    def _request(self, client, scenario):
+        if scenario.cookies:
+            # Cookie dari response (mis. logout menghapus cookie JWT) tidak boleh
+            # terbawa ke request atau skenario berikutnya
+            saved, client.cookies = client.cookies, SimpleCookie(scenario.cookies)
+            try:
+                return self._send(client, scenario)
+            finally:
+                client.cookies = saved
+        return self._send(client, scenario)
+
+    def _send(self, client, scenario):
+        if not scenario.writes:
+            return client.get(scenario.path)
+        # Tulis di dalam transaksi yang di-rollback supaya data tidak berubah antar request
+        response = None
+        try:
+            with transaction.atomic():
+                response = getattr(client, scenario.method)(
+                    scenario.path, scenario.data, content_type="application/json"
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        return response
+
+    def _measure(self, client, scenario, options):
+        for _ in range(options["warmup"]):
+            response = self._request(client, scenario)
+
+        timings = []
+        deadline = time.perf_counter() + options["max_seconds"]
+        start = time.perf_counter()
+        while len(timings) < options["requests"] and (not timings or time.perf_counter() < deadline):
+            request_start = time.perf_counter()
+            response = self._request(client, scenario)
+            timings.append((time.perf_counter() - request_start) * 1000)
+        elapsed = time.perf_counter() - start
+
+        # Query dihitung terpisah: CaptureQueriesContext menambah overhead per query
+        queries = 0
+        for _ in range(options["query_samples"]):
+            with CaptureQueriesContext(connection) as ctx:
+                self._request(client, scenario)
+            queries += sum(
+                1 for q in ctx.captured_queries
+                if not q["sql"].upper().startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK"))
+            )
+
+        return {
+            "route": resolve(scenario.path.split("?")[0]).route,
+            "method": scenario.method.upper(),
+            "status": response.status_code,
+            "ok": response.status_code == scenario.expect,
+            "requests": len(timings),
+            "rps": len(timings) / elapsed,
+            "mean_ms": statistics.mean(timings),
+            "p50_ms": statistics.median(timings),
+            "p99_ms": statistics.quantiles(timings, n=100)[98] if len(timings) > 1 else timings[0],
+            "queries": queries / options["query_samples"] if options["query_samples"] else 0,
+        }
+
+    # COMPARE
+    def _compare(self, baseline, results, threshold):
+        self.stdout.write(f"baseline={baseline['commit']} current={results['commit']}")
+        regressions = []
+        for name, current in results["scenarios"].items():
+            before = baseline["scenarios"].get(name)
+            if before is None:
+                self.stdout.write(f"scenario={name:<28} verdict=new")
+                continue
+
+            def change(key):
+                return (current[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+
+            p50, p99 = change("p50_ms"), change("p99_ms")
+            queries = current["queries"] - before["queries"]
+            if p50 > threshold or p99 > threshold or queries > 0:
+                verdict = "regression"
+                regressions.append(name)
+            elif p50 < -threshold and p99 < -threshold:
+                verdict = "improved"
+            else:
+                verdict = "ok"
+            self.stdout.write(
+                f"scenario={name:<28} p50={current['p50_ms']:.2f}ms ({p50:+.0f}%) "
+                f"p99={current['p99_ms']:.2f}ms ({p99:+.0f}%) queries={current['queries']:g} ({queries:+g}) "
+                f"verdict={verdict}"
+            )
+        return regressions
@@ -0,0 +1,195 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+
+from contents.models import Comic
+from interactions.models import Favorite
+from library.models import UserLibrary
+from member import stats
+from member.models import User
+from reviews.models import Review
+
+PREFIX = "async_bench"
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+async def _asgi_get(url):
+    """
+    GET langsung ke backend.asgi.application. AsyncClient tidak membuat
+    ThreadSensitiveContext per request, jadi semua query async ORM akan antre di
+    satu thread; ASGI server sungguhan (dan ASGIHandler) membuatnya.
+    """
+    from backend.asgi import application
+
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    disconnected = asyncio.Event()
+    sent = {}
+
+    async def receive():
+        if not sent.get("body"):
+            sent["body"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return _Response(sent["status"])
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the sync (WSGI worker pool) and async (ASGI) read endpoints under "
+        "concurrency and report latency percentiles (benchmark data is deleted afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400, help="Requests per endpoint and mode")
+        parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+        parser.add_argument("--workers", type=int, default=8, help="WSGI worker threads")
+        parser.add_argument("--items", type=int, default=100, help="Reviews/library/favorites for the profile")
+        parser.add_argument(
+            "--db-latency",
+            type=float,
+            default=0.0,
+            help="Extra milliseconds per query, to simulate a networked database",
+        )
+
+    def handle(self, *args, **options):
+        if options["db_latency"]:
+            self._add_latency(options["db_latency"] / 1000)
+
+        items = options["items"]
+        user = User.objects.create(username=PREFIX)
+        comics = Comic.objects.bulk_create(
+            [Comic(title=f"{PREFIX} {i}", author="bench", comic_type="manga") for i in range(items)]
+        )
+        try:
+            Review.objects.bulk_create(
+                [Review(user=user, comic=comic, content="benchmark review", rating=7) for comic in comics]
+            )
+            UserLibrary.objects.bulk_create([UserLibrary(user=user, comic=comic) for comic in comics])
+            for comic in comics:
+                Favorite.objects.create(user=user, comic=comic)
+
+            endpoints = {
+                "catalog": "comics/?ordering=-updated_at",
+                "feed": "reviews/feed/",
+                # Stats dihitung ulang tiap request supaya query-nya ikut terukur
+                "stats": f"profiles/{user.username}/stats/",
+                "page": f"profiles/{user.username}/page/",
+            }
+            # Bandingkan jalur ORM/serializer, bukan response cache katalog
+            with override_settings(RESPONSE_CACHE_ENABLED=False):
+                for name, path in endpoints.items():
+                    for mode in ("wsgi", "asgi"):
+                        url = f"/api/{path}" if mode == "wsgi" else f"/api/async/{path}"
+                        reset = (lambda: cache.delete(stats.cache_key(user.pk))) if name in ("stats", "page") else None
+                        timings, elapsed = asyncio.run(self._load(mode, url, reset, options))
+                        self._report(name, mode, timings, elapsed)
+        finally:
+            Comic.objects.filter(pk__in=[comic.pk for comic in comics]).delete()
+            user.delete()
+
+    def _add_latency(self, seconds):
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(connection, **kwargs):
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        # Koneksi yang sudah ada dan yang dibuat thread lain selama benchmark
+        for connection in connections.all():
+            install(connection)
+        connection_created.connect(install, weak=False)
+
+    async def _load(self, mode, url, reset, options):
+        total = options["requests"]
+        local = threading.local()
+
+        if mode == "wsgi":
+            # Worker WSGI tetap (seperti gunicorn --threads): request menunggu worker kosong
+            pool = ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="wsgi-bench")
+
+            def get_sync():
+                client = getattr(local, "client", None)
+                if client is None:
+                    client = local.client = Client()
+                if reset:
+                    reset()
+                return client.get(url)
+
+            async def get():
+                return await asyncio.get_running_loop().run_in_executor(pool, get_sync)
+        else:
+            pool = None
+
+            async def get():
+                if reset:
+                    await asyncio.to_thread(reset)
+                return await _asgi_get(url)
+
+        # Pemanasan (koneksi, cache username/user state)
+        response = await get()
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+
+        timings = []
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await get()
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}")
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*[worker() for _ in range(options["concurrency"])])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return timings, time.perf_counter() - start
+
+    def _report(self, name, mode, timings, elapsed):
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"endpoint={name:<8} mode={mode} requests={len(timings)} "
+            f"p50={statistics.median(timings):.1f}ms p95={percentiles[94]:.1f}ms "
+            f"p99={percentiles[98]:.1f}ms rps={len(timings) / elapsed:.0f}"
+        )
@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.auth.authentication import StatelessJWTCookieAuthentication
+from interactions.models import Favorite
+from member.lookup import user_state_cache
+from member.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request authentication overhead: JWTCookieAuthentication (loads User) "
+        "vs StatelessJWTCookieAuthentication (token claims + cached account state)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username="auth_bench")
+        try:
+            token = str(RefreshToken.for_user(user).access_token)
+            http_request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+            user_state_cache.discard(user.pk)
+
+            for label, authenticator in (
+                ("jwt-cookie", JWTCookieAuthentication()),
+                ("stateless", StatelessJWTCookieAuthentication()),
+            ):
+                timings, queries = self._measure(authenticator, http_request, options["iterations"])
+                self.stdout.write(
+                    f"{label:<11} mean={statistics.mean(timings):.1f}us "
+                    f"p50={statistics.median(timings):.1f}us "
+                    f"p95={statistics.quantiles(timings, n=20)[-1]:.1f}us "
+                    f"queries/request={queries / options['iterations']:.2f}"
+                )
+        finally:
+            user.delete()
+
+    def _measure(self, authenticator, http_request, iterations):
+        # Endpoint umum: autentikasi lalu filter data milik user (cukup user.pk)
+        def authenticated_request():
+            auth_user, _ = authenticator.authenticate(Request(http_request))
+            return Favorite.objects.filter(user=auth_user).query
+
+        authenticated_request()  # pemanasan (cache status akun)
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                authenticated_request()
+                timings.append((time.perf_counter() - start) * 1_000_000)
+        return timings, len(ctx.captured_queries)
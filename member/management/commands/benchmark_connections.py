@@ -0,0 +1,107 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+
+from backend.db import connection_metrics, pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database connection overhead with a new connection per "
+        "request vs persistent/pooled connections"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per mode")
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--url", default="/api/genres/")
+        parser.add_argument(
+            "--connect-latency",
+            type=float,
+            default=0.0,
+            help="Extra milliseconds per new connection, to simulate a TCP/TLS/auth handshake",
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=60,
+            help="CONN_MAX_AGE for the persistent mode when DB_CONN_MAX_AGE is 0 (no pool)",
+        )
+
+    def handle(self, *args, **options):
+        if options["connect_latency"]:
+            seconds = options["connect_latency"] / 1000
+
+            def handshake(**kwargs):
+                time.sleep(seconds)
+
+            connection_created.connect(handshake, weak=False)
+
+        pooled = getattr(connection, "pool", None) is not None
+        modes = [("per-request", 0), ("pooled" if pooled else "persistent", None)]
+        configured_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        # Default DB_CONN_MAX_AGE = 0 sama dengan per-request; mode persistent memakai --conn-max-age
+        reused_max_age = configured_max_age if pooled else configured_max_age or options["conn_max_age"]
+
+        # Ukur jalur koneksi, bukan response cache
+        with override_settings(RESPONSE_CACHE_ENABLED=False):
+            for label, max_age in modes:
+                for alias in connections:
+                    connections[alias].settings_dict["CONN_MAX_AGE"] = (
+                        reused_max_age if max_age is None else max_age
+                    )
+                connections.close_all()
+                timings = self._run(options)
+                stats = pool_stats()
+                self.stdout.write(
+                    f"mode={label:<11} requests={len(timings)} "
+                    f"mean={statistics.mean(timings):.2f}ms p50={statistics.median(timings):.2f}ms "
+                    f"p99={statistics.quantiles(timings, n=100)[98]:.2f}ms "
+                    f"connects={stats['connects']} wait_avg={stats['wait_ms_avg']:.2f}ms "
+                    f"wait_max={stats['wait_ms_max']:.2f}ms"
+                )
+        for alias in connections:
+            connections[alias].settings_dict["CONN_MAX_AGE"] = configured_max_age
+
+    def _run(self, options):
+        url = options["url"]
+        local = threading.local()
+        per_thread = options["requests"] // options["threads"]
+
+        def client():
+            if not hasattr(local, "client"):
+                local.client = Client()
+            return local.client
+
+        def warm_up():
+            response = client().get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}")
+
+        def work():
+            timings = []
+            try:
+                for _ in range(per_thread):
+                    start = time.perf_counter()
+                    # Client test melepas close_old_connections dari sinyal request;
+                    # panggil manual seperti WSGIHandler
+                    close_old_connections()
+                    client().get(url)
+                    close_old_connections()
+                    timings.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections.close_all()
+            return timings
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            list(pool.map(lambda _: warm_up(), range(options["threads"])))
+            connection_metrics.reset()
+            results = list(pool.map(lambda _: work(), range(options["threads"])))
+        return [timing for timings in results for timing in timings]
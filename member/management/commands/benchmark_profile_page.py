@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from contents.models import Comic
+from interactions.models import Favorite
+from library.models import UserLibrary
+from member.models import User
+from reviews.models import Review
+
+PREFIX = "profile_page_bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare profile page latency: five sequential endpoint calls vs the composite "
+        "/page/ endpoint. Writes benchmark rows to the configured database (deleted "
+        "afterwards), so it only runs with --throwaway-db"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--items", type=int, default=100, help="Reviews/library/favorites per section")
+        parser.add_argument(
+            "--throwaway-db",
+            action="store_true",
+            help="Confirm the configured database is disposable (not production data)",
+        )
+
+    def handle(self, *args, **options):
+        # Tidak bisa di-rollback seperti benchmark lain: section /page/ dibaca thread
+        # lain dengan koneksi sendiri, jadi data benchmark harus benar-benar commit
+        if not options["throwaway_db"]:
+            raise CommandError(
+                f"This benchmark writes to database '{connection.settings_dict['NAME']}'. "
+                "Point DATABASE_URL at a throwaway database and pass --throwaway-db."
+            )
+        if User.objects.filter(username=PREFIX).exists():
+            raise CommandError(f"User '{PREFIX}' already exists (left over from an interrupted run?)")
+        items = options["items"]
+        user = User.objects.create(username=PREFIX)
+        comics = Comic.objects.bulk_create(
+            [Comic(title=f"{PREFIX} {i}", author="bench", comic_type="manga") for i in range(items)]
+        )
+        try:
+            Review.objects.bulk_create(
+                [Review(user=user, comic=comic, content="benchmark review", rating=7) for comic in comics]
+            )
+            UserLibrary.objects.bulk_create([UserLibrary(user=user, comic=comic) for comic in comics])
+            for comic in comics:
+                Favorite.objects.create(user=user, comic=comic)
+
+            # Tiap call membawa access token, seperti frontend
+            token = str(RefreshToken.for_user(user).access_token)
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+            base = f"/api/profiles/{user.username}"
+            sequence = [
+                f"{base}/",
+                f"{base}/stats/",
+                f"{base}/favorites/",
+                f"{base}/library/",
+                f"{base}/reviews/",
+            ]
+            # Section composite sebesar satu halaman endpoint biasa
+            size = api_settings.PAGE_SIZE
+            composite = [f"{base}/page/?favorites_size={size}&library_size={size}&reviews_size={size}"]
+
+            for label, urls in (("five calls", sequence), ("composite", composite)):
+                timings = self._measure(client, urls, options["iterations"])
+                self.stdout.write(
+                    f"{label:<10} requests={len(urls)} mean={statistics.mean(timings):.1f}ms "
+                    f"p50={statistics.median(timings):.1f}ms "
+                    f"p95={statistics.quantiles(timings, n=20)[-1]:.1f}ms"
+                )
+        finally:
+            Comic.objects.filter(pk__in=[comic.pk for comic in comics]).delete()
+            user.delete()
+
+    def _measure(self, client, urls, iterations):
+        # Satu putaran pemanasan (cache stats, koneksi thread pool)
+        for url in urls:
+            client.get(url)
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            for url in urls:
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} returned {response.status_code}")
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
@@ -0,0 +1,32 @@
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from member import avatars
+from member.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing avatars to content-addressed storage, render their size variants "
+        "and delete the old files"
+    )
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+        profiles = Profile.objects.exclude(avatar="").exclude(avatar__isnull=True).filter(avatar_hash="")
+        for profile in profiles.iterator():
+            try:
+                with profile.avatar.open("rb") as source:
+                    digest, name = avatars.store_original(File(source, name=profile.avatar.name))
+                avatars.render_variants(digest, name)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"{profile.user_id}: {e}")
+                continue
+            Profile.objects.filter(pk=profile.pk).update(avatar=name, avatar_hash=digest)
+            if profile.avatar.name != name:
+                # File lama di luar storage content-addressed tidak dipakai lagi
+                avatars.discard(profile.avatar.name)
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} avatar(s), {failed} failed"))
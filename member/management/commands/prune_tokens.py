@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted refresh tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches to limit load on the database",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options["batch_size"]
+        outstanding = blacklisted = 0
+        last_id = 0
+
+        while True:
+            # Keyset per id, supaya setiap batch tidak memindai ulang row yang sudah dilewati
+            ids = list(
+                OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            # only("id"): collector tidak memuat kolom token yang besar; BlacklistedToken
+            # ikut terhapus lewat cascade dengan satu DELETE
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).only("id").delete()
+            outstanding += deleted.get(OutstandingToken._meta.label, 0)
+            blacklisted += deleted.get(BlacklistedToken._meta.label, 0)
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Pruned {outstanding} outstanding and {blacklisted} blacklisted token(s) expired before {now:%Y-%m-%d %H:%M}"
+        ))
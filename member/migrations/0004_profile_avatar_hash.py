@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("member", "0003_create_existing_profiles"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -1,7 +1,5 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
-from django.db.models.signals import post_save
-from django.dispatch import receiver
 
 class User(AbstractUser):
     @property
@@ -13,6 +11,15 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
     
+    def save(self, *args, **kwargs):
+        # Profile dibuat sekali, dalam transaksi yang sama dengan user baru.
+        # Save berikutnya (mis. update last_login saat login) tidak menyentuh profile.
+        creating = self._state.adding
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if creating:
+                Profile.objects.create(user=self)
+    
     class Meta:
         ordering = ['-date_joined']
 
@@ -31,6 +38,8 @@ class Profile(models.Model):
         null=True,
         help_text="Profile picture (recommended: 400x400px)"
     )
+    # Hash isi avatar; terisi setelah varian ukuran selesai dibuat (member.avatars)
+    avatar_hash = models.CharField(max_length=64, blank=True, editable=False)
     
     bio = models.TextField(
         max_length=500, 
@@ -85,20 +94,12 @@ class Profile(models.Model):
             return f"https://instagram.com/{username}"
         return None
     
+    def avatar_url(self, size="small", fmt="webp"):
+        from member.avatars import avatar_url
+        return avatar_url(self, size, fmt)
+    
     @property
     def has_social_links(self):
         """Check if user has any social links"""
         return bool(self.twitter_username or self.instagram_username or self.website_url)
 
-
-# SIGNALS - Auto-create Profile ketika user dibuat
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
-        Profile.objects.create(user=instance)
-
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
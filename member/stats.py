@@ -0,0 +1,127 @@
+"""
+Statistik profil user (review, library, favorite).
+
+Setiap grup dihitung dengan satu query conditional aggregate, lalu hasilnya
+disimpan sebagai snapshot di cache per user. Snapshot dihapus oleh signal
+Review/Like/UserLibrary/Favorite, dan secara eksplisit oleh code path yang
+menulis lewat SQL langsung (Like.toggle, flush buffer like).
+"""
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from interactions.models import Favorite, Like
+from library.models import UserLibrary
+from reviews.models import Review
+
+CACHE_KEY = "profile-stats:{user_id}"
+# Invalidation lewat signal; timeout hanya jaring pengaman
+CACHE_TIMEOUT = 60 * 60
+LIBRARY_STATUSES = ["reading", "completed", "plan_to_read", "dropped"]
+
+# review_id dari signal Like yang menunggu commit, dikumpulkan per thread
+_pending = threading.local()
+
+
+def _by_type():
+    return {
+        "total": Count("pk"),
+        "comics": Count("pk", filter=Q(comic__isnull=False)),
+        "novels": Count("pk", filter=Q(novel__isnull=False)),
+    }
+
+
+def review_stats(user_id):
+    stats = Review.objects.filter(user_id=user_id).aggregate(
+        **_by_type(),
+        average_rating=Avg("rating"),
+        likes_received=Sum("likes_count"),
+    )
+    stats["average_rating"] = round(float(stats["average_rating"] or 0), 2)
+    stats["likes_received"] = stats["likes_received"] or 0
+    return stats
+
+
+def library_stats(user_id):
+    return UserLibrary.objects.filter(user_id=user_id).aggregate(
+        total=Count("pk"),
+        **{status: Count("pk", filter=Q(status=status)) for status in LIBRARY_STATUSES},
+    )
+
+
+def favorite_stats(user_id):
+    return Favorite.objects.filter(user_id=user_id).aggregate(**_by_type())
+
+
+# Satu query per section; view async menjalankannya bersamaan
+SECTIONS = {
+    "reviews": review_stats,
+    "library": library_stats,
+    "favorites": favorite_stats,
+}
+
+
+def compute_profile_stats(user_id):
+    return {name: section(user_id) for name, section in SECTIONS.items()}
+
+
+def cache_key(user_id):
+    return CACHE_KEY.format(user_id=user_id)
+
+
+def get_profile_stats(user_id):
+    key = cache_key(user_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_profile_stats(user_id)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_profile_stats(*user_ids):
+    """Hapus snapshot setelah transaksi commit, supaya tidak terisi ulang dengan data lama"""
+    keys = [cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_review_owners(review_ids):
+    """Invalidate pemilik review yang likes_count-nya berubah tanpa signal"""
+    owners = Review.objects.filter(pk__in=list(review_ids)).values_list("user_id", flat=True).distinct()
+    invalidate_profile_stats(*owners)
+
+
+# SIGNALS
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=UserLibrary)
+@receiver(post_delete, sender=UserLibrary)
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def invalidate_owner_stats(sender, instance, **kwargs):
+    invalidate_profile_stats(instance.user_id)
+
+
+def _flush_pending_reviews():
+    review_ids = getattr(_pending, "review_ids", None)
+    if review_ids:
+        _pending.review_ids = set()
+        invalidate_review_owners(review_ids)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_review_owner_stats(sender, instance, **kwargs):
+    # likes_received milik pemilik review, bukan user yang memberi like.
+    # Cascade delete (review/user/judul) mengirim satu signal per like; review_id
+    # dikumpulkan dan pemiliknya dicari dengan satu query saat commit. Callback
+    # berikutnya mendapati set kosong. Review yang ikut terhapus tidak ditemukan
+    # lagi, pemiliknya sudah di-invalidate oleh signal Review.
+    if not hasattr(_pending, "review_ids"):
+        _pending.review_ids = set()
+    _pending.review_ids.add(instance.review_id)
+    transaction.on_commit(_flush_pending_reviews)
@@ -1,3 +1,408 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest import mock
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.auth.authentication import StatelessJWTCookieAuthentication
+from backend.testing import statements
+from contents.models import Comic
+from interactions.models import Favorite, Like
+from library.models import UserLibrary
+from member import avatars
+from member.blacklist import SYNC_MARGIN, BlacklistFilter
+from member.lookup import resolve_username
+from member.models import Profile, User
+from member.stats import cache_key, get_profile_stats
+from reviews.models import Review
+
+
+class ProfileLifecycleTests(TestCase):
+    def test_profile_created_with_user(self):
+        user = User.objects.create_user(username="reader", password="secret-pass-123")
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+    def test_user_save_does_not_touch_profile(self):
+        user = User.objects.create_user(username="reader", password="secret-pass-123")
+        updated_at = user.profile.updated_at
+
+        user = User.objects.get(pk=user.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            user.first_name = "Reader"
+            user.save()
+        self.assertFalse(any("member_profile" in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(Profile.objects.get(user=user).updated_at, updated_at)
+
+
+class LoginQueryCountTests(TestCase):
+    LOGIN_URL = "/api/auth/login/"
+
+    def setUp(self):
+        User.objects.create_user(username="reader", password="secret-pass-123")
+
+    def test_login_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.LOGIN_URL,
+                {"username": "reader", "password": "secret-pass-123"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        sent = statements(ctx)
+        # SELECT user, INSERT outstanding token, 3 query session, UPDATE last_login
+        self.assertEqual(len(sent), 6, sent)
+        self.assertFalse(any("member_profile" in sql for sql in sent))
+
+
+class ProfileStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.review = Review.objects.create(user=self.owner, comic=self.comic, content="Review", rating=Decimal("8.0"))
+        self.fans = [User.objects.create(username=f"fan{i}") for i in range(5)]
+
+    def test_like_invalidates_review_owner_snapshot(self):
+        self.assertEqual(get_profile_stats(self.owner.pk)["reviews"]["likes_received"], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=self.fans[0], review=self.review)
+            Review.objects.filter(pk=self.review.pk).update(likes_count=1)
+        self.assertIsNone(cache.get(cache_key(self.owner.pk)))
+        self.assertEqual(get_profile_stats(self.owner.pk)["reviews"]["likes_received"], 1)
+
+    def _delete_review_queries(self, likes):
+        for fan in self.fans[:likes]:
+            Like.objects.create(user=fan, review=self.review)
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            self.review.delete()
+        return len(statements(ctx))
+
+    def test_cascade_delete_does_not_query_per_like(self):
+        one = self._delete_review_queries(1)
+        self.review = Review.objects.create(user=self.owner, comic=self.comic, content="Again", rating=Decimal("8.0"))
+        self.assertEqual(self._delete_review_queries(5), one)
+
+    def test_user_delete_invalidates_owners_once(self):
+        other = Review.objects.create(user=self.fans[1], comic=self.comic, content="Other", rating=Decimal("6.0"))
+        Like.objects.create(user=self.fans[0], review=self.review)
+        Like.objects.create(user=self.fans[0], review=other)
+        for user in (self.owner, self.fans[1]):
+            get_profile_stats(user.pk)
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            self.fans[0].delete()
+        owner_lookups = [sql for sql in statements(ctx) if "DISTINCT" in sql and '"reviews_review"."user_id"' in sql]
+        self.assertEqual(len(owner_lookups), 1, owner_lookups)
+        self.assertIsNone(cache.get(cache_key(self.owner.pk)))
+        self.assertIsNone(cache.get(cache_key(self.fans[1].pk)))
+
+
+class UserLookupCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="secret-pass-123")
+
+    def test_username_lookup_is_cached(self):
+        expected = (self.user.pk, self.user.profile.pk)
+        self.assertEqual(resolve_username("reader"), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_username("reader"), expected)
+
+    def test_rename_drops_old_username(self):
+        resolve_username("reader")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "renamed"
+            self.user.save()
+        self.assertIsNone(resolve_username("reader"))
+        self.assertEqual(resolve_username("renamed"), (self.user.pk, self.user.profile.pk))
+
+    def test_delete_drops_username(self):
+        resolve_username("reader")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(resolve_username("reader"))
+
+    def test_unusual_usernames(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(resolve_username("x" * 500))
+        self.assertIsNone(resolve_username("no such user/%00"))
+
+
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="secret-pass-123")
+        self.token = AccessToken.for_user(self.user)
+        self.authenticator = StatelessJWTCookieAuthentication()
+
+    def test_claims_and_account_flags_without_loading_user(self):
+        self.authenticator.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = self.authenticator.get_user(self.token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertTrue(user.is_authenticated)
+            self.assertTrue(user.is_active)
+            self.assertFalse(user.is_staff)
+            self.assertFalse(user.is_superuser)
+            self.assertEqual(user, self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "reader")
+
+    def test_staff_change_is_seen_after_commit(self):
+        self.authenticator.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_staff = True
+            self.user.save(update_fields=["is_staff"])
+        self.assertTrue(self.authenticator.get_user(self.token).is_staff)
+
+    def test_unrelated_save_keeps_cached_state(self):
+        self.authenticator.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Reader"
+            self.user.save(update_fields=["first_name"])
+        with self.assertNumQueries(0):
+            self.authenticator.get_user(self.token)
+
+    def test_inactive_or_deleted_user_is_rejected(self):
+        self.authenticator.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticator.get_user(self.token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticator.get_user(self.token)
+
+
+def _image_upload(name, image_format="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class AvatarUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_extension_comes_from_image_format(self):
+        upload = _image_upload("avatar.html")
+        ext = avatars.validate(upload)
+        digest, name = avatars.store_original(upload, ext)
+        self.assertEqual(name, f"avatars/{digest[:2]}/{digest}/original.png")
+        self.assertTrue(default_storage.exists(name))
+
+        _, name = avatars.store_original(_image_upload("photo.png", "JPEG"))
+        self.assertTrue(name.endswith("/original.jpg"))
+
+    def test_rejects_non_images_and_unsupported_formats(self):
+        with self.assertRaises(avatars.InvalidAvatar):
+            avatars.validate(SimpleUploadedFile("avatar.png", b"<script>alert(1)</script>"))
+        with self.assertRaises(avatars.InvalidAvatar):
+            avatars.validate(_image_upload("avatar.bmp", "BMP"))
+
+    def test_upload_endpoint(self):
+        user = User.objects.create_user(username="reader", password="secret-pass-123")
+        client = APIClient()
+        client.force_authenticate(user)
+        url = "/api/profiles/reader/upload_avatar/"
+
+        response = client.post(url, {"avatar": SimpleUploadedFile("a.svg", b"<svg/>")}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+        with self.captureOnCommitCallbacks():
+            response = client.post(url, {"avatar": _image_upload("a.svg", "GIF")}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(Profile.objects.get(user=user).avatar.name.endswith("/original.gif"))
+
+    def test_patch_routes_avatar_through_pipeline(self):
+        user = User.objects.create_user(username="reader", password="secret-pass-123")
+        client = APIClient()
+        client.force_authenticate(user)
+        url = "/api/profiles/reader/"
+
+        response = client.patch(url, {"avatar": "avatar.png", "bio": "Hi"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = client.patch(url, {"avatar": SimpleUploadedFile("a.png", b"<svg/>"), "bio": "Hi"}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Profile.objects.get(user=user).bio, "")
+
+        with self.captureOnCommitCallbacks():
+            response = client.patch(url, {"avatar": _image_upload("a.png"), "bio": "Hi"}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+        profile = Profile.objects.get(user=user)
+        self.assertEqual(profile.bio, "Hi")
+        self.assertTrue(profile.avatar.name.endswith("/original.png"))
+        self.assertTrue(response.json()["avatar"].endswith("/original.png"))
+
+    def test_replacing_avatar_schedules_cleanup_of_old_file(self):
+        profile = User.objects.create(username="reader").profile
+        with mock.patch.object(avatars._avatar_executor, "submit") as submit, \
+                self.captureOnCommitCallbacks(execute=True):
+            avatars.set_avatar(profile, _image_upload("a.png"))
+        old = profile.avatar.name
+        self.assertNotIn(avatars._discard_in_background, [c.args[0] for c in submit.call_args_list])
+
+        with mock.patch.object(avatars._avatar_executor, "submit") as submit, \
+                self.captureOnCommitCallbacks(execute=True):
+            avatars.set_avatar(profile, _image_upload("b.jpg", "JPEG"))
+        submit.assert_any_call(avatars._discard_in_background, old)
+
+    def test_discard_removes_unused_original_and_variants(self):
+        digest, name = avatars.store_original(_image_upload("a.png"))
+        avatars.render_variants(digest, name)
+        directory = f"avatars/{digest[:2]}/{digest}"
+        Profile.objects.filter(user=User.objects.create(username="other")).update(avatar=name, avatar_hash=digest)
+
+        avatars.discard(name)
+        self.assertEqual(len(default_storage.listdir(directory)[1]), 1 + len(avatars.SIZES) * len(avatars.FORMATS))
+
+        Profile.objects.update(avatar="", avatar_hash="")
+        avatars.discard(name)
+        self.assertEqual(default_storage.listdir(directory)[1], [])
+
+        legacy = default_storage.save("avatars/legacy.png", _image_upload("legacy.png"))
+        avatars.discard(legacy)
+        self.assertFalse(default_storage.exists(legacy))
+
+
+def _outstanding(user, expires_in=timedelta(days=1)):
+    now = timezone.now()
+    return OutstandingToken.objects.create(
+        user=user, jti=uuid.uuid4().hex, token="token", created_at=now, expires_at=now + expires_in
+    )
+
+
+class BlacklistFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="reader")
+        self.filter = BlacklistFilter(sync_interval=0)
+
+    def test_late_commit_with_lower_id_is_picked_up(self):
+        early, late = _outstanding(self.user), _outstanding(self.user)
+        BlacklistedToken.objects.create(id=10, token=late)
+        self.assertTrue(self.filter.is_blacklisted(late.jti))
+        self.assertFalse(self.filter.is_blacklisted(early.jti))
+
+        # Transaksi yang mulai lebih dulu commit setelah row id 10 terbaca
+        BlacklistedToken.objects.create(id=5, token=early)
+        self.assertTrue(self.filter.is_blacklisted(early.jti))
+
+    def test_floor_only_passes_settled_rows(self):
+        settled, recent = _outstanding(self.user), _outstanding(self.user)
+        old = BlacklistedToken.objects.create(token=settled)
+        BlacklistedToken.objects.filter(pk=old.pk).update(blacklisted_at=timezone.now() - 2 * SYNC_MARGIN)
+        BlacklistedToken.objects.create(token=recent)
+
+        self.filter.is_blacklisted(settled.jti)
+        self.assertEqual(self.filter._floor_id, old.pk)
+        # Row yang dibaca ulang tidak menambah count
+        self.filter.is_blacklisted(settled.jti)
+        self.assertEqual(self.filter._bloom.count, 2)
+
+
+class PruneTokensTests(TestCase):
+    def test_deletes_expired_tokens_and_their_blacklist_rows(self):
+        user = User.objects.create(username="reader")
+        expired = [_outstanding(user, timedelta(days=-1)) for _ in range(3)]
+        fresh = _outstanding(user)
+        BlacklistedToken.objects.create(token=expired[0])
+        BlacklistedToken.objects.create(token=fresh)
+
+        out = io.StringIO()
+        call_command("prune_tokens", "--batch-size", "2", stdout=out)
+        self.assertIn("Pruned 3 outstanding and 1 blacklisted", out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list("pk", flat=True)), [fresh.pk])
+        self.assertEqual(list(BlacklistedToken.objects.values_list("token_id", flat=True)), [fresh.pk])
+
+
+def _run_inline(loader):
+    future = Future()
+    future.set_result(loader())
+    return future
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@mock.patch("api.profiles.views._submit_section", _run_inline)
+class ProfilePageTests(TestCase):
+    # Section dijalankan inline: di TestCase thread executor tidak melihat data
+    # yang belum commit, dan query semua section tertangkap di satu koneksi.
+    # Jalur thread yang sebenarnya diuji di backend.tests.AsyncViewTests
+    ITEMS = 55
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="owner")
+        comics = Comic.objects.bulk_create(
+            [Comic(title=f"Comic {i}", author="Author", comic_type="manga") for i in range(cls.ITEMS)]
+        )
+        Review.objects.bulk_create(
+            [Review(user=cls.user, comic=comic, content="Review", rating=Decimal("7.0")) for comic in comics]
+        )
+        UserLibrary.objects.bulk_create([UserLibrary(user=cls.user, comic=comic) for comic in comics])
+        Favorite.objects.bulk_create(
+            [Favorite(user=cls.user, comic=comic, position=(i + 1) * Favorite.RANK_GAP) for i, comic in enumerate(comics)]
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _page(self, query=""):
+        response = self.client.get(f"/api/profiles/owner/page/{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _sizes(self, data):
+        return {name: len(data[name]["results"]) for name in ("favorites", "library", "reviews")}
+
+    def test_sections_default_to_ten_items(self):
+        data = self._page()
+        self.assertEqual(self._sizes(data), {"favorites": 10, "library": 10, "reviews": 10})
+        self.assertEqual(data["reviews"]["count"], self.ITEMS)
+        self.assertEqual(data["profile"]["username"], "owner")
+        self.assertEqual(data["stats"]["reviews"]["total"], self.ITEMS)
+
+    def test_section_sizes_are_clamped(self):
+        data = self._page("?favorites_size=100&library_size=3&reviews_size=-5")
+        self.assertEqual(self._sizes(data), {"favorites": 50, "library": 3, "reviews": 0})
+        self.assertEqual(data["reviews"]["count"], self.ITEMS)
+
+    def test_invalid_size_falls_back_to_default(self):
+        data = self._page("?favorites_size=abc&library_size=&reviews_size=1.5")
+        self.assertEqual(self._sizes(data), {"favorites": 10, "library": 10, "reviews": 10})
+
+    def test_unknown_username_is_404(self):
+        response = self.client.get("/api/profiles/nobody/page/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_query_budget_does_not_grow_with_section_size(self):
+        self._page()  # isi cache lookup username dan stats
+        with CaptureQueriesContext(connection) as small:
+            self._page("?favorites_size=1&library_size=1&reviews_size=1")
+        with CaptureQueriesContext(connection) as large:
+            self._page("?favorites_size=50&library_size=50&reviews_size=50")
+        self.assertEqual(len(statements(large)), len(statements(small)), statements(large))
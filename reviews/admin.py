@@ -4,17 +4,17 @@ from .models import Review
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "get_target", "rating", "get_content_snippet", "created_at")
+    list_display = ("id", "user", "get_target", "rating", "likes_count", "get_content_snippet", "created_at")
     list_filter = ("rating", "created_at")
     search_fields = ("content", "user__username", "comic__title", "novel__title")
     ordering = ("-created_at",)
-    readonly_fields = ("created_at",)
+    readonly_fields = ("created_at", "likes_count")
     
     raw_id_fields = ("user", "comic", "novel")
     
     fieldsets = (
         ("Review Info", {
-            "fields": ("user", "content", "rating")
+            "fields": ("user", "content", "rating", "likes_count")
         }),
         ("Target", {
             "fields": ("comic", "novel"),
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from interactions.models import Like
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "Recount Review.likes_count from the Like table and fix drifted rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted reviews, do not write",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        actual_count = Coalesce(
+            Subquery(
+                Like.objects.filter(review=OuterRef("pk"))
+                .order_by()
+                .values("review")
+                .annotate(n=Count("pk"))
+                .values("n")
+            ),
+            0,
+        )
+
+        max_id = Review.objects.aggregate(max=Max("pk"))["max"] or 0
+        fixed = 0
+        for start in range(1, max_id + 1, batch_size):
+            batch = Review.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            drifted = list(
+                batch.annotate(actual=actual_count)
+                .exclude(likes_count=F("actual"))
+                .values_list("pk", flat=True)
+            )
+            if drifted and not options["dry_run"]:
+                Review.objects.filter(pk__in=drifted).update(likes_count=actual_count)
+            fixed += len(drifted)
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} review(s) with drifted likes_count"))
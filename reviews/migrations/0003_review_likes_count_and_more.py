@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:27
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    Like = apps.get_model("interactions", "Like")
+
+    counts = (
+        Like.objects.filter(review=OuterRef("pk"))
+        .order_by()
+        .values("review")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Review.objects.update(likes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("interactions", "0001_initial"),
+        ("reviews", "0002_review_unique_user_comic_review_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_likes_count, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["-likes_count", "-created_at"],
+                name="reviews_rev_likes_c_a0e9cb_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["comic", "-likes_count"], name="reviews_rev_comic_i_6d5195_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["novel", "-likes_count"], name="reviews_rev_novel_i_0c2fb0_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BUCKETS = 11
+
+
+def build_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    RatingSummary = apps.get_model("reviews", "RatingSummary")
+
+    summaries = {}
+    rows = Review.objects.values_list("comic_id", "novel_id", "rating")
+    for comic_id, novel_id, rating in rows.iterator(chunk_size=5000):
+        if not comic_id and not novel_id:
+            continue
+        key = ("comic", comic_id) if comic_id else ("novel", novel_id)
+        summary = summaries.setdefault(key, {"review_count": 0, "histogram": [0] * BUCKETS})
+        summary["review_count"] += 1
+        summary["histogram"][min(max(int(rating), 0), BUCKETS - 1)] += 1
+
+    RatingSummary.objects.bulk_create(
+        [
+            RatingSummary(**{f"{kind}_id": target_id}, **summary)
+            for (kind, target_id), summary in summaries.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0003_alter_comic_comic_type"),
+        ("reviews", "0004_review_reviews_rev_created_bdcc91_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RatingSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("histogram", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "comic",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_summary",
+                        to="contents.comic",
+                    ),
+                ),
+                (
+                    "novel",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_summary",
+                        to="contents.novel",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rating Summary",
+                "verbose_name_plural": "Rating Summaries",
+            },
+        ),
+        migrations.RunPython(build_summaries, reverse_code=migrations.RunPython.noop),
+    ]
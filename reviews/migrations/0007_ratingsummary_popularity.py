@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def fill_popularity(apps, schema_editor):
+    RatingSummary = apps.get_model("reviews", "RatingSummary")
+
+    summaries = list(RatingSummary.objects.select_related("comic", "novel"))
+    for summary in summaries:
+        target = summary.comic or summary.novel
+        average = float(target.average_rating) if target else 0.0
+        summary.popularity = average * (summary.review_count + 1)
+    RatingSummary.objects.bulk_update(summaries, ["popularity"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0006_review_content_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ratingsummary",
+            name="popularity",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(fill_popularity, reverse_code=migrations.RunPython.noop),
+    ]
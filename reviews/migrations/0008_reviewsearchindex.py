@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-19 20:31
+
+import django.db.models.deletion
+import reviews.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0007_ratingsummary_popularity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewSearchIndex",
+            fields=[
+                (
+                    "review",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="reviews.review",
+                    ),
+                ),
+                ("content", reviews.models.FTS5Field()),
+            ],
+            options={
+                "db_table": "reviews_review_fts",
+                "managed": False,
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from contents.models import Comic, Novel
@@ -10,6 +12,8 @@ class Review(models.Model):
     content = models.TextField()
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Counter denormalisasi, di-update bersamaan dengan create/delete Like
+    likes_count = models.PositiveIntegerField(default=0)
     comic = models.ForeignKey(Comic, on_delete=models.CASCADE, null=True, blank=True)
     novel = models.ForeignKey(Novel, on_delete=models.CASCADE, null=True, blank=True)
 
@@ -26,6 +30,12 @@ class Review(models.Model):
                 name="unique_user_novel_review",
             ),
         ]
+        indexes = [
+            models.Index(fields=["-likes_count", "-created_at"]),
+            models.Index(fields=["comic", "-likes_count"]),
+            models.Index(fields=["novel", "-likes_count"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def clean(self):
         if not self.comic and not self.novel:
@@ -39,3 +49,119 @@ class Review(models.Model):
     def __str__(self):
         target = self.comic or self.novel
         return f"Review by {self.user.username} on {target}"
+
+
+class FTS5Field(models.TextField):
+    """Kolom tabel FTS5; lookup `match` menjadi `<kolom> MATCH %s`"""
+
+
+@FTS5Field.register_lookup
+class FTS5Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class ReviewSearchIndex(models.Model):
+    """
+    Shadow table FTS5 (SQLite, migration 0006) yang diisi reviews.search; model
+    unmanaged ini hanya supaya search_reviews bisa join lewat ORM (rowid = review id)
+    """
+    review = models.OneToOneField(
+        Review,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    content = FTS5Field()
+
+    class Meta:
+        managed = False
+        db_table = "reviews_review_fts"
+
+
+# SIGNALS - Jaga index full-text konten review (shadow table FTS5 di SQLite)
+@receiver(post_save, sender=Review)
+def index_review_content(sender, instance, update_fields=None, **kwargs):
+    from reviews.search import index_review
+
+    if update_fields is None or "content" in update_fields:
+        index_review(instance)
+
+
+@receiver(post_delete, sender=Review)
+def unindex_review_content(sender, instance, **kwargs):
+    from reviews.search import unindex_review
+
+    unindex_review(instance.pk)
+
+
+class RatingSummary(models.Model):
+    """
+    Distribusi rating, jumlah review dan popularity per judul (satu row per comic/novel).
+    Di-update secara incremental dari code path yang memanggil update_average_rating,
+    dan dihitung ulang massal oleh command recompute_ratings.
+    """
+    # Satu bucket per step rating 0-10 (dibulatkan ke bawah)
+    BUCKETS = 11
+
+    comic = models.OneToOneField(
+        Comic, on_delete=models.CASCADE, null=True, blank=True, related_name="rating_summary"
+    )
+    novel = models.OneToOneField(
+        Novel, on_delete=models.CASCADE, null=True, blank=True, related_name="rating_summary"
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    histogram = models.JSONField(default=list)
+    # average_rating * (review_count + 1), dipakai untuk ordering list judul
+    popularity = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rating Summary"
+        verbose_name_plural = "Rating Summaries"
+
+    @classmethod
+    def bucket_for(cls, rating):
+        return min(max(int(rating), 0), cls.BUCKETS - 1)
+
+    @classmethod
+    def popularity_for(cls, average_rating, review_count):
+        return float(average_rating or 0) * (review_count + 1)
+
+    @classmethod
+    def record(cls, target, added=None, removed=None):
+        """
+        Update summary satu judul: `added` rating yang masuk, `removed` rating yang keluar.
+        Hanya row summary judul ini yang di-lock. average_rating `target` harus sudah
+        di-update sebelumnya.
+        """
+        field = "comic" if isinstance(target, Comic) else "novel"
+        with transaction.atomic():
+            summary, _ = cls.objects.select_for_update().get_or_create(**{field: target})
+            histogram = list(summary.histogram) or [0] * cls.BUCKETS
+
+            if removed is not None:
+                bucket = cls.bucket_for(removed)
+                histogram[bucket] = max(histogram[bucket] - 1, 0)
+                summary.review_count = max(summary.review_count - 1, 0)
+            if added is not None:
+                histogram[cls.bucket_for(added)] += 1
+                summary.review_count += 1
+
+            summary.histogram = histogram
+            summary.popularity = cls.popularity_for(target.average_rating, summary.review_count)
+            summary.save(update_fields=["histogram", "review_count", "popularity", "updated_at"])
+        return summary
+
+    def as_histogram(self):
+        histogram = list(self.histogram) or [0] * self.BUCKETS
+        return [{"rating": rating, "count": count} for rating, count in enumerate(histogram)]
+
+    def __str__(self):
+        return f"Rating summary of {self.comic or self.novel}"
@@ -0,0 +1,126 @@
+"""
+Full-text search untuk konten review.
+
+Postgres: GIN expression index pada to_tsvector('simple', content), dicari dengan
+plainto_tsquery dan di-rank dengan ts_rank. SQLite: shadow table FTS5
+(reviews_review_fts) yang di-update dari signal Review. Database lain kembali ke
+icontains.
+"""
+import re
+from html import escape
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, TextField, Value
+from django.db.models.functions import Left
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "reviews_review_fts"
+PG_CONFIG = "simple"
+PG_VECTOR = f"to_tsvector('{PG_CONFIG}'::regconfig, \"reviews_review\".\"content\")"
+PG_QUERY = f"plainto_tsquery('{PG_CONFIG}'::regconfig, %s)"
+# Penanda sementara (private use area) supaya konten bisa di-escape dulu
+# sebelum diganti <mark>; konten review tidak pernah dikirim sebagai HTML mentah
+SNIPPET_START = "\ue000"
+SNIPPET_STOP = "\ue001"
+PG_HEADLINE_OPTIONS = f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords=35, MinWords=15"
+
+
+def _fts5_query(term):
+    """Quote setiap kata supaya input user tidak dibaca sebagai sintaks FTS5"""
+    tokens = re.findall(r"\w+", term)
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def render_snippet(raw):
+    """Escape snippet dari database lalu ganti penanda dengan <mark>"""
+    if raw is None:
+        return ""
+    return escape(raw).replace(SNIPPET_START, "<mark>").replace(SNIPPET_STOP, "</mark>")
+
+
+def content_search_q(term):
+    """Q untuk mencocokkan konten review lewat index full-text"""
+    if connection.vendor == "postgresql":
+        return Q(pk__in=RawSQL(
+            f'SELECT "reviews_review"."id" FROM "reviews_review" WHERE {PG_VECTOR} @@ {PG_QUERY}',
+            [term],
+        ))
+    if connection.vendor == "sqlite":
+        query = _fts5_query(term)
+        if not query:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]))
+    return Q(content__icontains=term)
+
+
+def search_reviews(queryset, term):
+    """
+    Filter queryset dengan `term`, tambahkan `search_rank` (makin besar makin relevan)
+    dan `snippet` (potongan konten mentah dengan kata yang cocok diapit
+    SNIPPET_START/SNIPPET_STOP; tampilkan lewat render_snippet).
+    """
+    if connection.vendor == "postgresql":
+        return (
+            queryset.annotate(
+                search_match=RawSQL(f"{PG_VECTOR} @@ {PG_QUERY}", [term], output_field=BooleanField()),
+                search_rank=RawSQL(f"ts_rank({PG_VECTOR}, {PG_QUERY})", [term], output_field=FloatField()),
+                snippet=RawSQL(
+                    f"ts_headline('{PG_CONFIG}'::regconfig, \"reviews_review\".\"content\", {PG_QUERY}, %s)",
+                    [term, PG_HEADLINE_OPTIONS],
+                    output_field=TextField(),
+                ),
+            )
+            .filter(search_match=True)
+            .order_by("-search_rank", "-created_at")
+        )
+
+    if connection.vendor == "sqlite":
+        query = _fts5_query(term)
+        if not query:
+            return queryset.none()
+        # Tabel FTS di-join sekali lewat ReviewSearchIndex (rowid = id); MATCH, bm25
+        # dan snippet dihitung dalam satu scan, bukan subquery per baris
+        return (
+            queryset.filter(search_index__content__match=query)
+            .annotate(
+                # bm25 makin kecil makin relevan, dibalik supaya searah dengan Postgres
+                search_rank=RawSQL(f"-bm25({FTS_TABLE})", [], output_field=FloatField()),
+                snippet=RawSQL(
+                    f"snippet({FTS_TABLE}, 0, %s, %s, '…', 24)",
+                    [SNIPPET_START, SNIPPET_STOP],
+                    output_field=TextField(),
+                ),
+            )
+            .order_by("-search_rank", "-created_at")
+        )
+
+    return (
+        queryset.filter(content__icontains=term)
+        .annotate(search_rank=Value(0.0), snippet=Left("content", 200))
+        .order_by("-created_at")
+    )
+
+
+# INDEX MAINTENANCE (SQLite)
+def index_review(review):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [review.pk])
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, content) VALUES (%s, %s)", [review.pk, review.content])
+
+
+def unindex_review(review_id):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [review_id])
+
+
+def rebuild_index():
+    """Isi ulang index dari seluruh review (setelah bulk insert yang melewati signal)"""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, content) SELECT id, content FROM reviews_review")
@@ -1,3 +1,211 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from backend.testing import statements
+from contents.models import Comic, Novel
+from interactions.models import Like
+from member.models import User
+from reviews.models import RatingSummary, Review
+from reviews.search import search_reviews
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class RatingSummaryTests(TestCase):
+    def setUp(self):
+        self.comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+        self.novel = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        self.users = [User.objects.create(username=f"reviewer{i}") for i in range(2)]
+
+    def _client(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def _review(self, user, rating, **target):
+        target = target or {"comic": self.comic.pk}
+        response = self._client(user).post(
+            "/api/reviews/", {"content": "Review", "rating": str(rating), **target}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def _summary(self, kind="comics", pk=None):
+        response = self.client.get(f"/api/{kind}/{pk or self.comic.pk}/rating-summary/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        counts = {bucket["rating"]: bucket["count"] for bucket in data["histogram"] if bucket["count"]}
+        return data["average_rating"], data["review_count"], counts
+
+    def test_create_update_delete_keep_histogram(self):
+        first = self._review(self.users[0], 8)
+        self._review(self.users[1], 6.5)
+        self.assertEqual(self._summary(), (7.2, 2, {8: 1, 6: 1}))
+
+        response = self._client(self.users[0]).patch(f"/api/reviews/{first}/", {"rating": "3"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._summary(), (4.8, 2, {3: 1, 6: 1}))
+
+        response = self._client(self.users[0]).delete(f"/api/reviews/{first}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self._summary(), (6.5, 1, {6: 1}))
+
+    def test_moving_review_to_other_title(self):
+        other = Comic.objects.create(title="Other", author="Author", comic_type="manhwa")
+        review = self._review(self.users[0], 9)
+        response = self._client(self.users[0]).patch(
+            f"/api/reviews/{review}/", {"comic": other.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._summary(), (0.0, 0, {}))
+        self.assertEqual(self._summary(pk=other.pk), (9.0, 1, {9: 1}))
+
+    def test_novel_summary(self):
+        self._review(self.users[0], 10, novel=self.novel.pk)
+        self.assertEqual(self._summary("novels", self.novel.pk), (10.0, 1, {10: 1}))
+
+    def test_title_without_reviews(self):
+        self.assertEqual(self._summary(), (0.0, 0, {}))
+        self.assertFalse(RatingSummary.objects.exists())
+
+    def test_popularity_follows_rating_and_count(self):
+        self._review(self.users[0], 8)
+        self._review(self.users[1], 6)
+        summary = RatingSummary.objects.get(comic=self.comic)
+        self.assertAlmostEqual(summary.popularity, 7.0 * 3)
+        self.assertEqual(Review.objects.filter(comic=self.comic).count(), summary.review_count)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ReviewSearchTests(TestCase):
+    def setUp(self):
+        self.comic = Comic.objects.create(title="Comic", author="Author", comic_type="manga")
+
+    def _create(self, content):
+        user = User.objects.create(username=f"reviewer{User.objects.count()}")
+        return Review.objects.create(user=user, comic=self.comic, content=content, rating="7.0")
+
+    def _search(self, term):
+        response = self.client.get("/api/reviews/search/", {"q": term})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["results"]
+
+    def test_snippet_escapes_content_and_marks_matches(self):
+        self._create('<script>alert("x")</script> dragon <img src=x onerror=alert(1)>')
+        [result] = self._search("dragon")
+        self.assertNotIn("<script>", result["snippet"])
+        self.assertNotIn("<img", result["snippet"])
+        self.assertIn("&lt;script&gt;", result["snippet"])
+        self.assertIn("<mark>dragon</mark>", result["snippet"])
+
+    def test_results_are_ordered_by_relevance(self):
+        self._create("dragon once, then a long story about something else entirely")
+        best = self._create("dragon dragon dragon")
+        self._create("no match here")
+        results = self._search("dragon")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["id"], best.pk)
+        self.assertGreaterEqual(results[0]["search_rank"], results[1]["search_rank"])
+
+    def test_queryset_supports_count_values_and_filters(self):
+        best = self._create("dragon dragon dragon")
+        self._create("a dragon")
+        self._create("no match")
+        results = search_reviews(Review.objects.all(), "dragon")
+        self.assertEqual(results.count(), 2)
+        self.assertEqual(results.distinct().count(), 2)
+        self.assertEqual(results.values_list("id", flat=True)[0], best.pk)
+        self.assertEqual(results.values("id", "search_rank")[0]["id"], best.pk)
+        self.assertEqual(list(results.filter(pk=best.pk).values_list("id", flat=True)), [best.pk])
+        self.assertTrue(Review.objects.filter(pk__in=results.values("pk")).exists())
+
+    def test_query_syntax_is_not_interpreted(self):
+        self._create("dragon")
+        self.assertEqual(self._search('"dragon*'), self._search("dragon"))
+        self.assertEqual(self._search("***"), [])
+
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ReviewFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.comics = [Comic.objects.create(title=f"Comic {i}", author="Author", comic_type="manga") for i in range(2)]
+        self.novel = Novel.objects.create(title="Novel", author="Author", novel_type="web novel")
+        self.reader = User.objects.create(username="reader")
+        self.reviews = []
+        for i in range(6):
+            target = {"novel": self.novel} if i == 5 else {"comic": self.comics[i % 2]}
+            user = User.objects.create(username=f"reviewer{i}")
+            self.reviews.append(Review.objects.create(user=user, content="Review", rating="7.0", **target))
+        for review in self.reviews[:3]:
+            Like.objects.create(user=self.reader, review=review)
+
+    def _client(self, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    def _feed(self, client):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/reviews/feed/")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), statements(ctx)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # count + halaman (+ like user login) (+ validasi filter ?comic=)
+        for user, query, expected in (
+            (None, "", 2),
+            (self.reader, "", 3),
+            (self.reader, f"?comic={self.comics[0].pk}", 4),
+        ):
+            client = self._client(user)
+            for page_size in (1, 10):
+                with self.subTest(user=user, query=query, page_size=page_size), \
+                        mock.patch.object(PageNumberPagination, "page_size", page_size), \
+                        self.assertNumQueries(expected):
+                    response = client.get(f"/api/reviews/feed/{query}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), 1 if page_size == 1 else 3 if query else 6)
+
+    def test_review_list_counts_reviews_without_query_per_title(self):
+        # count + halaman + prefetch comic/novel, masing-masing dengan genres
+        for page_size in (2, 10):
+            with self.subTest(page_size=page_size), \
+                    mock.patch.object(PageNumberPagination, "page_size", page_size), \
+                    self.assertNumQueries(6):
+                response = self._client().get("/api/reviews/?ordering=-created_at")
+            self.assertEqual(response.status_code, 200)
+        counts = [
+            (review["comic_detail"] or review["novel_detail"])["reviews_count"]
+            for review in response.json()["results"]
+        ]
+        self.assertEqual(counts, [1, 3, 2, 3, 2, 3])
+
+    def test_titles_are_deduplicated(self):
+        data, _ = self._feed(self._client())
+        self.assertEqual(len(data["results"]), 6)
+        self.assertEqual(
+            set(data["titles"]),
+            {f"comic:{self.comics[0].pk}", f"comic:{self.comics[1].pk}", f"novel:{self.novel.pk}"},
+        )
+        for review in data["results"]:
+            self.assertIn(review["target_key"], data["titles"])
+            self.assertNotIn("comic_detail", review)
+
+    def test_is_liked_comes_from_one_query(self):
+        data, queries = self._feed(self._client(self.reader))
+        liked = {r["id"] for r in data["results"] if r["is_liked"]}
+        self.assertEqual(liked, {r.pk for r in self.reviews[:3]})
+        like_queries = [sql for sql in queries if "interactions_like" in sql]
+        self.assertEqual(len(like_queries), 1)
+
+        data, queries = self._feed(self._client())
+        self.assertFalse(any(r["is_liked"] for r in data["results"]))
+        self.assertFalse([sql for sql in queries if "interactions_like" in sql])